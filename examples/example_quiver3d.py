@@ -24,15 +24,6 @@ Hz = Hz/H
 
 C = Hz  # color by y-component
 
-# Flatten to 1D
-xv = X.ravel()
-yv = Y.ravel()
-zv = Z.ravel()
-Hxv = Hx.ravel()
-Hyv = Hy.ravel()
-Hzv = Hz.ravel()
-Cv  = C.ravel()
-
 # ------------------------------
 # Create figure
 # ------------------------------
@@ -51,8 +42,8 @@ pf.add_label_cm(fig, r"$z$", 0.3+x_shift, 2.75+y_shift, 8.5, 6.0)
 # ------------------------------
 ax, img = pf.quiver3_advanced_panel(
     fig,
-    xv, yv, zv, Hxv, Hyv, Hzv, Cv,
-    Cmin=np.min(Cv), Cmax=np.max(Cv),
+    x, y, z, Hx, Hy, Hz, C,          # 1D axes + meshgrid-shaped fields
+    Cmin=np.min(C), Cmax=np.max(C),
     cmap="coolwarm",
     scale=0.075,
     subsample=1,
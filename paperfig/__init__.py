@@ -3,11 +3,15 @@ paperfig: A publication-quality Python figure toolkit with cm-accurate layout,
 LaTeX typography, high-end 1D/2D panels, and PyVista-powered 3D rendering.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 # --- Options system ---
 from .options import PaperFigOptions, global_options
 
 # --- Figure creation & layout helpers ---
 from .figure import (
+    PaperFigure,
     create_paper_figure,
     add_axes_cm,
     add_label_cm,
@@ -15,6 +19,9 @@ from .figure import (
     add_line_cm
 )
 
+# --- LaTeX label cache ---
+from .tex_cache import TexCache, precompile_tex
+
 # --- Utility helpers ---
 from .utils import (
     crop_image,
@@ -29,7 +36,8 @@ from .utils import (
 from .panel_1d import (
     plotLinLin_panel_core,
     plotLogLog_panel_core,
-    plotScatter2D_panel_core
+    plotScatter2D_panel_core,
+    plotDensity2D_panel_core
 )
 
 # --- 2D panel tools ---
@@ -39,29 +47,98 @@ from .panel_2d import (
     add_colorbar_cm
 )
 
-# --- 3D panel tools ---
-from .panel_3d import (
-    quiver3_advanced,
-    quiver3_advanced_panel
-)
+# --- Spatial downsampling ---
+from .sampling import spatial_subsample
 
-# --- High-level vector-field panel ---
-from .vectorfield_panel import (
-    PlotVectorfieldPanel,
-    plot_vectorfield_panels
+# --- Vector-field coordinate systems ---
+from .transforms import (
+    CoordinateSystem,
+    register_coordinate_system,
+    coordinate_system,
+    coordinate_systems
 )
 
+# --- Lazily imported tools ---
+# The 3D and vector-field modules pull in pyvista/VTK (and pandas on
+# first use). They are imported on first attribute access, so scripts
+# that only build 1D/2D panels start without them.
+_LAZY_ATTRS = {
+    # 3D panel tools
+    "quiver3_advanced": "panel_3d",
+    "quiver3_advanced_panel": "panel_3d",
+    "quiver3_views_panel": "panel_3d",
+
+    # Parallel 3D panel rendering
+    "render_quiver_panels": "parallel",
+
+    # Render cache
+    "RenderCache": "render_cache",
+    "MeshCache": "render_cache",
+
+    # Reusable off-screen plotters
+    "PlotterPool": "plotter_pool",
+
+    # 3D quiver animation
+    "QuiverAnimation": "animation",
+
+    # Batch figure export
+    "run_figure_jobs": "batch",
+
+    # Benchmarks
+    "benchmark_antialiasing": "benchmark",
+    "benchmark_import": "benchmark",
+    "benchmark_transforms": "benchmark",
+
+    # High-level vector-field panel
+    "PlotVectorfieldPanel": "vectorfield_panel",
+    "plot_vectorfield_panels": "vectorfield_panel",
+    "load_vectorfield": "vectorfield_io",
+    "iter_vectorfield": "vectorfield_io",
+    "read_ovf": "vectorfield_io",
+    "OVFField": "vectorfield_io",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value         # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if TYPE_CHECKING:
+    from .panel_3d import quiver3_advanced, quiver3_advanced_panel, quiver3_views_panel
+    from .parallel import render_quiver_panels
+    from .render_cache import RenderCache, MeshCache
+    from .plotter_pool import PlotterPool
+    from .animation import QuiverAnimation
+    from .batch import run_figure_jobs
+    from .benchmark import (benchmark_antialiasing, benchmark_import,
+                            benchmark_transforms)
+    from .vectorfield_panel import PlotVectorfieldPanel, plot_vectorfield_panels
+    from .vectorfield_io import (load_vectorfield, iter_vectorfield, read_ovf,
+                                 OVFField)
+
 __all__ = [
     # Options
     "PaperFigOptions",
     "global_options",
 
     # Figure/axes
+    "PaperFigure",
     "create_paper_figure",
     "add_axes_cm",
     "add_label_cm",
     "add_folder_box_cm",
-    "add_line_cm"
+    "add_line_cm",
+    "TexCache",
+    "precompile_tex",
 
     # Utilities
     "crop_image",
@@ -75,6 +152,7 @@ __all__ = [
     "plotLinLin_panel_core",
     "plotLogLog_panel_core",
     "plotScatter2D_panel_core",
+    "plotDensity2D_panel_core",
 
     # 2D
     "plot2D_panel_core",
@@ -84,8 +162,27 @@ __all__ = [
     # 3D
     "quiver3_advanced",
     "quiver3_advanced_panel",
+    "quiver3_views_panel",
+    "render_quiver_panels",
+    "PlotterPool",
+    "RenderCache",
+    "MeshCache",
+    "spatial_subsample",
+    "QuiverAnimation",
+    "run_figure_jobs",
+    "benchmark_antialiasing",
+    "benchmark_import",
+    "benchmark_transforms",
 
     # Vectorfield
     "PlotVectorfieldPanel",
-    "plot_vectorfield_panels"
+    "plot_vectorfield_panels",
+    "load_vectorfield",
+    "iter_vectorfield",
+    "read_ovf",
+    "OVFField",
+    "CoordinateSystem",
+    "register_coordinate_system",
+    "coordinate_system",
+    "coordinate_systems"
 ]
@@ -0,0 +1,308 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from .figure import add_axes_cm
+from .utils import crop_image, add_reference_axes
+from .panel_3d import (
+    _normalize_coords,
+    _thinning_index,
+    _unit_directions,
+    _window_size,
+    _margin_zoom,
+    _pixels_per_unit,
+    _lod_resolution,
+    _scaled_template,
+    _place_template,
+    _build_arrows,
+    _add_arrow_mesh,
+    _add_arrow_primitives,
+    _set_camera,
+    _screenshot,
+    _supersampling,
+    _new_plotter,
+    _downsample
+)
+
+
+class QuiverAnimation:
+    """
+    Time series of 3D quiver frames on fixed positions, rendered from one scene.
+
+    The plotter, the arrow mesh and the reference axes are set up once
+    (from the first frame). Every further frame only rewrites the point,
+    normal and scalar arrays of the arrow mesh in place and renders once,
+    instead of rebuilding the whole panel as quiver3_advanced_panel does.
+    The named views ("iso", "xy", "xz", "yz") fit the camera to the arrow
+    bounds, which change with the arrows, so they are re-framed every
+    frame, as quiver3_advanced_panel would; "top" and "custom" cameras
+    are fixed.
+
+    Usage
+    -----
+    with QuiverAnimation(x, y, z, Cmin=-1, Cmax=1, axes_width_cm=5) as anim:
+        anim.save_png(frames, "m_{:04d}.png")     # frames: (Hx, Hy, Hz, C)
+
+    Parameters
+    ----------
+    x, y, z : array-like
+        Arrow positions, shared by all frames.
+    Cmin, Cmax : float
+        Fixed color limits (a per-frame range would make colors flicker).
+    crop_cm : tuple
+        (left, right, top, bottom) crop of every frame image.
+    priority : array-like, optional
+        Per-point priority for max_arrows/spacing thinning. The selection
+        is made once, so "magnitude" is not available here.
+    fixed_camera : bool
+        Keep the camera of the first frame for the named views too, so the
+        framing does not follow the arrows from frame to frame (frames then
+        differ from single quiver3_advanced_panel renders).
+
+    The remaining arguments are those of quiver3_advanced_panel. Arrows are
+    always built with the template engine (or the "lines"/"points"
+    fallback of resolution="auto").
+    """
+
+    def __init__(
+            self, x, y, z, Cmin, Cmax,
+            cmap="viridis",
+            scale=1.0,
+            f_head_length=4.0 / 6.0,
+            f_stick_radius=1.0 / 6.0,
+            f_head_radius=1.0 / 3.0,
+            centering=True,
+            subsample=1,
+            view="iso",
+            dpi=300,
+            background="white",
+            axes_width_cm=None,
+            margin_cm=0.0,
+            crop_cm=(0, 0, 0, 0),
+            cam_pos=(3, 3, 2),
+            focal_point=(0, 0, 0),
+            up_direction=(0, 0, 1),
+            resolution="auto",
+            plotter_pool=None,
+            max_arrows=None,
+            spacing=None,
+            priority=None,
+            antialiasing="ssaa",
+            fixed_camera=False
+    ):
+        if isinstance(priority, str):
+            raise ValueError("QuiverAnimation thins once for all frames; "
+                             "priority must be None or an array.")
+
+        coords, max_dist = _normalize_coords(
+            np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64),
+            np.asarray(z, dtype=np.float64)
+        )
+        self._keep = _thinning_index(coords, max_dist, None, subsample,
+                                     max_arrows, spacing, priority)
+        self.coords = np.ascontiguousarray(coords[self._keep], dtype=np.float32)
+
+        self.Cmin, self.Cmax = Cmin, Cmax
+        self.cmap = cmap
+        self.scale = scale
+        self.f_head_length = f_head_length
+        self.f_stick_radius = f_stick_radius
+        self.f_head_radius = f_head_radius
+        self.centering = centering
+        self.dpi = dpi
+        self.crop_cm = crop_cm
+        self.camera = dict(view=view, cam_pos=cam_pos, focal_point=focal_point,
+                           up_direction=up_direction)
+        self._reframe = not fixed_camera and view in ("iso", "xy", "xz", "yz")
+        self._axes_actors = []
+
+        # ===== Plotter =====
+        self._k = _supersampling(antialiasing)
+        self.window_size = [self._k * n for n in _window_size(axes_width_cm, dpi)]
+        self.plotter_pool = plotter_pool
+        self.plotter = _new_plotter(self.window_size, antialiasing, plotter_pool)
+        self.plotter.set_background(background)
+
+        # ===== Level of detail (fixed for all frames) =====
+        self._zoom_factor = _margin_zoom(axes_width_cm, margin_cm)
+        self._px_per_unit = _pixels_per_unit(
+            self.window_size, self.coords, view, cam_pos, focal_point,
+            self._zoom_factor
+        )
+        if isinstance(resolution, str) and resolution == "auto":
+            resolution = _lod_resolution(
+                self._px_per_unit, scale, f_head_length, f_stick_radius,
+                f_head_radius
+            )
+        self.resolution = resolution
+
+        self._mesh = None
+        self._H = np.empty((len(self.coords), 3), dtype=np.float32)
+
+    # ---------------------------------------------------------
+    # Frames
+    # ---------------------------------------------------------
+    def render(self, Hx, Hy, Hz, C):
+        """Render one frame; returns the cropped RGB image."""
+        H = self._H
+        H[:, 0] = np.asarray(Hx)[self._keep]
+        H[:, 1] = np.asarray(Hy)[self._keep]
+        H[:, 2] = np.asarray(Hz)[self._keep]
+        _unit_directions(H)
+        C = np.asarray(C)[self._keep]
+
+        if self._mesh is None:
+            self._build_scene(H, C)
+        else:
+            self._update_mesh(H, C)
+            if self._reframe:
+                self._set_camera()
+            else:
+                self.plotter.renderer.ResetCameraClippingRange()
+
+        img = _screenshot(self.plotter)
+        if self._k > 1:
+            img = _downsample(img, self._k)
+
+        # ===== Cropping (cm → px) =====
+        if self.crop_cm != (0, 0, 0, 0):
+            px_per_cm = self.dpi / 2.54
+            crop_px = tuple(int(c * px_per_cm) for c in self.crop_cm)
+            img = crop_image(img, *crop_px)
+        return img
+
+    def frames(self, frames):
+        """Iterate over rendered images of an iterable of (Hx, Hy, Hz, C)."""
+        for Hx, Hy, Hz, C in frames:
+            yield self.render(Hx, Hy, Hz, C)
+
+    def save_png(self, frames, path_pattern="frame_{:04d}.png"):
+        """Write every frame image to path_pattern.format(i); returns the paths."""
+        paths = []
+        for i, img in enumerate(self.frames(frames)):
+            path = path_pattern.format(i)
+            plt.imsave(path, img)
+            paths.append(path)
+        return paths
+
+    def save_figures(self, frames, fig, path_pattern, axes_pos_x_cm,
+                     axes_pos_y_cm, axes_width_cm=None, **savefig_kwargs):
+        """
+        Place the frames in `fig` and save the composited figure per frame.
+
+        The panel axes are created for the first frame; later frames only
+        replace the image data, so the rest of the figure (labels, other
+        panels, colorbars) is laid out once. Returns the saved paths.
+        """
+        if axes_width_cm is None:
+            axes_width_cm = self.window_size[0] / self._k * 2.54 / self.dpi
+        image = None
+        paths = []
+        for i, img in enumerate(self.frames(frames)):
+            if image is None:
+                ax = add_axes_cm(fig, axes_pos_x_cm, axes_pos_y_cm,
+                                 axes_width_cm, axes_width_cm)
+                image = ax.imshow(img)
+                ax.axis("off")
+            else:
+                image.set_data(img)
+            path = path_pattern.format(i)
+            fig.savefig(path, **savefig_kwargs)
+            paths.append(path)
+        return paths
+
+    # ---------------------------------------------------------
+    # Scene
+    # ---------------------------------------------------------
+    def _build_scene(self, H, C):
+        """Arrow mesh, reference axes and camera from the first frame."""
+        plotter = self.plotter
+        clim = [self.Cmin, self.Cmax]
+        # VTK may wrap C without a copy; later frames are written into it
+        C = np.array(C, dtype=np.float64)
+        if isinstance(self.resolution, str):
+            actor = _add_arrow_primitives(
+                plotter, self.resolution, self.coords, H, C,
+                self._arrow_length, self.centering, self.cmap, clim,
+                self._px_per_unit
+            )
+            self._mesh = actor.mapper.dataset
+        else:
+            self._mesh = _build_arrows(
+                self.coords, H, C, self.scale, self.f_head_length,
+                self.f_stick_radius, self.f_head_radius, self.centering,
+                self.resolution
+            )
+            _add_arrow_mesh(plotter, self._mesh, self.cmap, clim)
+
+        try:
+            axes_actors = add_reference_axes(plotter, length=0.5, radius=0.015, offset=0.8)
+        except Exception:
+            axes_actors = []
+        for actor in axes_actors:
+            actor.SetUseBounds(False)
+
+        self._axes_actors = axes_actors
+
+        plotter.suppress_rendering = True
+        self._set_camera()
+
+    def _set_camera(self):
+        _set_camera(self.plotter, zoom_factor=self._zoom_factor,
+                    axes_actors=self._axes_actors, **self.camera)
+
+    @property
+    def _arrow_length(self):
+        return self.scale * (1.0 + self.f_head_length)
+
+    def _update_mesh(self, H, C):
+        """Rewrite points, normals and scalars of the arrow mesh in place."""
+        mesh = self._mesh
+        N = len(self.coords)
+        points = np.asarray(mesh.points)
+
+        if self.resolution == "lines":
+            L = self._arrow_length
+            tails = self.coords - H * (L / 2) if self.centering else self.coords
+            points[:N] = tails
+            points[N:] = tails + H * L
+        elif self.resolution != "points":
+            t_points, t_normals, _ = _scaled_template(
+                self.scale, self.f_head_length, self.f_stick_radius,
+                self.f_head_radius, self.centering, self.resolution
+            )
+            M = len(t_points)
+            normals = np.asarray(mesh.point_data["Normals"])
+            _place_template(t_points, t_normals, self.coords, H,
+                            out_points=points.reshape(N, M, 3),
+                            out_normals=normals.reshape(N, M, 3))
+            mesh.GetPointData().GetNormals().Modified()
+
+        scalars = np.asarray(mesh.point_data["C"])
+        if self.resolution == "lines":
+            scalars.reshape(2, N)[...] = C          # tails, then heads
+        else:
+            scalars.reshape(N, -1)[...] = C[:, None]
+
+        mesh.GetPoints().Modified()
+        mesh.GetPointData().GetArray("C").Modified()
+        mesh.Modified()
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+    def close(self):
+        """Release (or close) the plotter."""
+        if self.plotter is None:
+            return
+        if self.plotter_pool is not None:
+            self.plotter_pool.release(self.plotter)
+        else:
+            self.plotter.close()
+        self.plotter = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
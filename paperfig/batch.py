@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import shutil
+import atexit
+import inspect
+import argparse
+import importlib
+import tempfile
+import traceback
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-worker state set up by _init_worker (plotter pool, TeX cache)
+_worker = {}
+
+
+def run_figure_jobs(jobs, max_workers=None, tex_cache=None, warm_labels=None,
+                    warm_3d=True):
+    """
+    Build and save many figures in a process pool.
+
+    Every job is a dict describing one figure:
+
+    - "func": callable or "module:function" (a bare name is looked up in
+      paperfig, e.g. "PlotVectorfieldPanel"); callables must be
+      module-level so they can be sent to the workers.
+    - "args", "kwargs": arguments of func.
+    - "output": path of the figure file.
+    - "output_arg": name of the func argument receiving the path, for
+      functions that save the figure themselves (default: "figure_path"
+      if func has such an argument). Otherwise func must return a
+      Figure, which is saved with "savefig" (dict of savefig kwargs).
+
+    Outputs are written to a temporary file in the target directory and
+    renamed into place, so a failed or interrupted job never leaves a
+    partial figure. Workers are started once and keep their caches warm
+    between jobs: matplotlib's font cache, an installed TexCache and a
+    PlotterPool handed to functions that take `plotter_pool`.
+
+    Parameters
+    ----------
+    jobs : list of dict
+        Figure jobs, see above.
+    max_workers : int, optional
+        Number of worker processes (default: one per CPU, at most one
+        per job).
+    tex_cache : TexCache, str or True, optional
+        Shared LaTeX fragment cache (directory) installed in every worker.
+    warm_labels : list of str, optional
+        Labels compiled into the TeX cache once, before the workers start.
+    warm_3d : bool
+        Import pyvista/VTK in the workers up front and give each one a
+        PlotterPool.
+
+    Returns
+    -------
+    list of dict
+        One entry per job, in order: "index", "output", "ok", "seconds"
+        (in the worker), "pid" and "error" (traceback, or None).
+    """
+    from .tex_cache import TexCache
+
+    if tex_cache is True:
+        tex_cache = TexCache()
+    elif isinstance(tex_cache, (str, os.PathLike)):
+        tex_cache = TexCache(tex_cache)
+    if tex_cache is not None and warm_labels:
+        tex_cache.warm(warm_labels)
+    tex_dir = tex_cache.directory if tex_cache is not None else None
+
+    if not jobs:
+        return []
+    if max_workers is None:
+        max_workers = mp.cpu_count()
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    # "spawn": forked VTK/OpenGL state is not safe to reuse
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                             initializer=_init_worker,
+                             initargs=(tex_dir, warm_3d)) as pool:
+        futures = [pool.submit(_run_job, i, job) for i, job in enumerate(jobs)]
+        return [f.result() for f in futures]
+
+
+# ===== Worker =====
+
+def _init_worker(tex_dir, warm_3d):
+    """Load fonts, TeX cache and VTK once per worker process."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+    for family in ("serif", "sans-serif"):
+        font_manager.findfont(font_manager.FontProperties(family=[family]))
+
+    if tex_dir is not None:
+        from .tex_cache import TexCache
+        TexCache(tex_dir).install()
+
+    if warm_3d:
+        from .plotter_pool import PlotterPool
+        pool = PlotterPool()
+        atexit.register(pool.close)
+        _worker["plotter_pool"] = pool
+
+
+def _run_job(index, job):
+    """Worker: build and save one figure; returns its report entry."""
+    import matplotlib.pyplot as plt
+
+    output = job.get("output")
+    report = dict(index=index, output=output, ok=False, seconds=0.0,
+                  pid=os.getpid(), error=None)
+    t0 = time.perf_counter()
+    try:
+        func = _resolve_func(job["func"])
+        params = inspect.signature(func).parameters
+        kwargs = dict(job.get("kwargs", {}))
+        pool = _worker.get("plotter_pool")
+        if pool is not None and "plotter_pool" in params and "plotter_pool" not in kwargs:
+            kwargs["plotter_pool"] = pool
+
+        output_arg = job.get("output_arg")
+        if output_arg is None and "figure_path" in params:
+            output_arg = "figure_path"
+
+        def build(path):
+            if output_arg is not None and path is not None:
+                kwargs[output_arg] = path
+            result = func(*job.get("args", ()), **kwargs)
+            if output_arg is None and path is not None:
+                result.savefig(path, **job.get("savefig", {}))
+                plt.close(result)
+
+        if output is None:
+            build(None)
+        else:
+            _write_atomic(output, build)
+        report["ok"] = True
+    except Exception:
+        report["error"] = traceback.format_exc()
+    finally:
+        plt.close("all")
+    report["seconds"] = time.perf_counter() - t0
+    return report
+
+
+def _resolve_func(func):
+    """Callable from a callable, "module:function" or a paperfig name."""
+    if callable(func):
+        return func
+    module, _, name = func.rpartition(":")
+    return getattr(importlib.import_module(module or "paperfig"), name)
+
+
+def _write_atomic(path, write):
+    """
+    Call write(tmp_path) for a temp file next to `path`, then rename it into
+    place. The temp file is created by `write` itself (inside a private
+    temp directory), so it gets the usual umask mode; a job that writes
+    nothing, or an empty file, fails instead of leaving an empty output.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=directory, prefix=".")
+    # keep the file name: savefig picks the format from the extension
+    tmp = os.path.join(tmp_dir, os.path.basename(path))
+    try:
+        write(tmp)
+        if not os.path.isfile(tmp) or os.path.getsize(tmp) == 0:
+            raise RuntimeError("The job wrote no output to " + path)
+        os.replace(tmp, path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ===== Command line =====
+
+def main(argv=None):
+    """paperfig-batch JOBS.json [-j N] [--tex-cache DIR] [--report FILE]"""
+    parser = argparse.ArgumentParser(
+        prog="paperfig-batch",
+        description="Build and save the figure jobs of a JSON file in a process pool.")
+    parser.add_argument("jobs", help="JSON file with a list of job dicts "
+                                     "(func, args, kwargs, output, ...)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--tex-cache", default=None, metavar="DIR",
+                        help="shared LaTeX fragment cache directory")
+    parser.add_argument("--warm-labels", default=None, metavar="FILE",
+                        help="text file with one label per line to precompile")
+    parser.add_argument("--no-3d", action="store_true",
+                        help="do not preload VTK in the workers")
+    parser.add_argument("--report", default=None, metavar="FILE",
+                        help="write the per-job report as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.jobs) as f:
+        jobs = json.load(f)
+    warm_labels = None
+    if args.warm_labels is not None:
+        with open(args.warm_labels) as f:
+            warm_labels = [line.rstrip("\n") for line in f if line.strip()]
+
+    t0 = time.perf_counter()
+    reports = run_figure_jobs(jobs, max_workers=args.workers,
+                              tex_cache=args.tex_cache, warm_labels=warm_labels,
+                              warm_3d=not args.no_3d)
+    wall = time.perf_counter() - t0
+
+    for r in reports:
+        status = "ok  " if r["ok"] else "FAIL"
+        print("{} {:4d} {:7.2f} s  {}".format(status, r["index"], r["seconds"], r["output"]))
+        if not r["ok"]:
+            print("     " + r["error"].strip().splitlines()[-1])
+    failed = sum(not r["ok"] for r in reports)
+    print("{} jobs, {} failed, {:.2f} s wall, {:.2f} s in jobs".format(
+        len(reports), failed, wall, sum(r["seconds"] for r in reports)))
+
+    if args.report is not None:
+        with open(args.report, "w") as f:
+            json.dump(reports, f, indent=1)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
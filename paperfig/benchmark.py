@@ -0,0 +1,259 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+import numpy as np
+
+from .panel_3d import _render_quiver, _supersampling, _new_plotter
+from .plotter_pool import _applied_antialiasing
+from .parallel import _split_panel
+
+
+def benchmark_antialiasing(x, y, z, Hx, Hy, Hz, C, Cmin, Cmax,
+                           modes=("ssaa", "msaa", "fxaa", "none", 2, 3),
+                           repeat=1, **panel_kwargs):
+    """
+    Render time and image difference of each anti-aliasing mode.
+
+    The panel is rendered off-screen with every mode in `modes` (see the
+    antialiasing argument of quiver3_advanced_panel) and compared against
+    the "ssaa" render of the same scene. Useful to pick a cheap mode for
+    draft figures and to check what it costs in quality.
+
+    Parameters
+    ----------
+    x, y, z, Hx, Hy, Hz, C, Cmin, Cmax :
+        As for quiver3_advanced_panel.
+    modes : sequence
+        Anti-aliasing modes to compare.
+    repeat : int
+        Renders per mode; the fastest one is reported.
+    **panel_kwargs :
+        Further quiver3_advanced_panel arguments (axes_width_cm, dpi,
+        view, scale, ...). Placement and caching arguments are ignored.
+
+    Returns
+    -------
+    list of dict
+        One entry per mode with keys "mode", "applied" (the mode VTK
+        actually rendered with, e.g. "ssaa" for "fxaa" on OSMesa/EGL
+        builds), "time_s", "mean_abs_diff", "max_abs_diff" (8-bit levels)
+        and "psnr_db" against "ssaa".
+
+    Example
+    -------
+    for r in benchmark_antialiasing(x, y, z, Hx, Hy, Hz, C, -1, 1,
+                                    axes_width_cm=6, dpi=600):
+        print("{mode!s:>5} ({applied!s:>4})  {time_s:6.2f} s  "
+              "{mean_abs_diff:5.2f}".format(**r))
+    """
+    panel = dict(panel_kwargs, x=x, y=y, z=z, Hx=Hx, Hy=Hy, Hz=Hz, C=C,
+                 Cmin=Cmin, Cmax=Cmax)
+    panel.pop("antialiasing", None)
+    arrays, render_args, _ = _split_panel(panel)
+
+    def render(mode):
+        best, img = np.inf, None
+        for _ in range(max(repeat, 1)):
+            t0 = time.perf_counter()
+            img = _render_quiver(*arrays, **dict(render_args, antialiasing=mode))
+            best = min(best, time.perf_counter() - t0)
+        return best, img
+
+    render("none")                      # warm-up: template cache, GL setup
+    _, reference = render("ssaa")
+    reference = reference.astype(np.float64)
+
+    results = []
+    for mode in modes:
+        seconds, img = render(mode)
+        diff = np.abs(img.astype(np.float64) - reference)
+        mse = np.mean(diff ** 2)
+        results.append(dict(
+            mode=mode,
+            applied=_applied_mode(mode),
+            time_s=seconds,
+            mean_abs_diff=float(diff.mean()),
+            max_abs_diff=float(diff.max()),
+            psnr_db=float(10 * np.log10(255.0 ** 2 / mse)) if mse > 0 else np.inf,
+        ))
+    return results
+
+
+def _applied_mode(mode):
+    """Anti-aliasing a render with `mode` gets (supersampling factors as is)."""
+    if _supersampling(mode) > 1:
+        return mode
+    plotter = _new_plotter([16, 16], mode)
+    try:
+        return _applied_antialiasing(plotter)
+    finally:
+        plotter.close()
+
+
+_IMPORT_SCRIPT = """
+import sys, time, json
+t0 = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - t0
+print(json.dumps([seconds, sorted(m for m in {heavy!r} if m in sys.modules)]))
+"""
+
+
+def benchmark_import(module="paperfig", repeat=5, budget_s=None,
+                     heavy=("pyvista", "vtkmodules", "pandas")):
+    """
+    Cold-start import time of `module`, measured in fresh interpreters.
+
+    Every run starts a new Python process, so nothing is cached in
+    sys.modules (the OS file cache stays warm after the first run).
+    Besides the time, the check reports which of the `heavy` modules the
+    import pulled in; `import paperfig` should load none of them.
+
+    Parameters
+    ----------
+    module : str
+        Module to import.
+    repeat : int
+        Number of fresh interpreters; the fastest run is reported.
+    budget_s : float, optional
+        Cold-start budget. If given, a RuntimeError is raised when the
+        fastest import exceeds it or loads any of the `heavy` modules.
+    heavy : sequence of str
+        Modules that must stay out of the import.
+
+    Returns
+    -------
+    dict
+        Keys "module", "time_s" (fastest run), "times_s" (all runs) and
+        "heavy_modules" (heavy modules loaded by the import).
+
+    Example
+    -------
+    benchmark_import(budget_s=1.0)      # e.g. in CI, before shipping
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_root, env.get("PYTHONPATH")) if p
+    )
+    script = _IMPORT_SCRIPT.format(module=module, heavy=tuple(heavy))
+
+    times, loaded = [], set()
+    for _ in range(max(repeat, 1)):
+        out = subprocess.run([sys.executable, "-c", script], env=env,
+                             capture_output=True, text=True, check=True)
+        seconds, modules = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(seconds)
+        loaded.update(modules)
+
+    result = dict(module=module, time_s=min(times), times_s=times,
+                  heavy_modules=sorted(loaded))
+    if budget_s is not None:
+        if loaded:
+            raise RuntimeError("import {} loads {}".format(
+                module, ", ".join(sorted(loaded))))
+        if result["time_s"] > budget_s:
+            raise RuntimeError("import {} takes {:.3f} s (budget {:.3f} s)".format(
+                module, result["time_s"], budget_s))
+    return result
+
+
+def benchmark_transforms(n=10_000_000, systems=("cyl", "sph"), repeat=3, seed=0):
+    """
+    Time and temporary memory of the coordinate-system projections.
+
+    For every system, the registry projection (float64 results, and
+    float32 into preallocated out= buffers) is compared against the
+    element-wise formulas the vector-field panels used before (arctan2,
+    arccos and repeated cos/sin, a fresh float64 array per operation).
+    Peak memory is traced with tracemalloc (NumPy reports its data
+    buffers to it) and excludes the inputs and the out= buffers.
+
+    Parameters
+    ----------
+    n : int
+        Number of random points and vectors.
+    systems : sequence of str
+        Registered coordinate systems to measure.
+    repeat : int
+        Runs per variant; the fastest one is reported.
+    seed : int
+        Random seed of the test data.
+
+    Returns
+    -------
+    list of dict
+        One entry per system and variant ("reference", "float64",
+        "float32 out") with keys "system", "variant", "time_s",
+        "peak_bytes" and "max_abs_diff" (against "reference").
+
+    Example
+    -------
+    for r in benchmark_transforms():
+        print("{system} {variant:12s} {time_s:6.3f} s {peak_bytes:>12,d} B".format(**r))
+    """
+    import tracemalloc
+    from .transforms import coordinate_system
+
+    rng = np.random.default_rng(seed)
+    x, y, z = rng.uniform(-50.0, 50.0, (3, n))
+    m = rng.normal(size=(3, n))
+    m /= np.linalg.norm(m, axis=0)
+    mx, my, mz = m
+    out = np.empty((4, n), dtype=np.float32)
+
+    def measure(run):
+        best, peak, result = np.inf, 0, None
+        for _ in range(max(repeat, 1)):
+            result = None
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - t0)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        return best, peak, result
+
+    results = []
+    for name in systems:
+        system = coordinate_system(name)
+        variants = [
+            ("reference", lambda: _reference_projection(name, x, y, z, mx, my, mz)),
+            ("float64", lambda: system.project(x, y, z, mx, my, mz)[:4]),
+            ("float32 out", lambda: system.project(x, y, z, mx, my, mz, out=out)[:4]),
+        ]
+        reference = None
+        for variant, run in variants:
+            seconds, peak, values = measure(run)
+            if reference is None:
+                reference = values
+            diff = max(float(np.max(np.abs(np.asarray(v, dtype=np.float64) - r)))
+                       for v, r in zip(values, reference))
+            results.append(dict(system=name, variant=variant, time_s=seconds,
+                                peak_bytes=peak, max_abs_diff=diff))
+    return results
+
+
+def _reference_projection(name, x, y, z, mx, my, mz):
+    """Parameter and components with the former per-panel formulas."""
+    if name == "cyl":
+        rho = np.sqrt(x**2 + y**2)
+        phi = np.arctan2(y, x)
+        return (rho, mx * np.cos(phi) + my * np.sin(phi),
+                my * np.cos(phi) - mx * np.sin(phi), mz)
+    if name == "sph":
+        r = np.sqrt(x**2 + y**2 + z**2)
+        theta = np.arccos(np.clip(z / np.maximum(r, 1e-12), -1, 1))
+        phi = np.arctan2(y, x)
+        return (r,
+                mx * np.sin(theta) * np.cos(phi) + my * np.sin(theta) * np.sin(phi)
+                + mz * np.cos(theta),
+                mx * np.cos(theta) * np.cos(phi) + my * np.cos(theta) * np.sin(phi)
+                - mz * np.sin(theta),
+                -mx * np.sin(phi) + my * np.cos(phi))
+    if name == "cart":
+        return x, mx, my, mz
+    raise ValueError("No reference formulas for coordinate system " + repr(name))
@@ -1,8 +1,101 @@
+import os
+import copy
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
 
+# rcParams are process-global: every figure style is applied under this lock
+_STYLE_LOCK = threading.RLock()
+
+
+class PaperFigure(Figure):
+    """
+    Figure that carries its own style instead of relying on global rcParams.
+
+    paperfig_rc holds the rcParams resolved by create_paper_figure and
+    paperfig_options the PaperFigOptions used by the panel functions
+    (None: paperfig.global_options at call time). Panels add their
+    artists, and the figure draws and saves itself, inside
+    style_context(), so figures with different font sizes, dpi or LaTeX
+    settings can be built concurrently in threads.
+
+    rcParams are process-global, so style_context() holds a process-wide
+    lock: building, drawing and saving figures from several threads is
+    thread-safe, but these steps are serialized, not run in parallel.
+    Use processes (paperfig.parallel, paperfig.batch) for parallel output.
+    """
+
+    def __init__(self, *args, paperfig_rc=None, paperfig_options=None, **kwargs):
+        self.paperfig_rc = dict(paperfig_rc or {})
+        self.paperfig_options = paperfig_options
+        with self.style_context():
+            super().__init__(*args, **kwargs)
+
+    @contextmanager
+    def style_context(self):
+        """Apply the figure's rcParams (holds the process-wide style lock)."""
+        with _STYLE_LOCK, mpl.rc_context(self.paperfig_rc):
+            yield
+
+    def draw(self, renderer):
+        with self.style_context():
+            super().draw(renderer)
+
+    def savefig(self, fname, *args, **kwargs):
+        with self.style_context():
+            if mpl.rcParams["text.usetex"]:
+                # one latex run for all strings instead of one per string
+                from .tex_cache import precompile_tex
+                precompile_tex(self, dpi=_raster_dpi(fname, kwargs))
+            return super().savefig(fname, *args, **kwargs)
+
+
+_RASTER_FORMATS = {"png", "jpg", "jpeg", "tif", "tiff", "webp", "raw", "rgba"}
+
+
+def _raster_dpi(fname, kwargs):
+    """Output dpi of savefig(fname, **kwargs), or None for vector formats."""
+    fmt = kwargs.get("format")
+    if fmt is None and isinstance(fname, (str, os.PathLike)):
+        fmt = os.path.splitext(os.fspath(fname))[1][1:]
+    fmt = (fmt or mpl.rcParams["savefig.format"]).lower()
+    if fmt not in _RASTER_FORMATS:
+        return None
+    return kwargs.get("dpi") or mpl.rcParams["savefig.dpi"]
+
+
+def figure_style(fig):
+    """Style context of `fig` (a no-op for figures not made by paperfig)."""
+    style_context = getattr(fig, "style_context", None)
+    return style_context() if style_context is not None else nullcontext()
+
+
+def with_figure_style(func):
+    """Run `func(fig, ...)` inside the style context of `fig`."""
+    @functools.wraps(func)
+    def wrapper(fig, *args, **kwargs):
+        with figure_style(fig):
+            return func(fig, *args, **kwargs)
+    return wrapper
+
+
+def figure_options(fig, options=None):
+    """PaperFigOptions of a panel: `options`, else the figure's, else global_options."""
+    if options is not None:
+        return options
+    options = getattr(fig, "paperfig_options", None)
+    if options is None:
+        import paperfig as pf
+        options = pf.global_options
+    return options
+
+
 def create_paper_figure(
         width_cm=8.5,
         height_cm=6.0,
@@ -11,8 +104,28 @@ def create_paper_figure(
         use_latex=True,
         use_pgf=False,
         fontfamily="serif",
-        fontserif="Computer Modern Roman"
+        fontserif="Computer Modern Roman",
+        tex_cache=None,
+        options=None,
+        isolated=False
 ):
+    """
+    Create a cm-sized figure with its own LaTeX/font/dpi style.
+
+    By default the rcParams below are applied globally (mpl.rcParams), so
+    every later matplotlib call, e.g. ax.set_title() or fig.text(), picks
+    up the paper style, and the panels read paperfig.global_options when
+    they are called. The rcParams are also stored on the returned
+    PaperFigure, which draws and saves itself in them.
+
+    With isolated=True the global rcParams are left untouched and the
+    panel options are fixed at creation (`options`, or a snapshot of
+    paperfig.global_options), so figures with different styles can be
+    built side by side or in threads. Only paperfig's own functions apply
+    the style when they add artists; plain matplotlib calls must be
+    wrapped in `with fig.style_context():` to get it. The style lock
+    serializes the threads (see PaperFigure).
+    """
     cm = 1 / 2.54
 
     rc = {
@@ -45,12 +158,25 @@ def create_paper_figure(
             "font.family": fontfamily,
         })
 
-    mpl.rcParams.update(rc)
+    # Persistent TeX fragment cache (TexCache or True), shared across processes
+    if use_latex and tex_cache is not None and tex_cache is not False:
+        from .tex_cache import TexCache
+        (TexCache() if tex_cache is True else tex_cache).install()
+
+    if not isolated:
+        with _STYLE_LOCK:
+            mpl.rcParams.update(rc)
+    elif options is None:
+        import paperfig as pf
+        options = copy.deepcopy(pf.global_options)
 
-    fig = plt.figure(figsize=(width_cm * cm, height_cm * cm))
+    fig = plt.figure(figsize=(width_cm * cm, height_cm * cm), dpi=dpi,
+                     FigureClass=PaperFigure, paperfig_rc=rc,
+                     paperfig_options=options)
     return fig
 
 
+@with_figure_style
 def add_axes_cm(fig, left_cm, bottom_cm, width_cm, height_cm):
     W, H = fig.get_size_inches()
     return fig.add_axes([
@@ -61,6 +187,7 @@ def add_axes_cm(fig, left_cm, bottom_cm, width_cm, height_cm):
     ])
 
 # add_label_cm ########################################
+@with_figure_style
 def add_label_cm(fig, text, x_cm, y_cm, **kwargs):
     """
     Add a text label using cm coordinates relative to the figure size.
@@ -92,6 +219,7 @@ def add_label_cm(fig, text, x_cm, y_cm, **kwargs):
 
 
 
+@with_figure_style
 def add_folder_box_cm(fig, x_cm, y_cm, w_cm, h_cm,
                       text="", tab_w_cm=1.0, tab_h_cm=0.4,
                       facecolor="white", edgecolor="black",
@@ -164,6 +292,7 @@ def add_folder_box_cm(fig, x_cm, y_cm, w_cm, h_cm,
     fig.text(text_x_rel, text_y_rel, text, **text_kwargs)
 
 
+@with_figure_style
 def add_line_cm(fig, x1_cm, y1_cm, x2_cm, y2_cm, **kwargs):
 
     # Figure size in cm
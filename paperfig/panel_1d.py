@@ -1,12 +1,14 @@
 import numpy as np
+import matplotlib as mpl
 import matplotlib.pyplot as plt
-from .figure import add_axes_cm
+from .figure import add_axes_cm, with_figure_style, figure_options
 from .utils import apply_tick_style, apply_label_style, apply_grid_style
 
 
 # ============================================================
 # 1) LOG–LOG PANEL
 # ============================================================
+@with_figure_style
 def plotLogLog_panel_core(
         fig,
         curves,
@@ -28,14 +30,10 @@ def plotLogLog_panel_core(
 ):
     """Unified log–log panel using PaperFigOptions."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Use global or local options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Axes creation
@@ -139,6 +137,7 @@ def plotLogLog_panel_core(
 # ============================================================
 # 2) LIN–LIN PANEL
 # ============================================================
+@with_figure_style
 def plotLinLin_panel_core(
         fig,
         curves,
@@ -158,14 +157,10 @@ def plotLinLin_panel_core(
 ):
     """Unified linear panel using PaperFigOptions."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Resolve options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Create axes
@@ -254,6 +249,7 @@ def plotLinLin_panel_core(
 # ============================================================
 # 3) SCATTER 2D PANEL
 # ============================================================
+@with_figure_style
 def plotScatter2D_panel_core(
         fig,
         datasets,
@@ -274,14 +270,10 @@ def plotScatter2D_panel_core(
 ):
     """Unified scatter panel using PaperFigOptions."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Resolve options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Create axes
@@ -372,3 +364,225 @@ def plotScatter2D_panel_core(
 
 
 
+# ============================================================
+# 4) DENSITY 2D PANEL
+# ============================================================
+@with_figure_style
+def plotDensity2D_panel_core(
+        fig,
+        datasets,
+        pos_cm=(0, 0),
+        size_cm=(3.5, 3.5),
+        xlabel="x",
+        ylabel="y",
+        title=None,
+        xlim=None,
+        ylim=None,
+        xticks=None,
+        yticks=None,
+        xticklabels=None,
+        yticklabels=None,
+        bins=None,
+        mode="alpha",
+        alpha=0.8,
+        markersize=1.0,
+        options=None
+):
+    """
+    Scatter-like panel for huge point counts: every dataset is binned into
+    a 2D count raster and drawn as one image in its color, so drawing and
+    file size depend on the number of bins, not of points.
+
+    Datasets are dicts with "x", "y" (points) or "counts" (raster of shape
+    (x bins, y bins)) and "extent" (x0, x1, y0, y1), plus optional
+    "label" and "color". Points outside xlim/ylim are dropped. Without
+    xlim/ylim the axes span the data of all datasets plus the default
+    axes margins, as the autoscaled scatter panel; for "counts" the data
+    limits are the optional "datalim" (x0, x1, y0, y1), else the
+    occupied cells.
+
+    bins : int or (int, int), optional
+        Raster size; default cells as wide as the markers of the scatter
+        panel with the same `markersize`, so the occupied cells cover
+        about the area the markers would.
+    markersize : float
+        Marker area in pt^2, as in plotScatter2D_panel_core; sets the
+        default bins.
+    mode : "alpha" or "count"
+        "alpha": occupied cells drawn with `alpha` (looks like the
+        scatter); "count": opacity grows with the log of the count.
+    """
+
+    # ---------------------------------------------------------
+    # Resolve options (explicit > figure > global)
+    # ---------------------------------------------------------
+    opts = figure_options(fig, options)
+    if mode not in ("alpha", "count"):
+        raise ValueError("mode must be 'alpha' or 'count'.")
+
+    # ---------------------------------------------------------
+    # Create axes
+    # ---------------------------------------------------------
+    ax = add_axes_cm(fig, pos_cm[0], pos_cm[1], size_cm[0], size_cm[1])
+
+    # ---------------------------------------------------------
+    # Raster geometry (common to all point datasets)
+    # ---------------------------------------------------------
+    if bins is None:
+        bins = tuple(_marker_bins(s, markersize) for s in size_cm)
+    elif np.isscalar(bins):
+        bins = (int(bins), int(bins))
+    points = [d for d in datasets if "counts" not in d]
+    xrange = xlim if xlim is not None else _data_range([d["x"] for d in points])
+    yrange = ylim if ylim is not None else _data_range([d["y"] for d in points])
+
+    # ---------------------------------------------------------
+    # Draw one RGBA image per dataset
+    # ---------------------------------------------------------
+    colors = opts.colors
+    handles = []
+    occupied = []
+    for i, data in enumerate(datasets):
+        if "counts" in data:
+            counts = np.asarray(data["counts"])
+            extent = tuple(data["extent"])
+        else:
+            counts = _histogram2d_counts(data["x"], data["y"], bins, xrange, yrange)
+            extent = (*xrange, *yrange)
+        occupied.append(data.get("datalim") or _occupied_extent(counts, extent))
+
+        color = data.get("color", colors[i % len(colors)])
+        rgba = np.zeros(counts.T.shape + (4,), dtype=np.float32)
+        rgba[..., :3] = mpl.colors.to_rgb(color)
+        if mode == "alpha":
+            rgba[..., 3] = alpha * (counts.T > 0)
+        else:
+            peak = counts.max()
+            if peak > 0:
+                rgba[..., 3] = alpha * np.log1p(counts.T) / np.log1p(peak)
+
+        ax.imshow(rgba, extent=extent, origin="lower", aspect="auto",
+                  interpolation="nearest", zorder=1)
+        if "label" in data:
+            handles.append(mpl.lines.Line2D(
+                [], [], linestyle="none", marker="s", markersize=2,
+                markeredgewidth=0, color=color, label=data["label"]))
+
+    occupied = [e for e in occupied if e is not None]
+    if occupied:
+        # data limits of all datasets plus the default axes margins, as
+        # the scatter panel's autoscaling
+        x0, y0 = (min(e[k] for e in occupied) for k in (0, 2))
+        x1, y1 = (max(e[k] for e in occupied) for k in (1, 3))
+        for lim, set_lim, key in (((x0, x1), ax.set_xlim, "axes.xmargin"),
+                                  ((y0, y1), ax.set_ylim, "axes.ymargin")):
+            pad = mpl.rcParams[key] * (lim[1] - lim[0])
+            set_lim(lim[0] - pad, lim[1] + pad)
+
+    # ---------------------------------------------------------
+    # Labels
+    # ---------------------------------------------------------
+    apply_label_style(ax, xlabel, ylabel, title, opts.fontsize)
+
+    # Limits
+    if xlim: ax.set_xlim(xlim)
+    if ylim: ax.set_ylim(ylim)
+
+    # ---------------------------------------------------------
+    # Ticks
+    # ---------------------------------------------------------
+    apply_tick_style(
+        ax,
+        show_ticks=True,
+        ticks_fontsize=opts.ticks_fontsize,
+        major_tick_length=opts.major_tick_length,
+        major_tick_width=opts.major_tick_width,
+        minor_tick_length=opts.minor_tick_length,
+        minor_tick_width=opts.minor_tick_width,
+        xticks=xticks,
+        yticks=yticks,
+        xticklabels=xticklabels,
+        yticklabels=yticklabels
+    )
+
+    # ---------------------------------------------------------
+    # Grid
+    # ---------------------------------------------------------
+    apply_grid_style(
+        ax,
+        show=True,
+        major=True,
+        minor=False,
+        major_linewidth=0.4,
+        major_color=opts.grid_color,
+        alpha=0.6
+    )
+
+    # ---------------------------------------------------------
+    # Spines
+    # ---------------------------------------------------------
+    for spine in ax.spines.values():
+        spine.set_linewidth(opts.spine_width)
+        spine.set_color(opts.spine_color)
+
+    # ---------------------------------------------------------
+    # Legend
+    # ---------------------------------------------------------
+    if handles:
+        ax.legend(
+            handles=handles,
+            fontsize=opts.ticks_fontsize,
+            frameon=False,
+            loc="best",
+            handlelength=1.8,
+            handletextpad=0.4
+        )
+
+    ax.set_axisbelow(True)
+
+    return ax
+
+
+def _marker_bins(size_cm, markersize=1.0):
+    """Bins along `size_cm` of the width of a scatter marker of `markersize` pt^2."""
+    return max(2, int(round(size_cm / 2.54 * 72 / np.sqrt(markersize))))
+
+
+def _occupied_extent(counts, extent):
+    """(x0, x1, y0, y1) of the nonzero cells of `counts`, or None."""
+    ix, iy = (np.flatnonzero(np.any(counts, axis=a)) for a in (1, 0))
+    if not len(ix):
+        return None
+    nx, ny = counts.shape
+    dx = (extent[1] - extent[0]) / nx
+    dy = (extent[3] - extent[2]) / ny
+    return (extent[0] + ix[0] * dx, extent[0] + (ix[-1] + 1) * dx,
+            extent[2] + iy[0] * dy, extent[2] + (iy[-1] + 1) * dy)
+
+
+def _data_range(arrays):
+    """(min, max) over the finite values of all arrays."""
+    lo, hi = np.inf, -np.inf
+    for a in arrays:
+        a = np.asarray(a)
+        if a.size:
+            lo, hi = min(lo, np.nanmin(a)), max(hi, np.nanmax(a))
+    if not lo < hi:
+        lo, hi = (lo - 0.5, lo + 0.5) if np.isfinite(lo) else (0.0, 1.0)
+    return float(lo), float(hi)
+
+
+def _histogram2d_counts(x, y, bins, xrange, yrange):
+    """
+    Counts of the points on a (bins[0], bins[1]) grid over xrange x yrange
+    (np.histogram2d with uniform bins, as one bincount over flat indices).
+    """
+    nx, ny = bins
+    ix = (np.ravel(x) - xrange[0]) * (nx / (xrange[1] - xrange[0]))
+    iy = (np.ravel(y) - yrange[0]) * (ny / (yrange[1] - yrange[0]))
+    # right edges belong to the last bin, as in np.histogram2d
+    ix[ix == nx] = nx - 1
+    iy[iy == ny] = ny - 1
+    ok = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    flat = ix[ok].astype(np.intp) * ny + iy[ok].astype(np.intp)
+    return np.bincount(flat, minlength=nx * ny).reshape(nx, ny)
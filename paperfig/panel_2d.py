@@ -1,12 +1,13 @@
 import numpy as np
 import matplotlib as mpl
-from .figure import add_axes_cm
+from .figure import add_axes_cm, with_figure_style, figure_options
 from .utils import apply_tick_style, apply_label_style, apply_grid_style
 
 
 # ============================================================
 # 1) 2D IM SHOW PANEL
 # ============================================================
+@with_figure_style
 def plot2D_panel_core(
         fig, x, y, Z,
         pos_cm=(0, 0),
@@ -29,14 +30,10 @@ def plot2D_panel_core(
 ):
     """2D imshow panel with unified PaperFigOptions styling."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Resolve options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Create axis
@@ -107,6 +104,7 @@ def plot2D_panel_core(
 # ============================================================
 # 2) 2D PCOLORMESH PANEL
 # ============================================================
+@with_figure_style
 def plot2D_pcolormesh_panel_core(
         fig, x, y, Z,
         pos_cm=(0, 0),
@@ -130,14 +128,10 @@ def plot2D_pcolormesh_panel_core(
 ):
     """2D pcolormesh panel with unified PaperFigOptions styling."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Resolve options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Create axis
@@ -216,6 +210,7 @@ def plot2D_pcolormesh_panel_core(
 # ============================================================
 # 3) COLORBAR (CM-PLACED)
 # ============================================================
+@with_figure_style
 def add_colorbar_cm(
         fig,
         pos_cm=(0, 0),
@@ -230,14 +225,10 @@ def add_colorbar_cm(
 ):
     """Colorbar with unified PaperFigOptions styling."""
 
-    import paperfig as pf
-
     # ---------------------------------------------------------
-    # Resolve options
+    # Resolve options (explicit > figure > global)
     # ---------------------------------------------------------
-    if options is None:
-        options = pf.global_options
-    opts = options
+    opts = figure_options(fig, options)
 
     # ---------------------------------------------------------
     # Axis
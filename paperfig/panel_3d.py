@@ -1,8 +1,13 @@
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 import pyvista as pv
-from .figure import add_axes_cm
+from .figure import add_axes_cm, with_figure_style
 from .utils import crop_image, add_reference_axes
+from .sampling import spatial_subsample
+from .render_cache import RenderCache, MeshCache
+from .plotter_pool import _enable_antialiasing
 
 def quiver3_advanced(
     x, y, z, Hx, Hy, Hz, C,
@@ -12,7 +17,13 @@ def quiver3_advanced(
     f_stick_radius=1.0/6.0,
     f_head_radius=1.0/3.0,
     centering=True,
-    subsample=1
+    subsample=1,
+    engine="template",
+    resolution=None,
+    max_arrows=None,
+    spacing=None,
+    priority=None,
+    antialiasing="ssaa"
 ):
     """
     High-quality 3D quiver visualization (MATLAB-style) with proportional geometry.
@@ -39,8 +50,39 @@ def quiver3_advanced(
         If True, arrows are centered on (x,y,z).
     subsample : int
         Draw every n-th arrow for performance.
+    engine : str
+        "template" builds all arrows as one mesh from a cached arrow
+        template, "loop" adds one cylinder+cone actor per arrow.
+    resolution : int or None
+        Number of sides of stick and head (None: PyVista defaults).
+    max_arrows, spacing : int, float
+        Spatially uniform thinning (one arrow per voxel of edge
+        `spacing`, or at most `max_arrows` arrows) instead of the
+        `subsample` stride.
+    priority : "magnitude" or array-like, optional
+        Keep the highest-priority vector per voxel instead of the most
+        central one.
+    antialiasing : str
+        VTK anti-aliasing of the window: "ssaa", "msaa", "fxaa" or "none".
     """
 
+    x = np.asarray(x)
+    y = np.asarray(y)
+    z = np.asarray(z)
+    C = np.asarray(C)
+
+    # ===== Arrow thinning =====
+    H = _float32_columns(Hx, Hy, Hz)
+    if max_arrows is not None or spacing is not None:
+        if isinstance(priority, str) and priority == "magnitude":
+            priority = np.linalg.norm(H, axis=1)
+        keep = spatial_subsample(
+            np.stack([x, y, z], axis=1), max_arrows=max_arrows,
+            spacing=spacing, priority=priority
+        )
+        x, y, z, H, C = x[keep], y[keep], z[keep], H[keep], C[keep]
+        subsample = 1
+
     # ===== Geometry scaling =====
     stick_length = 1.0 * scale
     head_length  = f_head_length * stick_length
@@ -48,39 +90,37 @@ def quiver3_advanced(
     head_radius  = f_head_radius * stick_length
 
     # ===== Normalize directions =====
-    H = np.stack([Hx, Hy, Hz], axis=1)
-    H /= np.linalg.norm(H, axis=1)[:, None]
-
-    # ===== Color mapping =====
-    cmap_func = plt.get_cmap(cmap)
-    scalars = (C - np.min(C)) / (np.max(C) - np.min(C))
-    colors = cmap_func(scalars)[:, :3]  # RGB (ignore alpha)
+    H = _unit_directions(H)
 
     # ===== Plot setup =====
+    if _supersampling(antialiasing) > 1:
+        raise ValueError("Supersampling factors need an off-screen render; "
+                         "use antialiasing='ssaa', 'msaa', 'fxaa' or 'none'.")
     plotter = pv.Plotter(window_size=[900, 800])
-    plotter.enable_anti_aliasing('ssaa')
+    _enable_antialiasing(plotter, antialiasing)
 
     # ===== Draw arrows =====
-    for i in range(0, len(x), subsample):
-        p0 = np.array([x[i], y[i], z[i]])
-        direction = H[i]
-        color = colors[i]
-        print("quiver3 build progress: " + str(i/len(x)*100) + " %")
-        arrow = pv.Cylinder(
-            center=p0 + direction * stick_length/2 if not centering else p0,
-            direction=direction,
-            radius=stick_radius,
-            height=stick_length
-        )
-        cone = pv.Cone(
-            center=p0 + direction * (stick_length + head_length/2) if not centering else p0 + direction*(stick_length/2),
-            direction=direction,
-            height=head_length,
-            radius=head_radius
+    if engine == "template":
+        points = _float32_columns(x, y, z)[::subsample]
+        arrows = _build_arrows(
+            points, H[::subsample], C[::subsample],
+            scale, f_head_length, f_stick_radius, f_head_radius,
+            centering, resolution
         )
+        _add_arrow_mesh(plotter, arrows, cmap, [np.min(C), np.max(C)])
+    elif engine == "loop":
+        # ===== Color mapping =====
+        cmap_func = plt.get_cmap(cmap)
+        scalars = (C - np.min(C)) / (np.max(C) - np.min(C))
+        colors = cmap_func(scalars)[:, :3]  # RGB (ignore alpha)
 
-        actor = arrow.merge(cone)
-        plotter.add_mesh(actor, color=color, smooth_shading=True, specular=0.3)
+        _loop_arrows(
+            plotter, x, y, z, H, colors, subsample,
+            stick_length, head_length, stick_radius, head_radius,
+            centering
+        )
+    else:
+        raise ValueError("engine must be 'template' or 'loop'.")
 
     # ===== Scene =====
     plotter.set_background("white")
@@ -107,15 +147,118 @@ def quiver3_advanced_panel(
         crop_cm=(0, 0, 0, 0),
         cam_pos=(3, 3, 2),  # camera position (x,y,z)
         focal_point=(0, 0, 0),  # focal point (center of scene)
-        up_direction=(0, 0, 1)
+        up_direction=(0, 0, 1),
+        engine="template",
+        resolution="auto",
+        plotter_pool=None,
+        max_arrows=None,
+        spacing=None,
+        priority=None,
+        render_cache=None,
+        tile_px=None,
+        tile_out=None,
+        cull=None,
+        cull_layers=6,
+        antialiasing="ssaa",
+        indexing="xy",
+        mesh_cache=None
 ):
     """
     Returns a rendered image (NumPy array) of a 3D quiver field panel.
 
+    Regular grids:
+        x, y, z may be 1D axes with Hx, Hy, Hz, C given as 3D arrays of
+        shape (len(y), len(x), len(z)) (indexing="xy", as np.meshgrid) or
+        (len(x), len(y), len(z)) (indexing="ij"). np.meshgrid output, 3D
+        or flattened, is detected as well, as are 3D np.broadcast_to views
+        of the axes (OVFField.coordinates). Uniform grids are rendered as
+        a pv.ImageData (the glyph engine works on it directly) and
+        subsample, max_arrows and spacing become strides per grid axis
+        (subsample: a stride of about subsample**(1/3), so the arrow
+        count drops by about `subsample` as for point lists).
+
     centering=True:
         Each arrow is centered around its reference point (x,y,z),
         i.e., half of the shaft extends forward, half backward.
 
+    engine="template":
+        A cached canonical arrow is rotated and translated to all points
+        in one batched NumPy operation (template normals are rotated
+        alongside) and added as a single actor.
+        engine="glyph" does the same through VTK's glyph filter,
+        engine="loop" builds one cylinder+cone actor per arrow
+        (reference implementation, slow for large fields).
+
+    resolution="auto":
+        Number of sides of stick and head, chosen per render from the
+        on-screen arrow size (axes_width_cm, dpi, scale, camera distance,
+        margin zoom) and capped at the PyVista defaults (100-sided stick,
+        6-sided head). Arrows thinner than a pixel are drawn as lines,
+        arrows shorter than a pixel as points. None keeps the defaults,
+        an int or (stick, head) tuple fixes the sides, "lines" or
+        "points" force the fallback.
+
+    plotter_pool=None:
+        Optional PlotterPool. The off-screen plotter is taken from the
+        pool and handed back (cleared) after the screenshot instead of
+        being created and closed for this panel only.
+
+    max_arrows=None, spacing=None:
+        Spatially uniform thinning instead of the `subsample` stride:
+        one arrow per voxel of edge `spacing` (in data units), or the
+        voxel edge that keeps at most `max_arrows` arrows. With
+        priority="magnitude" (or a per-point array) the strongest vector
+        of each voxel is kept instead of the most central one.
+
+    render_cache=None:
+        Optional RenderCache (or True for the default on-disk cache).
+        The uncropped image is looked up by a hash of the input arrays
+        and all render parameters and returned without starting VTK;
+        new renders are stored.
+
+    mesh_cache=None:
+        Optional MeshCache (or True for the default on-disk cache). The
+        built arrow mesh is stored as binary .vtp, keyed by the input
+        arrays and the geometry parameters; calls that only change the
+        camera (view, cam_pos, focal_point, up_direction, margin_cm)
+        reload it instead of rebuilding it. Used for tessellated arrows
+        without cull; resolution="auto" may still pick another
+        tessellation when the on-screen arrow size changes.
+
+    tile_px=None:
+        Render the image as tiles of at most tile_px x tile_px pixels
+        with a shared camera projection and stitch them, so that the
+        render window (and its SSAA buffers) stays small at high dpi.
+        tile_out may be a preallocated uint8 array of the final size or
+        a file path for a memory-mapped .npy result.
+        With antialiasing="none" or an int k the stitched image matches a
+        single render; VTK's "ssaa" samples are not aligned to pixels, so
+        its edges and shading gradients differ slightly between tiles.
+
+    cull=None:
+        "frustum" projects the points with the final camera and builds
+        geometry only for arrows that reach into the image after crop_cm.
+        "occlusion" additionally keeps only the cull_layers nearest arrows
+        per arrow-sized screen cell (approximate: arrows seen through gaps
+        further back may be lost). Arrows that define the scene bounds are
+        always kept, so the camera framing is unchanged.
+
+    antialiasing="ssaa":
+        "ssaa" (VTK supersampling, the most expensive), "msaa", "fxaa",
+        "none", or an int k: render at k times the resolution without
+        VTK anti-aliasing and box-downsample in NumPy. A cheap mode suits
+        drafts; see paperfig.benchmark_antialiasing for time and image
+        difference per mode.
+
+    Memory:
+        Positions and directions are held as one contiguous float32 (N,3)
+        buffer each; the "points"/"lines" fallbacks hand them to VTK
+        without a copy and colors come from VTK's lookup table applied
+        to C. For 10M random points at 150 dpi (4 cm) the measured peak
+        above the input arrays is about 0.8 GB with resolution="points"
+        and 1.7 GB with "lines" (render buffers included). Tessellated
+        arrows need N x (template vertices) points and normals instead.
+
     normalize_coords=True:
         Centers and normalizes (x,y,z) to fit roughly within [-1,1]^3
         for consistent scaling across datasets.
@@ -130,84 +273,680 @@ def quiver3_advanced_panel(
     Hz = np.asarray(Hz)
     C  = np.asarray(C)
 
-    # ===== coordinate centering and normalization =====
-    coords = np.stack([x, y, z], axis=1)
-    center = np.mean(coords, axis=0)
-    coords -= center
-    max_dist = np.max(np.linalg.norm(coords, axis=1))
-    coords /= max_dist
-    x, y, z = coords[:, 0], coords[:, 1], coords[:, 2]
+    # ===== Render (or reuse a cached render) =====
+    render_args = dict(
+        Cmin=Cmin, Cmax=Cmax, cmap=cmap, scale=scale,
+        f_head_length=f_head_length, f_stick_radius=f_stick_radius,
+        f_head_radius=f_head_radius, centering=centering,
+        subsample=subsample, view=view, dpi=dpi, background=background,
+        axes_width_cm=axes_width_cm, margin_cm=margin_cm, cam_pos=cam_pos,
+        focal_point=focal_point, up_direction=up_direction, engine=engine,
+        resolution=resolution, max_arrows=max_arrows, spacing=spacing,
+        priority=priority, tile_px=tile_px, cull=cull,
+        cull_layers=cull_layers,
+        cull_crop_cm=crop_cm if cull is not None else None,
+        antialiasing=antialiasing, indexing=indexing
+    )
 
-    # ===== Geometry scaling =====
-    stick_length = 1.0 * scale
-    head_length  = f_head_length * stick_length
-    stick_radius = f_stick_radius * stick_length
-    head_radius  = f_head_radius * stick_length
-    L_tot = head_length + stick_length
+    if render_cache is True:
+        render_cache = RenderCache()
+    img = None
+    if render_cache is not None:
+        cache_key = _quiver_cache_key(
+            render_cache, (x, y, z, Hx, Hy, Hz, C), render_args
+        )
+        img = render_cache.get(cache_key)
 
-    # ===== Normalize directions =====
-    H = np.stack([Hx, Hy, Hz], axis=1)
-    H_norm = np.linalg.norm(H, axis=1)
-    H_norm[H_norm == 0] = 1.0
-    H /= H_norm[:, None]
+    if img is None:
+        img = _render_quiver(
+            x, y, z, Hx, Hy, Hz, C, plotter_pool=plotter_pool,
+            tile_out=tile_out, mesh_cache=mesh_cache, **render_args
+        )
+        if render_cache is not None:
+            render_cache.put(cache_key, img)
 
-    # ===== Color mapping =====
-    # Cmin = np.min(C)
-    # Cmax = np.max(C)
-    cmap_func = plt.get_cmap(cmap)
-    scalars = (C - Cmin) / (Cmax - Cmin + 1e-12)
-    colors = cmap_func(scalars)[:, :3]
+    return _place_quiver_image(
+        fig, img, dpi, crop_cm, axes_pos_x_cm, axes_pos_y_cm, axes_width_cm
+    )
 
-    # ===== Determine render window size =====
-    if axes_width_cm is not None:
-        pixels = int((axes_width_cm / 2.54) * dpi)
-        window_size = [pixels, pixels]
+
+def _quiver_cache_key(render_cache, arrays, render_args):
+    return render_cache.key(arrays, dict(render_args, pyvista=pv.__version__))
+
+
+@with_figure_style
+def _place_quiver_image(fig, img, dpi, crop_cm, axes_pos_x_cm, axes_pos_y_cm,
+                        axes_width_cm):
+    """Crop a rendered panel image and show it in cm-positioned axes."""
+    # ===== Cropping (cm → px) =====
+    if crop_cm != (0, 0, 0, 0):
+        px_per_cm = dpi / 2.54
+        crop_px = tuple(int(c * px_per_cm) for c in crop_cm)
+        img = crop_image(img, *crop_px)
+
+    ax = add_axes_cm(fig, axes_pos_x_cm, axes_pos_y_cm, axes_width_cm, axes_width_cm)
+    ax.imshow(img)
+    ax.axis("off")
+
+    return ax, img
+
+
+def quiver3_views_panel(
+        fig, x, y, z, Hx, Hy, Hz, C, Cmin, Cmax,
+        views=("iso", "xy", "xz"),
+        axes_pos_cm=None,
+        cmap="viridis",
+        scale=1.0,
+        f_head_length=4.0 / 6.0,
+        f_stick_radius=1.0 / 6.0,
+        f_head_radius=1.0 / 3.0,
+        centering=True,
+        subsample=1,
+        dpi=300,
+        background="white",
+        axes_width_cm=None,
+        margin_cm=0.0,
+        crop_cm=(0, 0, 0, 0),
+        engine="template",
+        resolution="auto",
+        plotter_pool=None,
+        max_arrows=None,
+        spacing=None,
+        priority=None,
+        tile_px=None,
+        cull=None,
+        cull_layers=6,
+        antialiasing="ssaa",
+        indexing="xy",
+        mesh_cache=None
+):
+    """
+    Render several camera views of one 3D quiver field from a single scene.
+
+    Coordinates are normalized, the arrow geometry is built and the plotter
+    is created once; every view only costs a camera change and a
+    screenshot. Arguments are those of quiver3_advanced_panel.
+
+    views:
+        Sequence of view names ("iso", "xy", "xz", "yz", "top"), camera
+        positions (x, y, z) looking at the origin with z up, or dicts with
+        the keys view, cam_pos, focal_point and up_direction.
+
+    axes_pos_cm=None:
+        Optional list of (x_cm, y_cm) positions, one per view. The images
+        are placed in axes of width axes_width_cm at these positions.
+
+    cull=None:
+        As in quiver3_advanced_panel; an arrow is kept if any view shows it.
+
+    Returns (axes, images); axes is empty if axes_pos_cm is None.
+    """
+
+    cameras = [_camera_from_view(v) for v in views]
+    if axes_pos_cm is not None and len(axes_pos_cm) != len(cameras):
+        raise ValueError("axes_pos_cm needs one (x_cm, y_cm) position per view.")
+
+    images = _render_quiver_views(
+        np.asarray(x), np.asarray(y), np.asarray(z),
+        np.asarray(Hx), np.asarray(Hy), np.asarray(Hz), np.asarray(C),
+        Cmin, Cmax, cmap, scale, f_head_length, f_stick_radius,
+        f_head_radius, centering, subsample, cameras, dpi, background,
+        axes_width_cm, margin_cm, engine, resolution, max_arrows, spacing,
+        priority, plotter_pool, tile_px, cull=cull, cull_layers=cull_layers,
+        cull_crop_cm=crop_cm if cull is not None else None,
+        antialiasing=antialiasing, indexing=indexing, mesh_cache=mesh_cache
+    )
+
+    # ===== Cropping (cm → px) =====
+    if crop_cm != (0, 0, 0, 0):
+        px_per_cm = dpi / 2.54
+        crop_px = tuple(int(c * px_per_cm) for c in crop_cm)
+        images = [crop_image(img, *crop_px) for img in images]
+
+    axes = []
+    if axes_pos_cm is not None:
+        for (x_cm, y_cm), img in zip(axes_pos_cm, images):
+            ax = add_axes_cm(fig, x_cm, y_cm, axes_width_cm, axes_width_cm)
+            ax.imshow(img)
+            ax.axis("off")
+            axes.append(ax)
+
+    return axes, images
+
+
+def _camera_from_view(view):
+    """Normalize a view name, camera position or camera dict."""
+    camera = dict(view="custom", cam_pos=(3, 3, 2), focal_point=(0, 0, 0),
+                  up_direction=(0, 0, 1))
+    if isinstance(view, str):
+        camera["view"] = view
+    elif isinstance(view, dict):
+        camera.update(view)
     else:
-        window_size = [800, 800]
+        camera["cam_pos"] = tuple(view)
+    return camera
+
+
+def _render_quiver(
+        x, y, z, Hx, Hy, Hz, C, Cmin, Cmax, cmap, scale,
+        f_head_length, f_stick_radius, f_head_radius, centering, subsample,
+        view, dpi, background, axes_width_cm, margin_cm, cam_pos,
+        focal_point, up_direction, engine, resolution, max_arrows, spacing,
+        priority, tile_px=None, cull=None, cull_layers=6, cull_crop_cm=None,
+        antialiasing="ssaa", indexing="xy", plotter_pool=None, tile_out=None,
+        mesh_cache=None
+):
+    """Off-screen render of the quiver scene; returns the uncropped image."""
+    camera = dict(view=view, cam_pos=cam_pos, focal_point=focal_point,
+                  up_direction=up_direction)
+    return _render_quiver_views(
+        x, y, z, Hx, Hy, Hz, C, Cmin, Cmax, cmap, scale,
+        f_head_length, f_stick_radius, f_head_radius, centering, subsample,
+        [camera], dpi, background, axes_width_cm, margin_cm, engine,
+        resolution, max_arrows, spacing, priority, plotter_pool,
+        tile_px, tile_out, cull, cull_layers, cull_crop_cm, antialiasing,
+        indexing, mesh_cache
+    )[0]
+
+
+def _render_quiver_views(
+        x, y, z, Hx, Hy, Hz, C, Cmin, Cmax, cmap, scale,
+        f_head_length, f_stick_radius, f_head_radius, centering, subsample,
+        cameras, dpi, background, axes_width_cm, margin_cm, engine,
+        resolution, max_arrows, spacing, priority, plotter_pool=None,
+        tile_px=None, tile_out=None, cull=None, cull_layers=6,
+        cull_crop_cm=None, antialiasing="ssaa", indexing="xy", mesh_cache=None
+):
+    """
+    Build the quiver scene once and return one uncropped image per camera
+    (dicts with view, cam_pos, focal_point, up_direction).
+    """
+    inputs = (x, y, z, Hx, Hy, Hz, C)
+
+    # ===== Regular grid or point list =====
+    grid = _as_grid(x, y, z, Hx, Hy, Hz, C, indexing)
+    prepared = None
+    if grid is not None and priority is None:
+        prepared = _prepare_grid_quiver(*grid, subsample, max_arrows, spacing)
+    if prepared is not None:
+        coords, H, C, dataset = prepared
+    else:
+        if grid is not None and np.ndim(x) == 1 and np.size(x) != np.size(C):
+            x, y, z, Hx, Hy, Hz, C = _flatten_grid(*grid)
+        else:
+            x, y, z, Hx, Hy, Hz, C = (np.ravel(a) for a in (x, y, z, Hx, Hy, Hz, C))
+        coords, H, C = _prepare_quiver(
+            x, y, z, Hx, Hy, Hz, C, subsample, max_arrows, spacing, priority
+        )
+        dataset = None
+
+    # ===== Determine render window size =====
+    # With a supersampling factor k the scene is rendered k times larger
+    # and box-downsampled afterwards.
+    k = _supersampling(antialiasing)
+    window_size = [k * n for n in _window_size(axes_width_cm, dpi)]
 
     # ===== Create PyVista plotter =====
-    plotter = pv.Plotter(off_screen=True, window_size=window_size)
+    if tile_px is not None and max(window_size) > tile_px:
+        tiles = _tile_layout(window_size[0], tile_px)
+        plotter_size = [tiles[1], tiles[1]]
+    else:
+        tiles = None
+        plotter_size = window_size
+    plotter = _new_plotter(plotter_size, antialiasing, plotter_pool)
     plotter.set_background(background)
-    plotter.enable_anti_aliasing('ssaa')
+
+    # ===== Level of detail (pixel-aware tessellation) =====
+    # One geometry serves all views, so it is sized for the closest camera.
+    zoom_factor = _margin_zoom(axes_width_cm, margin_cm)
+    px_per_unit = max(
+        _pixels_per_unit(window_size, coords, cam["view"], cam["cam_pos"],
+                         cam["focal_point"], zoom_factor)
+        for cam in cameras
+    )
+
+    if isinstance(resolution, str) and resolution == "auto":
+        resolution = _lod_resolution(
+            px_per_unit, scale, f_head_length, f_stick_radius, f_head_radius
+        )
 
     # ===== Draw arrows =====
+    if cull is not None:
+        # Arrows that may define the scene bounds go first, so that the
+        # cameras are framed exactly as for the full field.
+        extent = _arrow_extent(
+            scale, f_head_length, f_stick_radius, f_head_radius, centering,
+            resolution if engine != "loop" else None
+        )
+        shell = _bounds_shell(coords, H, extent)
+        keep = shell
+    else:
+        keep = slice(None)
+    if mesh_cache is True:
+        mesh_cache = MeshCache()
+    if (mesh_cache is not None and cull is None
+            and engine in ("template", "glyph") and not isinstance(resolution, str)):
+        # ===== Reuse a stored arrow mesh (camera-only changes) =====
+        mesh_key = mesh_cache.key(inputs, dict(
+            scale=scale, f_head_length=f_head_length,
+            f_stick_radius=f_stick_radius, f_head_radius=f_head_radius,
+            centering=centering, subsample=subsample, max_arrows=max_arrows,
+            spacing=spacing, priority=priority, engine=engine,
+            resolution=resolution, indexing=indexing, pyvista=pv.__version__
+        ))
+        arrows = mesh_cache.get(mesh_key)
+        if arrows is None:
+            arrows = _build_arrows(
+                coords, H, C, scale, f_head_length, f_stick_radius,
+                f_head_radius, centering, resolution, engine, dataset
+            )
+            mesh_cache.put(mesh_key, arrows)
+        _add_arrow_mesh(plotter, arrows, cmap, [Cmin, Cmax])
+    else:
+        _add_quiver_arrows(
+            plotter, coords[keep], H[keep], C[keep], Cmin, Cmax, cmap, scale,
+            f_head_length, f_stick_radius, f_head_radius, centering, engine,
+            resolution, px_per_unit, dataset if cull is None else None
+        )
+
+    # ===== Optional: add small axis cross =====
+    # Kept out of the scene bounds so that named views frame the arrows
+    # only, whichever camera is set first (see _set_camera).
+    try:
+        axes_actors = add_reference_axes(plotter, length=0.5, radius=0.015, offset=0.8)
+    except Exception:
+        axes_actors = []
+    for actor in axes_actors:
+        actor.SetUseBounds(False)
+
+    #plotter.show_axes()  # kleines Overlay
+
+    # ===== Culling: arrows visible from any camera =====
+    if cull is not None:
+        if cull not in ("frustum", "occlusion"):
+            raise ValueError("cull must be None, 'frustum' or 'occlusion'.")
+        visible = np.zeros(len(coords), dtype=bool)
+        for cam in cameras:
+            plotter.suppress_rendering = True
+            _set_camera(plotter, zoom_factor=zoom_factor,
+                        axes_actors=axes_actors, **cam)
+            visible |= _visible_arrows(
+                plotter.camera, coords, extent, window_size, k * dpi,
+                cull_crop_cm, cull_layers if cull == "occlusion" else None
+            )
+        rest = visible & ~shell
+        if rest.any():
+            _add_quiver_arrows(
+                plotter, coords[rest], H[rest], C[rest], Cmin, Cmax, cmap,
+                scale, f_head_length, f_stick_radius, f_head_radius,
+                centering, engine, resolution, px_per_unit
+            )
+
+    # ===== Render one image per camera =====
+    images = []
+    for cam in cameras:
+        # Named views would render on their own once the window is shown
+        plotter.suppress_rendering = True
+        _set_camera(plotter, zoom_factor=zoom_factor,
+                    axes_actors=axes_actors, **cam)
+        out = tile_out if len(cameras) == 1 else None
+        if tiles is None:
+            img = _screenshot(plotter)
+        else:
+            img = _tiled_screenshot(plotter, window_size[0], tiles,
+                                    out if k == 1 else None)
+        if k > 1:
+            img = _downsample(img, k, out if tiles is not None else None)
+        images.append(img)
+
+    if plotter_pool is not None:
+        plotter_pool.release(plotter)
+    else:
+        plotter.close()
+
+    return images
+
+
+def _supersampling(antialiasing):
+    """Render scale k of antialiasing=k; 1 for the VTK modes."""
+    if isinstance(antialiasing, (int, np.integer)) and not isinstance(antialiasing, bool):
+        if antialiasing < 1:
+            raise ValueError("Supersampling factor must be >= 1.")
+        return int(antialiasing)
+    if antialiasing not in ("ssaa", "msaa", "fxaa", "none", None):
+        raise ValueError("antialiasing must be 'ssaa', 'msaa', 'fxaa', "
+                         "'none' or an int supersampling factor.")
+    return 1
+
+
+def _new_plotter(window_size, antialiasing="ssaa", plotter_pool=None):
+    """Off-screen plotter (taken from `plotter_pool` if given)."""
+    if antialiasing is None or _supersampling(antialiasing) > 1:
+        antialiasing = "none"
+    if plotter_pool is not None:
+        return plotter_pool.acquire(window_size, antialiasing=antialiasing)
+    plotter = pv.Plotter(off_screen=True, window_size=window_size)
+    _enable_antialiasing(plotter, antialiasing)
+    return plotter
+
+
+def _downsample(img, k, out=None):
+    """Box-filter an image rendered at k times the target size (uint8)."""
+    h, w = img.shape[0] // k, img.shape[1] // k
+    out = _image_out(out, (h, w, img.shape[2]))
+    for r in range(h):      # row by row: no full-size integer temporary
+        block = img[r * k:(r + 1) * k, :w * k].reshape(k, w, k, -1)
+        total = block.sum(axis=(0, 2), dtype=np.uint32)
+        out[r] = (total + k * k // 2) // (k * k)
+    return out
+
+
+def _image_out(out, shape):
+    """uint8 image buffer: new, a given array, or a memory-mapped .npy path."""
+    if out is None:
+        return np.empty(shape, dtype=np.uint8)
+    if isinstance(out, str):
+        return np.lib.format.open_memmap(out, mode="w+", dtype=np.uint8,
+                                         shape=shape)
+    return out
+
+
+def _window_size(axes_width_cm, dpi):
+    """Square render window matching the panel width at `dpi`."""
+    if axes_width_cm is not None:
+        pixels = int((axes_width_cm / 2.54) * dpi)
+        return [pixels, pixels]
+    return [800, 800]
+
+
+def _margin_zoom(axes_width_cm, margin_cm):
+    """Camera zoom that leaves `margin_cm` around the scene."""
+    if margin_cm > 0 and axes_width_cm is not None:
+        return axes_width_cm / (axes_width_cm + 2 * margin_cm)
+    return 1.0
+
+
+def _as_grid(x, y, z, Hx, Hy, Hz, C, indexing="xy"):
+    """
+    (axes, fields) of data on a rectilinear grid, or None.
+
+    Accepts 1D axes with 3D fields, 3D broadcast views of 1D axes, or
+    np.meshgrid output (3D or flattened in C order, "xy" or "ij" indexing). `fields` are Hx, Hy, Hz, C as 3D
+    arrays in (x, y, z) index order (views where possible).
+    """
+    x, y, z = np.asarray(x), np.asarray(y), np.asarray(z)
+    fields = [np.asarray(a) for a in (Hx, Hy, Hz, C)]
+
+    if x.ndim == 1 and fields[0].ndim == 3 and fields[0].size != x.size:
+        n = (len(x), len(y), len(z))
+        shape = fields[0].shape
+        if shape == (n[1], n[0], n[2]) and (indexing == "xy" or shape != n):
+            xy = True
+        elif shape == n:
+            xy = False
+        else:
+            raise ValueError(
+                "With 1D axes, Hx, Hy, Hz and C need shape (len(y), len(x), "
+                "len(z)) (indexing='xy') or (len(x), len(y), len(z)) ('ij')."
+            )
+        axes = (x, y, z)
+    elif _broadcast_axes(x, y, z) is not None:
+        axes, xy = _broadcast_axes(x, y, z)
+        shape = x.shape
+    else:
+        detected = _detect_meshgrid(x.ravel(), y.ravel(), z.ravel())
+        if detected is None:
+            return None
+        axes, shape, xy = detected
+
+    fields = [f.reshape(shape) for f in fields]
+    if xy:
+        fields = [f.transpose(1, 0, 2) for f in fields]
+    return axes, fields
+
+
+def _broadcast_axes(x, y, z):
+    """
+    (axes, xy) if 3D x, y, z are zero-stride broadcasts of 1D axes
+    (np.broadcast_to, OVFField.coordinates), else None.
+    """
+    if not (x.ndim == y.ndim == z.ndim == 3 and x.shape == y.shape == z.shape):
+        return None
+    if z.strides[:2] != (0, 0):
+        return None
+    if x.strides[1:] == (0, 0) and y.strides[::2] == (0, 0):
+        return (x[:, 0, 0], y[0, :, 0], z[0, 0, :]), False
+    if x.strides[::2] == (0, 0) and y.strides[1:] == (0, 0):
+        return (x[0, :, 0], y[:, 0, 0], z[0, 0, :]), True
+    return None
+
+
+def _detect_meshgrid(x, y, z):
+    """
+    (axes, shape, xy) if flat x, y, z are a C-order raveled np.meshgrid
+    (z varying fastest), else None.
+    """
     N = len(x)
-    for i in range(0, N, subsample):
-        p0 = np.array([x[i], y[i], z[i]])
-        direction = H[i]
-        color = colors[i]
+    if N < 2:
+        return None
+    # z runs fastest; the next coordinate to change tells the indexing
+    changed = np.flatnonzero((x != x[0]) | (y != y[0]))
+    nz = changed[0] if len(changed) else N
+    if nz == N or N % nz:
+        return None
+    xy = x[nz] != x[0]
+    if xy == (y[nz] != y[0]):
+        return None
+    outer = y if xy else x
+    changed = np.flatnonzero(outer != outer[0])
+    n_mid = (changed[0] if len(changed) else N) // nz
+    if n_mid == 0 or N % (n_mid * nz):
+        return None
+    shape = (N // (n_mid * nz), n_mid, nz)
 
-        # --- Grundposition: Pfeil startet bei p0 ---
-        arrow_center = p0 + direction * (stick_length / 2)
-        cone_center = p0 + direction * (stick_length + head_length / 2)
+    X, Y, Z = x.reshape(shape), y.reshape(shape), z.reshape(shape)
+    if xy:
+        ux, uy = X[0, :, 0], Y[:, 0, 0]
+        ok = (np.array_equal(X, np.broadcast_to(ux[None, :, None], shape))
+              and np.array_equal(Y, np.broadcast_to(uy[:, None, None], shape)))
+    else:
+        ux, uy = X[:, 0, 0], Y[0, :, 0]
+        ok = (np.array_equal(X, np.broadcast_to(ux[:, None, None], shape))
+              and np.array_equal(Y, np.broadcast_to(uy[None, :, None], shape)))
+    uz = Z[0, 0, :]
+    if not (ok and np.array_equal(Z, np.broadcast_to(uz, shape))):
+        return None
+    return (ux, uy, uz), shape, xy
 
-        if centering:
-            # Gesamten Pfeil um halbe Gesamtlänge nach hinten schieben
-            arrow_center -= direction * (L_tot / 2)
-            cone_center -= direction * (L_tot / 2)
 
-        # --- Erzeuge Geometrien ---
-        arrow = pv.Cylinder(
-            center=arrow_center,
-            direction=direction,
-            radius=stick_radius,
-            height=stick_length
+def _uniform_spacing(u):
+    """Step of an evenly spaced, increasing axis, else None."""
+    if len(u) == 1:
+        return 1.0
+    h = (float(u[-1]) - float(u[0])) / (len(u) - 1)
+    if h <= 0 or not np.allclose(np.diff(u), h, rtol=1e-5, atol=0):
+        return None
+    return h
+
+
+def _prepare_grid_quiver(axes, fields, subsample=1, max_arrows=None,
+                         spacing=None):
+    """
+    Like _prepare_quiver for a uniform grid, thinned by strides per axis.
+
+    Returns (coords, H, C, image) with a pv.ImageData carrying "H" and "C",
+    or None if the grid is not uniform.
+    """
+    steps = [_uniform_spacing(u) for u in axes]
+    if any(h is None for h in steps):
+        return None
+    n = [len(u) for u in axes]
+
+    # ===== Strides per axis =====
+    if max_arrows is not None:
+        s = 1
+        while np.prod([-(-m // s) for m in n]) > max_arrows:
+            s += 1
+        strides = (s, s, s)
+    elif spacing is not None:
+        strides = tuple(max(1, int(round(spacing / h))) for h in steps)
+    else:
+        # about `subsample` times fewer arrows, as for a point list
+        strides = (max(1, int(round(subsample ** (1.0 / 3.0)))),) * 3
+
+    # ===== Normalization as for the full point list =====
+    center = np.array([np.mean(u, dtype=np.float64) for u in axes])
+    max_dist = float(np.sqrt(sum(
+        np.max(np.abs(np.asarray(u, dtype=np.float64) - c)) ** 2
+        for u, c in zip(axes, center)
+    )))
+
+    sub = tuple(slice(None, None, s) for s in strides)
+    dims = [len(range(0, m, s)) for m, s in zip(n, strides)]
+    origin = (np.array([u[0] for u in axes], dtype=np.float64) - center) / max_dist
+    step = np.array(steps) * np.array(strides) / max_dist
+    image = pv.ImageData(dimensions=dims, spacing=step, origin=origin)
+
+    # ===== Point data in VTK order (x fastest) =====
+    N = int(np.prod(dims))
+    coords = np.empty((dims[2], dims[1], dims[0], 3), dtype=np.float32)
+    for k in range(3):
+        u = (origin[k] + step[k] * np.arange(dims[k])).astype(np.float32)
+        coords[..., k] = u.reshape([-1 if i == 2 - k else 1 for i in range(3)])
+    H = np.empty((dims[2], dims[1], dims[0], 3), dtype=np.float32)
+    for k in range(3):
+        H[..., k] = fields[k][sub].transpose(2, 1, 0)
+    coords, H = coords.reshape(N, 3), _unit_directions(H.reshape(N, 3))
+    C = np.ascontiguousarray(fields[3][sub].transpose(2, 1, 0)).ravel()
+
+    image["H"] = H
+    image["C"] = C
+    return coords, H, C, image
+
+
+def _flatten_grid(axes, fields):
+    """Point-list form (x, y, z, Hx, Hy, Hz, C) of a rectilinear grid."""
+    X, Y, Z = np.meshgrid(*axes, indexing="ij")
+    return tuple(a.ravel() for a in (X, Y, Z, *fields))
+
+
+def _prepare_quiver(x, y, z, Hx, Hy, Hz, C, subsample=1, max_arrows=None,
+                    spacing=None, priority=None):
+    """
+    Normalized coordinates (unit bounding sphere), unit directions and
+    scalars of the arrows that survive thinning.
+    """
+    coords, max_dist = _normalize_coords(x, y, z)
+    H = _float32_columns(Hx, Hy, Hz)
+    keep = _thinning_index(coords, max_dist, H, subsample, max_arrows,
+                           spacing, priority)
+    coords, H, C = coords[keep], H[keep], C[keep]
+    return coords, _unit_directions(H), C
+
+
+def _float32_columns(*columns):
+    """One contiguous float32 (N, k) buffer filled column by column."""
+    out = np.empty((len(columns[0]), len(columns)), dtype=np.float32)
+    for k, col in enumerate(columns):
+        out[:, k] = col
+    return out
+
+
+def _normalize_coords(x, y, z):
+    """
+    Coordinates centered and scaled into the unit sphere, as one float32
+    (N, 3) buffer; returns (coords, scale).
+    """
+    # ===== coordinate centering and normalization =====
+    # The center is subtracted in float64 (buffered per column) before the
+    # cast, so large offsets do not cost float32 precision.
+    coords = np.empty((len(x), 3), dtype=np.float32)
+    for k, col in enumerate((x, y, z)):
+        col = np.asarray(col)
+        np.subtract(col, np.mean(col, dtype=np.float64), out=coords[:, k],
+                    casting="same_kind")
+    max_dist = float(np.sqrt(np.max(np.einsum("ij,ij->i", coords, coords))))
+    coords /= np.float32(max_dist)
+    return coords, max_dist
+
+
+def _thinning_index(coords, max_dist, H, subsample=1, max_arrows=None,
+                    spacing=None, priority=None):
+    """Index of the arrows kept by spatial thinning or the subsample stride."""
+    # ===== Arrow thinning =====
+    if max_arrows is not None or spacing is not None:
+        if isinstance(priority, str) and priority == "magnitude":
+            priority = np.linalg.norm(H, axis=1)
+        return spatial_subsample(
+            coords, max_arrows=max_arrows,
+            spacing=None if spacing is None else spacing / max_dist,
+            priority=priority
         )
-        cone = pv.Cone(
-            center=cone_center,
-            direction=direction,
-            height=head_length,
-            radius=head_radius
+    return slice(None, None, subsample)
+
+
+def _unit_directions(H):
+    """Normalize the rows of H in place (zero vectors stay zero)."""
+    # ===== Normalize directions =====
+    H_norm = np.sqrt(np.einsum("ij,ij->i", H, H))
+    H_norm[H_norm == 0] = 1.0
+    H /= H_norm[:, None]
+    return H
+
+
+def _add_quiver_arrows(plotter, coords, H, C, Cmin, Cmax, cmap, scale,
+                       f_head_length, f_stick_radius, f_head_radius,
+                       centering, engine, resolution, px_per_unit,
+                       dataset=None):
+    """
+    Add all arrows to `plotter` with the selected engine and resolution.
+    `dataset` (e.g. the ImageData of a regular grid, with arrays "H" and
+    "C") is glyphed directly by the glyph engine.
+    """
+    if isinstance(resolution, str) and engine != "loop":
+        _add_arrow_primitives(
+            plotter, resolution, coords, H, C,
+            scale * (1.0 + f_head_length), centering,
+            cmap, [Cmin, Cmax], px_per_unit
         )
+    elif engine in ("template", "glyph"):
+        arrows = _build_arrows(
+            coords, H, C,
+            scale, f_head_length, f_stick_radius, f_head_radius,
+            centering, resolution, engine, dataset
+        )
+        _add_arrow_mesh(plotter, arrows, cmap, [Cmin, Cmax])
+    elif engine == "loop":
+        # ===== Color mapping =====
+        cmap_func = plt.get_cmap(cmap)
+        scalars = (C - Cmin) / (Cmax - Cmin + 1e-12)
+        colors = cmap_func(scalars)[:, :3]
 
-        actor = arrow.merge(cone)
-        plotter.add_mesh(actor, color=color, smooth_shading=True, specular=0.3)
+        stick_length = 1.0 * scale
+        _loop_arrows(
+            plotter, coords[:, 0], coords[:, 1], coords[:, 2], H, colors, 1,
+            stick_length, f_head_length * stick_length,
+            f_stick_radius * stick_length, f_head_radius * stick_length,
+            centering
+        )
+    else:
+        raise ValueError("engine must be 'template', 'glyph' or 'loop'.")
 
-        print(f"quiver3 build progress:" + str(round(100 * i / N, 3)) + " %")
 
-    # ===== Camera view setup =====
+def _set_camera(plotter, view="iso", cam_pos=(3, 3, 2), focal_point=(0, 0, 0),
+                up_direction=(0, 0, 1), zoom_factor=1.0, axes_actors=()):
+    """Camera view setup, including the margin zoom."""
+    # zoom() narrows the view angle, so restore the default between views
+    plotter.camera.view_angle = 30.0
+
     if view == "iso":
+        # Without margin zoom the isometric view has always been framed on
+        # all actors, reference axes included.
+        for actor in axes_actors:
+            actor.SetUseBounds(zoom_factor == 1.0)
         plotter.view_isometric()
+        for actor in axes_actors:
+            actor.SetUseBounds(False)
     elif view == "xy":
         plotter.view_xy()
     elif view == "xz":
@@ -224,30 +963,454 @@ def quiver3_advanced_panel(
         ]
 
     # ===== Margin control (zoom out for margin) =====
-    if margin_cm > 0 and axes_width_cm is not None:
-        zoom_factor = axes_width_cm / (axes_width_cm + 2 * margin_cm)
+    if zoom_factor != 1.0:
         plotter.camera.zoom(zoom_factor)
 
-    # ===== Optional: add small axis cross =====
+    # Keep the first render from re-framing the camera
+    if view in ("iso", "xy", "xz", "yz", "top", "custom"):
+        plotter.camera_set = True
+
+
+def _pixels_per_unit(window_size, coords, view, cam_pos, focal_point,
+                     zoom_factor=1.0, view_angle=30.0):
+    """
+    Estimate the screen scale (pixels per world unit) of the nearest arrows.
+
+    Named views fit the scene bounds like vtkRenderer::ResetCamera, i.e.
+    the camera sits at radius / sin(view_angle/2) from the scene center;
+    "top" and "custom" use their explicit camera position.
+    """
+    lo, hi = coords.min(axis=0), coords.max(axis=0)
+    radius = 0.5 * np.linalg.norm(hi - lo)
+    half_angle = np.radians(view_angle) / 2
+
+    if view == "custom":
+        distance = np.linalg.norm(np.subtract(cam_pos, focal_point))
+    elif view == "top":
+        distance = 1.0
+    else:
+        distance = radius / np.sin(half_angle)
+
+    # Nearest arrows are about one scene radius in front of the focal point
+    near = max(distance - radius, 0.25 * distance, 1e-6)
+    return zoom_factor * window_size[1] / (2 * near * np.tan(half_angle))
+
+
+def _lod_resolution(px_per_unit, scale, f_head_length, f_stick_radius,
+                    f_head_radius, max_error_px=0.5):
+    """
+    Choose (stick, head) sides so that the polygonal outline deviates at most
+    `max_error_px` from a circle, capped at the PyVista defaults (100, 6).
+
+    Returns "points" if the whole arrow is below one pixel and "lines" if
+    the stick is thinner than one pixel.
+    """
+    if scale * (1.0 + f_head_length) * px_per_unit < 1.0:
+        return "points"
+    if 2 * scale * f_stick_radius * px_per_unit < 1.0:
+        return "lines"
+
+    def sides(radius_px, n_max):
+        if radius_px <= max_error_px:
+            return 3
+        # sagitta r (1 - cos(pi/n)) <= max_error_px
+        n = np.pi / np.arccos(1.0 - max_error_px / radius_px)
+        return int(min(max(np.ceil(n), 3), n_max))
+
+    return (
+        sides(scale * f_stick_radius * px_per_unit, 100),
+        sides(scale * f_head_radius * px_per_unit, 6),
+    )
+
+
+def _arrow_extent(scale, f_head_length, f_stick_radius, f_head_radius,
+                  centering, primitive=None):
+    """
+    Arrow geometry along its own axis: (tail, head base, tip) positions
+    relative to the reference point and (stick, head) radii. `primitive`
+    is the "lines"/"points" fallback of _add_arrow_primitives, if used.
+    """
+    length = scale * (1.0 + f_head_length)
+    tail = -0.5 * length if centering else 0.0
+    if isinstance(primitive, str) and primitive == "points":
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+    if isinstance(primitive, str) and primitive == "lines":
+        return tail, tail, tail + length, 0.0, 0.0
+    return (tail, tail + scale, tail + length,
+            scale * f_stick_radius, scale * f_head_radius)
+
+
+def _bounds_shell(coords, directions, extent):
+    """
+    Mask of the arrows that may reach the bounding box of all arrows.
+
+    The reach of each arrow along +-x, +-y, +-z is bracketed from its tip
+    and the rings of stick and head (a polygon with n >= 3 sides keeps a
+    vertex within pi/3 of any direction). Arrows whose upper bound stays
+    below the best lower bound lie strictly inside the bounds and can be
+    dropped without changing the camera framing or clipping range.
+    """
+    tail, base, tip, r_stick, r_head = extent
+    radial = np.sqrt(np.clip(1.0 - directions**2, 0.0, None))
+    shell = np.zeros(len(coords), dtype=bool)
+    for d in (directions, -directions):
+        upper = np.maximum.reduce([tail * d + r_stick * radial,
+                                   base * d + r_head * radial, tip * d])
+        lower = np.maximum.reduce([tail * d + 0.5 * r_stick * radial,
+                                   base * d + 0.5 * r_head * radial, tip * d])
+        p = coords if d is directions else -coords
+        reach = (p + lower).max(axis=0)
+        shell |= np.any(p + upper >= reach - 1e-6, axis=1)
+    return shell
+
+
+def _visible_arrows(camera, coords, extent, window_size, dpi, crop_cm=None,
+                    layers=None):
+    """
+    Mask of the arrows that reach into the (cropped) image of `camera`.
+
+    Each arrow is bounded by a sphere around its reference point. With
+    `layers`, only the `layers` nearest arrows per screen cell of about one
+    head diameter are kept (coarse depth test).
+    """
+    tail, base, tip, r_stick, r_head = extent
+    radius = np.hypot(max(abs(tail), abs(tip)), r_head)
+
+    M = pv.array_from_vtkmatrix(
+        camera.GetCompositeProjectionTransformMatrix(
+            window_size[0] / window_size[1], -1, 1)
+    )
+    clip = coords @ M[:, :3].T + M[:, 3]
+    px_scale = np.linalg.norm(M[:2, :3], axis=1)        # NDC per world unit
+
+    depth = (coords - camera.position) @ np.asarray(camera.direction)
+    if camera.GetParallelProjection():
+        w = np.ones(len(coords))
+        in_front = np.ones(len(coords), dtype=bool)
+        margin = radius * px_scale[None, :]
+    else:
+        w = clip[:, 3]
+        # Arrows near or behind the camera plane are kept
+        in_front = w > 1.5 * radius
+        margin = radius * px_scale[None, :] / np.maximum(w - radius, 1e-12)[:, None]
+    ndc = clip[:, :2] / np.where(in_front, w, 1.0)[:, None]
+
+    # ===== Viewport after cropping (NDC) =====
+    lo = np.array([-1.0, -1.0])
+    hi = np.array([1.0, 1.0])
+    if crop_cm is not None and tuple(crop_cm) != (0, 0, 0, 0):
+        left, right, top, bottom = (int(c * dpi / 2.54) for c in crop_cm)
+        W, Hpx = window_size
+        lo += 2.0 * np.array([left / W, bottom / Hpx])
+        hi -= 2.0 * np.array([right / W, top / Hpx])
+
+    visible = ~in_front | np.all((ndc + margin >= lo) & (ndc - margin <= hi), axis=1)
+    if layers is None:
+        return visible
+
+    # ===== Coarse depth test =====
+    idx = np.flatnonzero(visible & in_front)
+    if len(idx) == 0:
+        return visible
+    head = 2.0 * max(r_head, r_stick) * px_scale.mean() / w[idx]
+    cell = max(np.median(head), 2.0 / max(window_size))
+    ij = np.floor(ndc[idx] / cell).astype(np.int64)
+    ij -= ij.min(axis=0)
+    key = ij[:, 0] * (ij[:, 1].max() + 1) + ij[:, 1]
+    order = np.lexsort((depth[idx], key))
+    key = key[order]
+    start = np.r_[0, np.flatnonzero(key[1:] != key[:-1]) + 1]
+    rank = np.arange(len(order)) - np.repeat(start, np.diff(np.r_[start, len(order)]))
+    occluded = idx[order[rank >= layers]]
+    visible[occluded] = False
+    return visible
+
+
+def _add_arrow_primitives(plotter, mode, points, directions, scalars,
+                          arrow_length, centering, cmap, clim, px_per_unit):
+    """Sub-pixel fallback: draw arrows as line segments or points."""
+    points = np.asarray(points, dtype=np.float32)
+    if mode == "points":
+        size = max(arrow_length * px_per_unit, 1.0)
+        cloud = pv.PolyData(points)
+        cloud["C"] = scalars
+        return plotter.add_mesh(
+            cloud, scalars="C", cmap=cmap, clim=clim, point_size=size,
+            style="points", show_scalar_bar=False
+        )
+    if mode != "lines":
+        raise ValueError("resolution must be 'auto', 'lines', 'points', "
+                         "None, an int or a (stick, head) tuple.")
+
+    # Tails and heads in one float32 buffer, without (N, 3) temporaries
+    N = len(points)
+    ends = np.empty((2 * N, 3), dtype=np.float32)
+    tails, heads = ends[:N], ends[N:]
+    np.multiply(directions, -arrow_length / 2 if centering else 0.0,
+                out=tails, casting="same_kind")
+    tails += points
+    np.multiply(directions, arrow_length, out=heads, casting="same_kind")
+    heads += tails
+    lines = np.empty((N, 3), dtype=np.int64)
+    lines[:, 0] = 2
+    lines[:, 1] = np.arange(N)
+    lines[:, 2] = np.arange(N, 2 * N)
+    segments = pv.PolyData(ends, lines=lines.ravel())
+    segments["C"] = np.concatenate([scalars, scalars])
+    return plotter.add_mesh(
+        segments, scalars="C", cmap=cmap, clim=clim, line_width=1.0,
+        show_scalar_bar=False
+    )
+
+
+def _screenshot(plotter):
+    """
+    Render the scene once and return it as an RGB array.
+
+    A reused (pooled) plotter has been rendered before, so screenshot()
+    alone would return the previous frame.
+    """
+    plotter.suppress_rendering = False
+    plotter.render()
+    return plotter.screenshot(return_img=True)
+
+
+def _tile_layout(size, tile_px):
+    """(n, t): n x n tiles of t pixels covering a size x size image."""
+    n = int(np.ceil(size / tile_px))
+    return n, int(np.ceil(size / n))
+
+
+def _tiled_screenshot(plotter, size, tiles, out=None):
+    """
+    Render a size x size image as n x n tiles of the plotter's window size.
+
+    Every tile uses the full image's camera, narrowed to the tile's part of
+    the frustum (view angle / parallel scale and window center), so the
+    stitched result matches a single large render; only the anti-aliasing
+    sample positions differ between tiles.
+    """
+    n, t = tiles
+    out = _image_out(out, (size, size, 3))
+
+    camera = plotter.camera
+    view_angle = camera.view_angle
+    parallel_scale = camera.parallel_scale
+    window_center = camera.GetWindowCenter()
+
+    # Tile extent as a fraction of the full image
+    f = t / size
+    camera.view_angle = np.degrees(2 * np.arctan(np.tan(np.radians(view_angle) / 2) * f))
+    camera.parallel_scale = parallel_scale * f
     try:
-        add_reference_axes(plotter, length=0.5, radius=0.015, offset=0.8)
-    except Exception:
-        pass
+        for j in range(n):              # rows, top to bottom
+            for i in range(n):
+                cx = (-1.0 + (2 * i + 1) * f) / f
+                cy = (1.0 - (2 * j + 1) * f) / f
+                camera.SetWindowCenter(cx, cy)
+                tile = _screenshot(plotter)
+                r0, c0 = j * t, i * t
+                h, w = min(t, size - r0), min(t, size - c0)
+                out[r0:r0 + h, c0:c0 + w] = tile[:h, :w, :3]
+    finally:
+        camera.view_angle = view_angle
+        camera.parallel_scale = parallel_scale
+        camera.SetWindowCenter(*window_center)
+    return out
 
-    #plotter.show_axes()  # kleines Overlay
 
-    # ===== Render image =====
-    img = plotter.screenshot(return_img=True)
-    plotter.close()
+@lru_cache(maxsize=32)
+def _arrow_template(resolution, f_head_length, f_stick_radius, f_head_radius):
+    """
+    Canonical arrow of unit stick length, starting at the origin along +x.
 
-    # ===== Cropping (cm → px) =====
-    if crop_cm != (0, 0, 0, 0):
-        px_per_cm = dpi / 2.54
-        crop_px = tuple(int(c * px_per_cm) for c in crop_cm)
-        img = crop_image(img, *crop_px)
+    `resolution` is None (PyVista defaults), an int for both parts or a
+    (stick, head) tuple. Returns read-only (points, normals, triangles) arrays, cached per
+    (resolution, f_head_length, f_stick_radius, f_head_radius).
+    """
+    if resolution is None:
+        stick_res, head_res = 100, 6
+    elif isinstance(resolution, tuple):
+        stick_res, head_res = (max(int(n), 3) for n in resolution)
+    else:
+        stick_res = head_res = max(int(resolution), 3)
 
-    ax = add_axes_cm(fig, axes_pos_x_cm, axes_pos_y_cm, axes_width_cm, axes_width_cm)
-    ax.imshow(img)
-    ax.axis("off")
+    stick = pv.Cylinder(
+        center=(0.5, 0.0, 0.0),
+        direction=(1.0, 0.0, 0.0),
+        radius=f_stick_radius,
+        height=1.0,
+        resolution=stick_res
+    )
+    head = pv.Cone(
+        center=(1.0 + f_head_length / 2, 0.0, 0.0),
+        direction=(1.0, 0.0, 0.0),
+        height=f_head_length,
+        radius=f_head_radius,
+        resolution=head_res
+    )
+    arrow = stick.merge(head).compute_normals(cell_normals=False)
+    arrow = arrow.triangulate()
 
-    return ax, img
+    points = np.asarray(arrow.points, dtype=np.float32)
+    normals = np.asarray(arrow.point_data["Normals"], dtype=np.float32)
+    triangles = arrow.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+    for arr in (points, normals, triangles):
+        arr.flags.writeable = False
+    return points, normals, triangles
+
+
+def _rotation_from_x(directions):
+    """
+    Batched rotation matrices (N,3,3) mapping +x onto each unit direction.
+
+    Zero directions give the identity, antiparallel ones a half turn
+    about z.
+    """
+    d = np.asarray(directions, dtype=np.float64)
+    c = d[:, 0]
+    # v = e_x × d = (0, -dz, dy)
+    vy, vz = -d[:, 2], d[:, 1]
+    antiparallel = c < -1.0 + 1e-6
+    k = np.where(antiparallel, 0.0, 1.0 / np.where(antiparallel, 1.0, 1.0 + c))
+
+    R = np.zeros((len(d), 3, 3))
+    R[:, 0, 0] = 1.0 - k * (vy**2 + vz**2)
+    R[:, 0, 1] = -vz
+    R[:, 0, 2] = vy
+    R[:, 1, 0] = vz
+    R[:, 1, 1] = 1.0 - k * vz**2
+    R[:, 1, 2] = k * vy * vz
+    R[:, 2, 0] = -vy
+    R[:, 2, 1] = k * vy * vz
+    R[:, 2, 2] = 1.0 - k * vy**2
+
+    R[antiparallel] = np.diag([-1.0, -1.0, 1.0])
+    return R.astype(np.float32)
+
+
+def _build_arrows(points, directions, scalars,
+                  scale, f_head_length, f_stick_radius, f_head_radius,
+                  centering=True, resolution=None, engine="template",
+                  dataset=None):
+    """
+    Build all arrows as one PolyData with point normals and scalars "C".
+
+    engine="template" rotates and translates the cached template for all
+    points in one batched NumPy operation; engine="glyph" lets VTK's
+    glyph filter place the same template, on `dataset` if given.
+    """
+    t_points, t_normals, t_triangles = _scaled_template(
+        scale, f_head_length, f_stick_radius, f_head_radius, centering,
+        resolution
+    )
+
+    points = np.asarray(points, dtype=np.float32)
+    scalars = np.asarray(scalars)
+    N, M, T = len(points), len(t_points), len(t_triangles)
+
+    if engine == "glyph":
+        template = pv.PolyData(
+            t_points, np.hstack([np.full((T, 1), 3), t_triangles]).ravel()
+        )
+        template.point_data.active_normals = t_normals
+        if dataset is not None:
+            cloud = dataset
+        else:
+            cloud = pv.PolyData(points)
+            cloud["H"] = directions
+            cloud["C"] = scalars
+        return cloud.glyph(orient="H", scale=False, factor=1.0, geom=template)
+
+    # --- Rotate template (points and normals) into every direction ---
+    arrow_points, arrow_normals = _place_template(
+        t_points, t_normals, points, directions
+    )
+
+    # --- One faces buffer for all arrows ---
+    faces = np.empty((N, T, 4), dtype=np.int64)
+    faces[:, :, 0] = 3
+    faces[:, :, 1:] = t_triangles[None, :, :]
+    faces[:, :, 1:] += (np.arange(N, dtype=np.int64) * M)[:, None, None]
+
+    arrows = pv.PolyData(arrow_points.reshape(-1, 3), faces.ravel())
+    arrows.point_data.active_normals = arrow_normals.reshape(-1, 3)
+    arrows["C"] = np.repeat(scalars, M)
+    return arrows
+
+
+def _scaled_template(scale, f_head_length, f_stick_radius, f_head_radius,
+                     centering=True, resolution=None):
+    """Arrow template scaled to stick length, optionally centered on the origin."""
+    t_points, t_normals, t_triangles = _arrow_template(
+        resolution, f_head_length, f_stick_radius, f_head_radius
+    )
+    t_points = t_points * np.float32(scale)
+    if centering:
+        t_points[:, 0] -= 0.5 * scale * (1.0 + f_head_length)
+    return t_points, t_normals, t_triangles
+
+
+def _place_template(t_points, t_normals, points, directions,
+                    out_points=None, out_normals=None):
+    """
+    Rotated and translated template points and normals, (N, M, 3) each.
+
+    With `out_points`/`out_normals` (float32, e.g. views of the VTK arrays
+    of an existing arrow mesh) the result is written in place.
+    """
+    R = _rotation_from_x(directions)
+    RT = R.transpose(0, 2, 1)
+    arrow_points = np.matmul(t_points, RT, out=out_points)
+    arrow_points += np.asarray(points, dtype=np.float32)[:, None, :]
+    arrow_normals = np.matmul(t_normals, RT, out=out_normals)
+    return arrow_points, arrow_normals
+
+
+def _add_arrow_mesh(plotter, arrows, cmap, clim):
+    """Add a prebuilt arrow mesh as one actor, shaded with its own normals."""
+    return plotter.add_mesh(
+        arrows, scalars="C", cmap=cmap, clim=clim,
+        smooth_shading=False, interpolation="phong", specular=0.3,
+        show_scalar_bar=False
+    )
+
+
+def _loop_arrows(plotter, x, y, z, H, colors, subsample,
+                 stick_length, head_length, stick_radius, head_radius,
+                 centering):
+    """Reference engine: one cylinder+cone actor per arrow."""
+    L_tot = head_length + stick_length
+    N = len(x)
+    for i in range(0, N, subsample):
+        p0 = np.array([x[i], y[i], z[i]])
+        direction = H[i]
+        color = colors[i]
+
+        # --- Grundposition: Pfeil startet bei p0 ---
+        arrow_center = p0 + direction * (stick_length / 2)
+        cone_center = p0 + direction * (stick_length + head_length / 2)
+
+        if centering:
+            # Gesamten Pfeil um halbe Gesamtlänge nach hinten schieben
+            arrow_center -= direction * (L_tot / 2)
+            cone_center -= direction * (L_tot / 2)
+
+        # --- Erzeuge Geometrien ---
+        arrow = pv.Cylinder(
+            center=arrow_center,
+            direction=direction,
+            radius=stick_radius,
+            height=stick_length
+        )
+        cone = pv.Cone(
+            center=cone_center,
+            direction=direction,
+            height=head_length,
+            radius=head_radius
+        )
+
+        actor = arrow.merge(cone)
+        plotter.add_mesh(actor, color=color, smooth_shading=True, specular=0.3)
+
+        print(f"quiver3 build progress:" + str(round(100 * i / N, 3)) + " %")
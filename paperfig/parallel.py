@@ -0,0 +1,154 @@
+import inspect
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .panel_3d import (
+    quiver3_advanced_panel,
+    _render_quiver,
+    _place_quiver_image,
+    _quiver_cache_key
+)
+from .render_cache import RenderCache
+
+_ARRAY_ARGS = ("x", "y", "z", "Hx", "Hy", "Hz", "C")
+_PLACEMENT_ARGS = ("axes_pos_x_cm", "axes_pos_y_cm", "crop_cm")
+
+
+def render_quiver_panels(fig, panels, max_workers=None, render_cache=None):
+    """
+    Render several 3D quiver panels in parallel and place them in `fig`.
+
+    Each panel is a dict of quiver3_advanced_panel arguments (without
+    `fig`). The off-screen VTK renders run in a process pool; the input
+    arrays are handed to the workers through shared memory instead of
+    being pickled. The returned images are then cropped and placed in
+    the figure in the order of `panels`.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Target figure.
+    panels : list of dict
+        quiver3_advanced_panel arguments per panel (x, y, z, Hx, Hy, Hz,
+        C, Cmin, Cmax, ...). plotter_pool and mesh_cache are not used.
+    max_workers : int, optional
+        Number of worker processes (default: one per CPU, at most one
+        per panel).
+    render_cache : RenderCache or True, optional
+        Cached panels are not sent to the pool; new renders are stored.
+
+    Returns
+    -------
+    list of (ax, img)
+        One entry per panel, as returned by quiver3_advanced_panel.
+    """
+
+    if render_cache is True:
+        render_cache = RenderCache()
+
+    jobs = [_split_panel(panel) for panel in panels]
+    images = [None] * len(jobs)
+    keys = [None] * len(jobs)
+
+    # ===== Cache lookup in the parent process =====
+    if render_cache is not None:
+        for i, (arrays, render_args, _) in enumerate(jobs):
+            keys[i] = _quiver_cache_key(render_cache, arrays, render_args)
+            images[i] = render_cache.get(keys[i])
+
+    # ===== Render the remaining panels in a process pool =====
+    todo = [i for i, img in enumerate(images) if img is None]
+    if todo:
+        if max_workers is None:
+            max_workers = mp.cpu_count()
+        max_workers = max(1, min(max_workers, len(todo)))
+
+        blocks = []
+        try:
+            # "spawn": forked VTK/OpenGL state is not safe to reuse
+            ctx = mp.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+                futures = {}
+                for i in todo:
+                    arrays, render_args, _ = jobs[i]
+                    specs = []
+                    for a in arrays:
+                        shm, spec = _to_shared(a)
+                        blocks.append(shm)
+                        specs.append(spec)
+                    futures[i] = pool.submit(_render_job, specs, render_args)
+                for i in todo:
+                    images[i] = futures[i].result()
+                    if render_cache is not None:
+                        render_cache.put(keys[i], images[i])
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    # ===== Composite in order =====
+    results = []
+    for (_, render_args, placement), img in zip(jobs, images):
+        results.append(_place_quiver_image(
+            fig, img, render_args["dpi"], placement["crop_cm"],
+            placement["axes_pos_x_cm"], placement["axes_pos_y_cm"],
+            render_args["axes_width_cm"]
+        ))
+    return results
+
+
+def _split_panel(panel):
+    """Input arrays, render arguments and placement of one panel dict."""
+    bound = inspect.signature(quiver3_advanced_panel).bind(None, **panel)
+    bound.apply_defaults()
+    args = dict(bound.arguments)
+    args.pop("fig")
+    args.pop("plotter_pool")
+    args.pop("render_cache")
+    args.pop("tile_out")
+    args.pop("mesh_cache")
+    arrays = tuple(np.asarray(args.pop(name)) for name in _ARRAY_ARGS)
+    placement = {name: args.pop(name) for name in _PLACEMENT_ARGS}
+    args["cull_crop_cm"] = placement["crop_cm"] if args["cull"] is not None else None
+    return arrays, args, placement
+
+
+def _to_shared(a):
+    """Copy `a` into a new shared-memory block; returns (block, spec)."""
+    a = np.ascontiguousarray(a)
+    shm = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+    np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[...] = a
+    return shm, (shm.name, a.shape, a.dtype.str)
+
+
+def _attach_shared(name):
+    """Attach to a block owned (and unlinked) by the parent process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers report to the parent's resource
+        # tracker, where the block is already registered.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _render_job(specs, render_args):
+    """Worker: render one panel from shared-memory inputs."""
+    blocks = [_attach_shared(name) for name, _, _ in specs]
+    arrays = [
+        np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        for shm, (_, shape, dtype) in zip(blocks, specs)
+    ]
+    try:
+        return _render_quiver(*arrays, **render_args)
+    finally:
+        del arrays
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:
+                # A VTK array still references the block; the mapping is
+                # released with the worker, the parent unlinks the name.
+                pass
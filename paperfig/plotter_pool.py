@@ -0,0 +1,143 @@
+import pyvista as pv
+
+
+class PlotterPool:
+    """
+    Pool of off-screen PyVista plotters, reused between 3D panel renders.
+
+    Creating a render window (and its GL context) is a large fixed cost of
+    every 3D panel. Plotters taken from a pool are cleared and handed back
+    instead of being closed, so a grid of panels or a batch of snapshot
+    figures pays that cost once per (window_size, antialiasing) key.
+
+    Usage
+    -----
+    with PlotterPool() as pool:
+        quiver3_advanced_panel(fig, ..., plotter_pool=pool)
+        quiver3_advanced_panel(fig, ..., plotter_pool=pool)
+    # all pooled plotters are closed here
+
+    Parameters
+    ----------
+    max_idle : int
+        Maximum number of idle plotters kept per key. Released plotters
+        beyond this limit are closed.
+    """
+
+    def __init__(self, max_idle=2):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._busy = set()
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+    def acquire(self, window_size=(800, 800), antialiasing="ssaa"):
+        """Return a clean off-screen plotter for the given key."""
+        key = _pool_key(window_size, antialiasing)
+        idle = self._idle.get(key)
+        if idle:
+            plotter = idle.pop()
+        else:
+            plotter = pv.Plotter(off_screen=True, window_size=list(key[0]))
+            _enable_antialiasing(plotter, antialiasing)
+            plotter._paperfig_pool_key = key
+        # Scene setup (add_mesh, view_*) must not trigger intermediate
+        # renders on an already shown window; see _screenshot().
+        plotter.suppress_rendering = True
+        self._busy.add(plotter)
+        return plotter
+
+    def release(self, plotter):
+        """Clear `plotter` and keep it for reuse (or close it if the pool is full)."""
+        self._busy.discard(plotter)
+        key = getattr(plotter, "_paperfig_pool_key", None)
+        idle = self._idle.setdefault(key, [])
+        if key is None or len(idle) >= self.max_idle:
+            plotter.close()
+            return
+        _reset_plotter(plotter)
+        idle.append(plotter)
+
+    def close(self):
+        """Close all pooled plotters, idle and in use."""
+        for idle in self._idle.values():
+            for plotter in idle:
+                plotter.close()
+        for plotter in self._busy:
+            plotter.close()
+        self._idle.clear()
+        self._busy.clear()
+
+    def plotter(self, window_size=(800, 800), antialiasing="ssaa"):
+        """Context manager: acquire a plotter and release it on exit."""
+        return _PooledPlotter(self, window_size, antialiasing)
+
+    # ---------------------------------------------------------
+    # Context-manager API
+    # ---------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return sum(len(idle) for idle in self._idle.values()) + len(self._busy)
+
+
+class _PooledPlotter:
+    def __init__(self, pool, window_size, antialiasing):
+        self.pool = pool
+        self.window_size = window_size
+        self.antialiasing = antialiasing
+        self._plotter = None
+
+    def __enter__(self):
+        self._plotter = self.pool.acquire(self.window_size, self.antialiasing)
+        return self._plotter
+
+    def __exit__(self, *exc):
+        self.pool.release(self._plotter)
+        self._plotter = None
+        return False
+
+
+def _enable_antialiasing(plotter, antialiasing):
+    """
+    Set the VTK anti-aliasing of a new plotter. PyVista windows request
+    the theme's multi-samples (MSAA) by default, so "none" switches them
+    off explicitly.
+    """
+    if antialiasing is None or antialiasing == "none":
+        plotter.render_window.SetMultiSamples(0)
+    else:
+        plotter.enable_anti_aliasing(antialiasing)
+
+
+def _applied_antialiasing(plotter):
+    """
+    Anti-aliasing mode a plotter actually renders with: "ssaa", "fxaa",
+    "msaa" or "none". PyVista falls back from FXAA to SSAA on OSMesa/EGL
+    builds of VTK.
+    """
+    renderer = plotter.renderer
+    if getattr(renderer._render_passes, "_ssaa_pass", None) is not None:
+        return "ssaa"
+    if renderer.GetUseFXAA():
+        return "fxaa"
+    if plotter.render_window.GetMultiSamples() > 0:
+        return "msaa"
+    return "none"
+
+
+def _pool_key(window_size, antialiasing):
+    return (tuple(int(n) for n in window_size), antialiasing)
+
+
+def _reset_plotter(plotter):
+    """Remove all actors and restore a default camera (lights are kept)."""
+    plotter.clear_actors()
+    plotter.renderer.camera = pv.Camera()
+    plotter.renderer.camera_set = False
@@ -0,0 +1,237 @@
+import os
+import hashlib
+import secrets
+
+import numpy as np
+
+
+def default_cache_dir(name):
+    """
+    Per-user cache directory for paperfig: $PAPERFIG_CACHE_DIR/<name>, or
+    $XDG_CACHE_HOME/paperfig/<name> (default ~/.cache/paperfig/<name>).
+    """
+    root = os.environ.get("PAPERFIG_CACHE_DIR")
+    if root is None:
+        xdg = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        root = os.path.join(xdg, "paperfig")
+    return os.path.join(root, name)
+
+
+class RenderCache:
+    """
+    Content-addressed on-disk cache of rendered 3D panel images.
+
+    Images are stored as .npy files named by a hash of the input arrays
+    and all render parameters, so a repeated render returns the stored
+    RGB array without starting VTK. The cache is bounded in size; the
+    least recently used entries are evicted first.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory (default: default_cache_dir("renders")).
+    max_bytes : int
+        Size limit of the cache directory in bytes.
+    """
+
+    suffix = ".npy"
+
+    def __init__(self, directory=None, max_bytes=512 * 1024**2):
+        if directory is None:
+            directory = default_cache_dir("renders")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    # ---------------------------------------------------------
+    # Keys
+    # ---------------------------------------------------------
+    def key(self, arrays, params):
+        """Hash of the input arrays (dtype, shape, bytes) and parameters."""
+        h = hashlib.blake2b(digest_size=20)
+        for a in arrays:
+            _hash_array(h, a)
+        for name in sorted(params):
+            h.update(name.encode())
+            value = params[name]
+            if isinstance(value, np.ndarray):
+                _hash_array(h, value)
+            else:
+                h.update(repr(getattr(value, "name", value)).encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    # ---------------------------------------------------------
+    # Access
+    # ---------------------------------------------------------
+    def get(self, key):
+        """Stored array for `key`, or None. A hit marks the entry as recently used."""
+        path = self.path(key)
+        try:
+            img = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return img
+
+    def put(self, key, img):
+        """Store `img` under `key` (atomic write) and enforce the size limit."""
+        _atomic_write(self.path(key), lambda f: np.save(f, np.asarray(img)),
+                      self.directory, self.suffix)
+        self.evict()
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    # ---------------------------------------------------------
+    # Invalidation / eviction
+    # ---------------------------------------------------------
+    def invalidate(self, key=None):
+        """Remove the entry for `key`, or every entry if key is None."""
+        keys = [key] if key is not None else [e[0] for e in self._entries()]
+        for k in keys:
+            try:
+                os.remove(self.path(k))
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(e[2] for e in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self.invalidate(key)
+            total -= size
+
+    def size(self):
+        """Total size of all entries in bytes."""
+        return sum(e[2] for e in self._entries())
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                # dot files are writes in progress (see MeshCache.put)
+                if (entry.is_file() and entry.name.endswith(self.suffix)
+                        and not entry.name.startswith(".")):
+                    st = entry.stat()
+                    key = entry.name[:-len(self.suffix)]
+                    entries.append((key, st.st_mtime, st.st_size))
+        return entries
+
+
+class MeshCache(RenderCache):
+    """
+    Content-addressed on-disk cache of built arrow meshes (binary .vtp).
+
+    Keyed like RenderCache, by the input arrays and the parameters that
+    shape the geometry, so that camera-only changes (view, cam_pos,
+    margin_cm, ...) reload the mesh instead of rebuilding it.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory (default: default_cache_dir("meshes")).
+    max_bytes : int
+        Size limit of the cache directory in bytes.
+    """
+
+    suffix = ".vtp"
+
+    def __init__(self, directory=None, max_bytes=2 * 1024**3):
+        if directory is None:
+            directory = default_cache_dir("meshes")
+        super().__init__(directory, max_bytes)
+
+    def get(self, key):
+        """Stored PolyData for `key`, or None. A hit marks the entry as recently used."""
+        import pyvista as pv
+
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            mesh = pv.read(path)
+        except (ValueError, OSError):
+            return None
+        if mesh.n_points == 0:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return mesh
+
+    def put(self, key, mesh):
+        """Store `mesh` under `key` (atomic write) and enforce the size limit."""
+        from vtkmodules.vtkIOXML import vtkXMLPolyDataWriter
+
+        # VTK writers need a file name with the right extension
+        fd, tmp = _create_temp(self.directory, prefix=".", suffix=self.suffix)
+        os.close(fd)
+        try:
+            # Raw appended data: no base64 or zlib pass, so reading back is
+            # faster than rebuilding the arrows (at about 2x the zlib size)
+            writer = vtkXMLPolyDataWriter()
+            writer.SetInputData(mesh)
+            writer.SetFileName(tmp)
+            writer.SetDataModeToAppended()
+            writer.EncodeAppendedDataOff()
+            writer.SetCompressorTypeToNone()
+            if not writer.Write():
+                raise OSError("Could not write " + tmp)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+
+def _hash_array(h, a):
+    a = np.ascontiguousarray(a)
+    h.update(str(a.dtype).encode())
+    h.update(str(a.shape).encode())
+    h.update(a.view(np.uint8).reshape(-1) if a.size else b"")
+
+
+def _create_temp(directory, prefix="", suffix=""):
+    """
+    Create and open a new temp file in `directory`; returns (fd, path).
+
+    Unlike mkstemp (mode 0600), the file is created with mode 0666 and
+    the kernel applies the umask, so shared caches are readable by other
+    users like any normally created file.
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        path = os.path.join(directory, prefix + secrets.token_hex(8) + suffix)
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError("No usable temporary file name found in " + directory)
+
+
+def _atomic_write(path, write, directory, suffix):
+    """Write via `write(fileobj)` to a temp file, then rename into place."""
+    fd, tmp = _create_temp(directory, suffix=suffix + ".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,433 @@
+import os
+import shutil
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib as mpl
+from matplotlib.text import Text
+from matplotlib.texmanager import TexManager
+
+from .figure import figure_style
+from .render_cache import default_cache_dir
+
+# TexCache currently routing matplotlib's TeX runs (see TexCache.install)
+_active = None
+
+
+class TexCache:
+    """
+    Persistent, content-addressed cache of LaTeX-rendered text fragments.
+
+    With text.usetex, matplotlib runs latex (and dvipng for raster output)
+    once per distinct string. The files are named by a hash of the full
+    TeX source, i.e. the string, the font size, the preamble and the font
+    settings, and written atomically, so several processes can share one
+    cache directory safely. Installing a TexCache points matplotlib at a
+    paperfig-managed directory (e.g. a volume shared by worker
+    containers) and counts hits and misses.
+
+    Usage
+    -----
+    cache = TexCache().install()        # or create_paper_figure(tex_cache=True)
+    cache.warm([r"$\\mu_0 H$ (T)", r"$m_z$"], fontsizes=[6, 7])
+    ...
+    print(cache.stats())
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory (default: default_cache_dir("tex")).
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = default_cache_dir("tex")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._previous = []
+        self.reset_stats()
+
+    # ---------------------------------------------------------
+    # Installation
+    # ---------------------------------------------------------
+    def install(self):
+        """Route matplotlib's TeX runs through this cache; returns self."""
+        global _active
+        if _active is self:
+            return self
+        if _active is not None:
+            _active.uninstall()
+        self._saved = {name: TexManager.__dict__[name]
+                       for name in ("_cache_dir", "make_dvi", "make_png")}
+        TexManager._cache_dir = Path(self.directory)
+        TexManager.make_dvi = self._counting("dvi", self._saved["make_dvi"])
+        TexManager.make_png = self._counting("png", self._saved["make_png"])
+        _active = self
+        return self
+
+    def uninstall(self):
+        """Restore matplotlib's own TeX cache."""
+        global _active
+        if _active is not self:
+            return
+        for name, value in self._saved.items():
+            setattr(TexManager, name, value)
+        _active = None
+
+    def __enter__(self):
+        self._previous.append(_active)
+        return self.install()
+
+    def __exit__(self, *exc):
+        previous = self._previous.pop()
+        if previous is None:
+            self.uninstall()
+        else:
+            previous.install()
+        return False
+
+    def _counting(self, kind, make):
+        """Wrap TexManager.make_dvi/make_png to count cache hits and misses."""
+        make = make.__func__
+        suffix = "." + kind
+
+        def wrapper(cls, tex, fontsize, *args):
+            hit = os.path.exists(cls.get_basefile(tex, fontsize, *args) + suffix)
+            with self._lock:
+                (self.hits if hit else self.misses)[kind] += 1
+                if not hit and kind == "dvi":
+                    self.latex_runs += 1
+            return make(cls, tex, fontsize, *args)
+
+        return classmethod(wrapper)
+
+    # ---------------------------------------------------------
+    # Warm-up
+    # ---------------------------------------------------------
+    def warm(self, labels, fontsizes=None, dpi=None, max_workers=None):
+        """
+        Render `labels` ahead of time (e.g. once per project, before workers start).
+
+        All fragments are compiled in one latex run (see precompile_tex);
+        if that fails, they are rendered one by one in parallel threads.
+
+        The TeX source depends on the current rcParams (font family, serif
+        font, text.latex.preamble), so warm up under the same settings the
+        figures use, e.g. after create_paper_figure(). Tick labels are set
+        as "$\\mathdefault{0.5}$" by matplotlib's formatters.
+
+        Parameters
+        ----------
+        labels : iterable of str
+            Strings as they are passed to matplotlib.
+        fontsizes : sequence of float, optional
+            Font sizes in pt (default: rcParams["font.size"]).
+        dpi : float, optional
+            Also rasterize at this dpi (used by PNG output; vector output
+            only needs the layout).
+        max_workers : int, optional
+            Parallel latex runs (default: ThreadPoolExecutor's choice).
+
+        Returns
+        -------
+        int
+            Number of fragments that had to be rendered.
+        """
+        if fontsizes is None:
+            fontsizes = [mpl.rcParams["font.size"]]
+        jobs = {(tex, fs) for tex in labels if tex.strip() for fs in fontsizes}
+
+        def render(job):
+            tex, fs = job
+            TexManager.make_dvi(tex, fs)
+            if dpi is not None:
+                TexManager.make_png(tex, fs, dpi)
+
+        with self:
+            misses = self.misses["dvi"]
+            if not _compile_batch(jobs, dpi):
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    list(pool.map(render, sorted(jobs)))
+            return self.misses["dvi"] - misses
+
+    # ---------------------------------------------------------
+    # Statistics / maintenance
+    # ---------------------------------------------------------
+    def stats(self):
+        """
+        Hits and misses of this process, and the size of the shared directory.
+
+        Returns
+        -------
+        dict
+            Keys "hits", "misses" (fragments rendered), "hit_rate",
+            "latex_runs" (latex invocations, one per batch), "entries"
+            (cached .dvi files) and "bytes".
+        """
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            latex_runs = self.latex_runs
+        entries, size = 0, 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries += name.endswith(".dvi")
+        return dict(
+            hits=hits,
+            misses=misses,
+            hit_rate=hits / (hits + misses) if hits + misses else 0.0,
+            latex_runs=latex_runs,
+            entries=entries,
+            bytes=size,
+        )
+
+    def reset_stats(self):
+        """Reset the hit/miss counters."""
+        self.hits = {"dvi": 0, "png": 0}
+        self.misses = {"dvi": 0, "png": 0}
+        self.latex_runs = 0
+
+    def _record_batch(self, n_dvi, n_png):
+        with self._lock:
+            self.misses["dvi"] += n_dvi
+            self.misses["png"] += n_png
+            self.latex_runs += 1
+
+    def clear(self):
+        """Remove every cached fragment."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        TexManager._grey_arrayd.clear()
+
+
+# ===== Batch compilation =====
+
+def precompile_tex(fig, dpi=None):
+    """
+    Compile every usetex string of `fig` in a single latex run before drawing.
+
+    matplotlib runs latex once per distinct string when a figure is drawn
+    (tick labels, axis labels, add_label_cm texts, ...). This pass collects
+    the strings first, typesets them as the pages of one document and
+    splits the DVI output into matplotlib's per-string cache files, so the
+    following draw finds every fragment cached. With `dpi`, the PNG
+    rasters used by the Agg backend are made by a single dvipng run too.
+
+    Strings that cannot be batched (latex or dvipng missing, a LaTeX
+    error) are left to matplotlib, which then reports the error for the
+    offending string as usual.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Fully built figure, right before savefig().
+    dpi : float or "figure", optional
+        Output dpi of a raster savefig() (vector output needs only the DVI).
+
+    Returns
+    -------
+    int
+        Number of fragments compiled (0 if everything was cached).
+    """
+    if dpi == "figure":
+        dpi = fig.dpi
+    with figure_style(fig):             # the TeX source depends on the rcParams
+        return _compile_batch(_figure_tex_jobs(fig), dpi)
+
+
+def _figure_tex_jobs(fig):
+    """(tex, fontsize) pairs that drawing `fig` would send to TexManager."""
+    texts = []
+    for ax in fig.axes:
+        for axis in (getattr(ax, name, None) for name in ("xaxis", "yaxis", "zaxis")):
+            if axis is not None:
+                # formats the labels of the ticks in view, as a draw would
+                texts += axis.get_majorticklabels() + axis.get_minorticklabels()
+    tick_labels = {id(t) for t in texts}
+    for ax in fig.axes:
+        for axis in (getattr(ax, name, None) for name in ("xaxis", "yaxis", "zaxis")):
+            if axis is not None:
+                for tick in axis.majorTicks + axis.minorTicks:
+                    tick_labels.update((id(tick.label1), id(tick.label2)))
+    texts += [t for t in fig.findobj(Text) if id(t) not in tick_labels]
+
+    jobs = set()
+    for t in texts:
+        if not t.get_visible() or not t.get_usetex() or not t.get_text():
+            continue
+        fontsize = t.get_fontsize()
+        jobs.add(("lp", fontsize))           # line metrics probe of Text._get_layout
+        for line in t.get_text().split("\n"):
+            if line == " ":
+                line = r"\ "
+            if line:
+                jobs.add((line, fontsize))
+    return jobs
+
+
+def _dpi_aliases(dpi):
+    """matplotlib hashes str(dpi): 600 and 600.0 name different PNG files."""
+    if float(dpi).is_integer():
+        return [int(dpi), float(dpi)]
+    return [dpi]
+
+
+def _compile_batch(jobs, dpi=None):
+    """
+    One latex (and dvipng) run for the uncached `jobs`; returns the number
+    of fragments compiled, or 0 if the batch could not be made.
+    """
+    jobs = sorted(jobs, key=lambda job: (job[1], job[0]))
+    todo = [job for job in jobs
+            if not os.path.exists(TexManager.get_basefile(*job) + ".dvi")]
+    png_todo = []
+    if dpi is not None:
+        png_todo = [job for job in jobs if not all(
+            os.path.exists(TexManager.get_basefile(*job, d) + ".png")
+            for d in _dpi_aliases(dpi))]
+    if not todo and not png_todo:
+        return 0
+    batch = sorted(set(todo) | set(png_todo), key=jobs.index)
+
+    # One document, one page per fragment; every page is the body of
+    # matplotlib's own single-fragment source, so the pages typeset the same
+    preambles, bodies = set(), []
+    for tex, fontsize in batch:
+        head, body = TexManager._get_tex_source(tex, fontsize).split(r"\begin{document}")
+        preambles.add(head)
+        bodies.append(body.rsplit(r"\end{document}", 1)[0])
+    if len(preambles) != 1:
+        return 0
+    source = (preambles.pop() + r"\begin{document}"
+              + "\n\\clearpage\n".join(bodies) + r"\end{document}")
+
+    cache_dir = os.path.dirname(TexManager.get_basefile(*batch[0]))
+    try:
+        with tempfile.TemporaryDirectory(dir=cache_dir) as tmpdir:
+            Path(tmpdir, "batch.tex").write_text(source, encoding="utf-8")
+            subprocess.run(
+                ["latex", "-interaction=nonstopmode", "-halt-on-error",
+                 "-no-shell-escape", "batch.tex"],
+                cwd=tmpdir, check=True, stdout=subprocess.DEVNULL,
+                stderr=subprocess.STDOUT)
+            pages = _split_dvi(Path(tmpdir, "batch.dvi").read_bytes())
+            if len(pages) != len(batch):
+                return 0
+            for job, page in zip(batch, pages):
+                dvipath = TexManager.get_basefile(*job) + ".dvi"
+                tmp = Path(tmpdir, "page.dvi")
+                tmp.write_bytes(page)
+                os.replace(tmp, dvipath)
+
+            if png_todo:
+                # dvipng renders each page of the batch to its own file
+                subprocess.run(
+                    ["dvipng", "-bg", "Transparent", "-D", str(dpi), "-T", "tight",
+                     "-o", "page%d.png", "batch.dvi"],
+                    cwd=tmpdir, check=True, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.STDOUT)
+                for i, job in enumerate(batch, start=1):
+                    png = Path(tmpdir, "page{}.png".format(i))
+                    for d in _dpi_aliases(dpi):
+                        shutil.copyfile(png, Path(tmpdir, "alias.png"))
+                        os.replace(Path(tmpdir, "alias.png"),
+                                   TexManager.get_basefile(*job, d) + ".png")
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return 0
+
+    if _active is not None:
+        _active._record_batch(len(todo), len(png_todo))
+    return len(batch)
+
+
+# ===== DVI splitting =====
+
+def _dvi_arg_length(op):
+    """Number of argument bytes of DVI opcode `op` (fixed-size commands only)."""
+    if op < 128 or op in (138, 141, 142, 147, 152, 161, 166):
+        return 0
+    if op in (132, 137):                                # set_rule, put_rule
+        return 8
+    for first in (128, 133, 143, 148, 153, 157, 162, 167):
+        if first <= op < first + 4:
+            return op - first + 1
+    raise ValueError("Unsupported DVI opcode {}".format(op))
+
+
+def _split_dvi(data):
+    """
+    Split a multi-page DVI file into standalone single-page DVI files.
+
+    Each page keeps its bytes; the font definitions it relies on from
+    earlier pages are repeated after its bop, and a new postamble is
+    written.
+    """
+    if data[0] != 247:
+        raise ValueError("Not a DVI file")
+    pre = data[:15 + data[14]]
+    font_defs = {}
+    pages = []
+    page = None
+    pos = len(pre)
+    while True:
+        op = data[pos]
+        if op == 139:                                   # bop
+            page = (pos, set(), set())
+            pos += 45
+        elif op == 140:                                 # eop
+            pos += 1
+            pages.append(page + (pos,))
+            page = None
+        elif op == 248:                                 # post
+            post = pos
+            break
+        elif 243 <= op <= 246:                          # fnt_def1..4
+            n = op - 242
+            k = int.from_bytes(data[pos + 1:pos + 1 + n], "big")
+            names = pos + 1 + n + 12
+            end = names + 2 + data[names] + data[names + 1]
+            font_defs.setdefault(k, data[pos:end])
+            if page is not None:
+                page[2].add(k)
+            pos = end
+        elif 171 <= op <= 234:                          # fnt_num_0..63
+            page[1].add(op - 171)
+            pos += 1
+        elif 235 <= op <= 238:                          # fnt1..4
+            n = op - 234
+            page[1].add(int.from_bytes(data[pos + 1:pos + 1 + n], "big"))
+            pos += 1 + n
+        elif 239 <= op <= 242:                          # xxx1..4 (specials)
+            n = op - 238
+            pos += 1 + n + int.from_bytes(data[pos + 1:pos + 1 + n], "big")
+        else:
+            pos += 1 + _dvi_arg_length(op)
+
+    out_pages = []
+    for bop, used, defined, end in pages:
+        out = bytearray(pre)
+        new_bop = len(out)
+        out += data[bop:bop + 41]                       # bop, c0..c9
+        out += (-1).to_bytes(4, "big", signed=True)     # no previous page
+        for k in sorted(used - defined):
+            out += font_defs[k]
+        out += data[bop + 45:end]
+
+        new_post = len(out)
+        out += bytes([248]) + new_bop.to_bytes(4, "big")
+        out += data[post + 5:post + 27]                 # num, den, mag, l, u, s
+        out += (1).to_bytes(2, "big")                   # one page
+        for k in sorted(used | defined):
+            out += font_defs[k]
+        out += bytes([249]) + new_post.to_bytes(4, "big") + data[1:2]
+        out += bytes([223]) * (4 + (-len(out)) % 4)
+        out_pages.append(bytes(out))
+    return out_pages
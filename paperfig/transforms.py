@@ -0,0 +1,298 @@
+import numpy as np
+
+
+# ===== Coordinate systems for the vector-field panels =====
+#
+# A coordinate system maps points and vectors to the 1D projection of the
+# vector-field panels: a parameter (x, rho, r, ...) and three vector
+# components. The built-in systems derive their basis from the
+# coordinates once (cos/sin of the angles as ratios, no arctan2/cos/sin)
+# and write into preallocated buffers, so a call allocates a few work
+# arrays instead of dozens of temporaries.
+
+class CoordinateSystem:
+    """
+    Parameter and vector mapping of one coordinate system.
+
+    Parameters
+    ----------
+    name : str
+        Registry name.
+    param_func : callable
+        param_func(x, y, z) -> (parameter, label).
+    vector_func : callable
+        vector_func(x, y, z, mx, my, mz) -> (M1, M2, M3, L1, L2, L3).
+    color_func : callable, optional
+        color_func(mx, my, mz) -> C of the 3D panel (default: color_mz).
+    project_func : callable, optional
+        project_func(x, y, z, mx, my, mz, out=None, dtype=None) ->
+        (parameter, M1, M2, M3, param_label, (L1, L2, L3)), computing
+        the parameter and the components together (default: param_func
+        and vector_func one after the other).
+
+    The functions work element-wise on arrays of any shape.
+    """
+
+    def __init__(self, name, param_func, vector_func, color_func=None,
+                 project_func=None):
+        self.name = name
+        self.param_func = param_func
+        self.vector_func = vector_func
+        self.color_func = color_mz if color_func is None else color_func
+        self.project_func = project_func
+
+    def __repr__(self):
+        return "CoordinateSystem({!r})".format(self.name)
+
+    def project(self, x, y, z, mx, my, mz, out=None, dtype=None):
+        """
+        Parameter and vector components of the points.
+
+        Parameters
+        ----------
+        x, y, z, mx, my, mz : array_like
+            Points and vectors.
+        out : sequence of 4 ndarray, optional
+            Buffers for parameter, M1, M2, M3 (e.g. an (4, N) array).
+        dtype : dtype, optional
+            Result type if `out` is not given (e.g. np.float32); default
+            is the floating type of the inputs.
+
+        Returns
+        -------
+        parameter, M1, M2, M3 : ndarray
+        param_label : str
+        labels : tuple of str
+        """
+        if self.project_func is not None:
+            return self.project_func(x, y, z, mx, my, mz, out=out, dtype=dtype)
+
+        p, param_label = self.param_func(x, y, z)
+        M1, M2, M3, L1, L2, L3 = self.vector_func(x, y, z, mx, my, mz)
+        values = [p, M1, M2, M3]
+        if out is not None:
+            for o, v in zip(out, values):
+                np.copyto(o, v, casting="same_kind")
+            values = list(out)
+        elif dtype is not None:
+            values = [np.asarray(v, dtype=dtype) for v in values]
+        return (*values, param_label, (L1, L2, L3))
+
+
+_SYSTEMS = {}
+
+
+def register_coordinate_system(name, param_func, vector_func, color_func=None,
+                               project_func=None):
+    """
+    Make a coordinate system available as coord_system=`name` in
+    PlotVectorfieldPanel and plot_vectorfield_panels (see CoordinateSystem
+    for the functions). Registering an existing name replaces it.
+
+    Returns
+    -------
+    CoordinateSystem
+    """
+    if name == "user":
+        raise ValueError("'user' is reserved for functions passed per call.")
+    system = CoordinateSystem(name, param_func, vector_func, color_func,
+                              project_func)
+    _SYSTEMS[name] = system
+    return system
+
+
+def coordinate_system(name):
+    """Registered CoordinateSystem `name` (ValueError if unknown)."""
+    try:
+        return _SYSTEMS[name]
+    except KeyError:
+        raise ValueError("coord_system must be 'user' or one of: {}.".format(
+            ", ".join(repr(n) for n in _SYSTEMS))) from None
+
+
+def coordinate_systems():
+    """Names of the registered coordinate systems."""
+    return list(_SYSTEMS)
+
+
+def _resolve_system(coord_system, color_func=None, param_func=None,
+                    vector_func=None):
+    """CoordinateSystem of the entry points' coord_system arguments."""
+    if coord_system == "user":
+        if color_func is None or param_func is None or vector_func is None:
+            raise ValueError("For coord_system='user', provide color_func, "
+                             "param_func and vector_func.")
+        return CoordinateSystem("user", param_func, vector_func, color_func)
+    return coordinate_system(coord_system)
+
+
+# ===== Buffers and basis =====
+
+def _buffers(out, n, like, dtype):
+    """`n` result arrays: the given `out`, or new ones shaped like `like`."""
+    if out is not None:
+        return list(out)[:n]
+    shape = np.shape(like)
+    if dtype is None:
+        dtype = np.result_type(like, np.float32)
+    return [np.empty(shape, dtype=dtype) for _ in range(n)]
+
+
+def _buffer(out, like, dtype):
+    """`out`, or a new result array shaped like `like`."""
+    return _buffers(None, 1, like, dtype)[0] if out is None else out
+
+
+def _polar_basis(x, y, rho):
+    """
+    cos(phi), sin(phi) of the points (x, y) with rho = hypot(x, y) given;
+    phi = 0 on the axis, as np.arctan2(0, 0).
+    """
+    off_axis = rho != 0
+    cos_phi = np.divide(x, rho, out=np.ones_like(rho), where=off_axis)
+    sin_phi = np.divide(y, rho, out=np.zeros_like(rho), where=off_axis)
+    return cos_phi, sin_phi
+
+
+def _rotate(mx, my, cos_phi, sin_phi, out_a, out_b):
+    """
+    out_a = mx cos + my sin, out_b = my cos - mx sin; cos_phi and sin_phi
+    are used as work space (overwritten).
+    """
+    np.multiply(mx, cos_phi, out=out_a)
+    np.multiply(my, cos_phi, out=out_b)
+    out_a += np.multiply(my, sin_phi, out=cos_phi)
+    out_b -= np.multiply(mx, sin_phi, out=sin_phi)
+
+
+# ===== Color =====
+
+def color_mz(mx, my, mz, out=None, dtype=None):
+    """mz / |m| (0 for zero vectors), the default color of the 3D panel."""
+    C = _buffer(out, mz, dtype)
+    work = np.empty_like(C)
+    np.multiply(mx, mx, out=C)
+    C += np.square(my, out=work)
+    C += np.square(mz, out=work)
+    np.sqrt(C, out=C)
+    np.divide(mz, C, out=C, where=C > 0)
+    return C
+
+
+# ===== Cartesian =====
+
+def parameter_cart(x, y, z, out=None, dtype=None):
+    p = _buffer(out, x, dtype)
+    np.copyto(p, x, casting="same_kind")
+    return p, r"$x$ [nm]"
+
+
+def vector_cart(x, y, z, mx, my, mz, out=None, dtype=None):
+    if out is None and dtype is None:
+        return mx, my, mz, r"$m_x$", r"$m_y$", r"$m_z$"
+    M = _buffers(out, 3, mx, dtype)
+    for o, m in zip(M, (mx, my, mz)):
+        np.copyto(o, m, casting="same_kind")
+    return (*M, r"$m_x$", r"$m_y$", r"$m_z$")
+
+
+def project_cart(x, y, z, mx, my, mz, out=None, dtype=None):
+    if out is None and dtype is None:
+        return x, mx, my, mz, r"$x$ [nm]", (r"$m_x$", r"$m_y$", r"$m_z$")
+    p, M1, M2, M3 = _buffers(out, 4, mx, dtype)
+    parameter_cart(x, y, z, out=p)
+    *M, L1, L2, L3 = vector_cart(x, y, z, mx, my, mz, out=(M1, M2, M3))
+    return (p, *M, r"$x$ [nm]", (L1, L2, L3))
+
+
+# ===== Cylindrical =====
+
+def parameter_cyl(x, y, z, out=None, dtype=None):
+    rho = _buffer(out, x, dtype)
+    np.hypot(x, y, out=rho)
+    return rho, r"$\rho$ [nm]"
+
+
+def vector_cyl(x, y, z, mx, my, mz, out=None, dtype=None):
+    *M, _, labels = project_cyl(x, y, z, mx, my, mz,
+                                out=None if out is None else (None, *out),
+                                dtype=dtype)
+    return (*M[1:], *labels)
+
+
+def project_cyl(x, y, z, mx, my, mz, out=None, dtype=None):
+    """rho and (m_rho, m_phi, m_z); cos/sin(phi) are x/rho, y/rho."""
+    if out is not None and out[0] is None:
+        out = (np.empty_like(out[1]), *out[1:])
+    if out is None and dtype is None:
+        # m_z is unchanged: no copy
+        rho, Mrho, Mphi = _buffers(None, 3, mx, None)
+        Mz = mz
+    else:
+        rho, Mrho, Mphi, Mz = _buffers(out, 4, mx, dtype)
+        np.copyto(Mz, mz, casting="same_kind")
+    np.hypot(x, y, out=rho)
+    cos_phi, sin_phi = _polar_basis(x, y, rho)
+    _rotate(mx, my, cos_phi, sin_phi, Mrho, Mphi)
+    return (rho, Mrho, Mphi, Mz, r"$\rho$ [nm]",
+            (r"$m_{\rho}$", r"$m_{\phi}$", r"$m_z$"))
+
+
+# ===== Spherical =====
+
+def parameter_sph(x, y, z, out=None, dtype=None):
+    r = _buffer(out, x, dtype)
+    np.hypot(x, y, out=r)
+    np.hypot(r, z, out=r)
+    return r, r"$r$ [nm]"
+
+
+def vector_sph(x, y, z, mx, my, mz, out=None, dtype=None):
+    *M, _, labels = project_sph(x, y, z, mx, my, mz,
+                                out=None if out is None else (None, *out),
+                                dtype=dtype)
+    return (*M[1:], *labels)
+
+
+def project_sph(x, y, z, mx, my, mz, out=None, dtype=None):
+    """
+    r and (m_r, m_theta, m_phi). sin/cos(theta) are rho/r, z/r and the
+    in-plane component m_rho = mx cos(phi) + my sin(phi) is shared:
+    m_r = m_rho sin(theta) + mz cos(theta),
+    m_theta = m_rho cos(theta) - mz sin(theta).
+    """
+    if out is not None and out[0] is None:
+        out = (np.empty_like(out[1]), *out[1:])
+    r, Mr, Mtheta, Mphi = _buffers(out, 4, mx, dtype)
+
+    rho = np.hypot(x, y, dtype=r.dtype)
+    np.hypot(rho, z, out=r)
+    cos_phi, sin_phi = _polar_basis(x, y, rho)
+    # m_rho -> Mtheta (temporarily), m_phi -> Mphi
+    _rotate(mx, my, cos_phi, sin_phi, Mtheta, Mphi)
+
+    # theta = pi/2 at the origin, as arccos(0 / max(r, eps))
+    inside = r != 0
+    sin_theta = np.divide(rho, r, out=rho, where=inside)
+    cos_theta = np.divide(z, r, out=cos_phi, where=inside)
+    if not inside.all():
+        sin_theta[~inside] = 1.0
+        cos_theta[~inside] = 0.0
+    work = sin_phi
+
+    np.multiply(Mtheta, sin_theta, out=Mr)
+    np.multiply(mz, cos_theta, out=work)
+    Mr += work
+    Mtheta *= cos_theta
+    np.multiply(mz, sin_theta, out=work)
+    Mtheta -= work
+    return (r, Mr, Mtheta, Mphi, r"$r$ [nm]",
+            (r"$m_r$", r"$m_{\theta}$", r"$m_{\phi}$"))
+
+
+register_coordinate_system("cart", parameter_cart, vector_cart,
+                           project_func=project_cart)
+register_coordinate_system("cyl", parameter_cyl, vector_cyl,
+                           project_func=project_cyl)
+register_coordinate_system("sph", parameter_sph, vector_sph,
+                           project_func=project_sph)
@@ -1,6 +1,5 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import pyvista as pv
 import matplotlib.ticker as mticker
 
 def crop_image(img, left=0, right=0, top=0, bottom=0):
@@ -23,17 +22,23 @@ def Show_Axes_Margins(fig):
         fig.patches.append(rect)
 
 def add_reference_axes(plotter, length=0.5, radius=0.02, offset=0.8):
+    import pyvista as pv     # only needed for 3D panels; keeps `import paperfig` light
+
     colors = {"x": (1, 0, 0), "y": (0, 1, 0), "z": (0, 0, 1)}
     dirs   = {"x": [1, 0, 0], "y": [0, 1, 0], "z": [0, 0, 1]}
     origin = np.array([-offset, -offset, -offset])
 
+    actors = []
     for key in dirs:
         arrow = pv.Arrow(
             start=origin, direction=dirs[key],
             tip_length=0.3, tip_radius=radius * 1.6,
             shaft_radius=radius, scale=length
         )
-        plotter.add_mesh(arrow, color=colors[key], smooth_shading=True)
+        actors.append(
+            plotter.add_mesh(arrow, color=colors[key], smooth_shading=True)
+        )
+    return actors
 
 
 def apply_tick_style(
@@ -0,0 +1,372 @@
+import io
+import os
+import re
+import glob
+import shutil
+import hashlib
+import tempfile
+
+import numpy as np
+
+from .render_cache import default_cache_dir, _create_temp
+
+VECTORFIELD_COLUMNS = ("x", "y", "z", "mx", "my", "mz")
+
+
+def load_vectorfield(csv_path, cache=True, cache_dir=None, chunksize=2_000_000):
+    """
+    Read x, y, z, mx, my, mz from a whitespace-separated text dump.
+
+    The text is parsed once (C tokenizer, float64, in chunks) and stored
+    as a columnar binary sidecar file; later calls memory-map the columns
+    instead of parsing again. The sidecar name contains the size and
+    modification time of the text file, so an edited or replaced file is
+    parsed again and the outdated sidecar removed.
+
+    Rows that are not six numbers (headers, "#" comments, truncated
+    lines) are skipped, as with the previous pandas to_numeric/dropna
+    ingestion.
+
+    Parameters
+    ----------
+    csv_path : str
+        Text file with columns x, y, z, mx, my, mz.
+    cache : bool
+        Use (and write) the binary sidecar.
+    cache_dir : str, optional
+        Directory of the sidecar files (default: next to the text file,
+        or default_cache_dir("columns") if that is not writable).
+    chunksize : int
+        Rows parsed per chunk (bounds the parser memory).
+
+    Returns
+    -------
+    tuple of ndarray
+        x, y, z, mx, my, mz (read-only memory maps when cached).
+    """
+    st = os.stat(csv_path)
+    if not cache:
+        return tuple(_parse(csv_path, chunksize, _stack_columns))
+
+    path = _sidecar_path(csv_path, st, cache_dir)
+    cols = _load_sidecar(path)
+    if cols is None:
+        try:
+            _write_sidecar(path, csv_path, chunksize)
+        except OSError:
+            if cache_dir is not None:
+                raise
+            # read-only data directory: keep the sidecar in the user cache
+            path = _sidecar_path(csv_path, st, default_cache_dir("columns"))
+            _write_sidecar(path, csv_path, chunksize)
+        cols = _load_sidecar(path)
+    return tuple(cols)
+
+
+def iter_vectorfield(csv_path, chunksize=2_000_000, cache=True, cache_dir=None):
+    """
+    Yield x, y, z, mx, my, mz of a text dump in chunks of at most
+    `chunksize` rows, for files too large to hold in memory.
+
+    With `cache`, the columnar sidecar of load_vectorfield is written
+    (streamed, bounded memory) or reused, and the chunks are slices of
+    its memory maps. Without it, the text is parsed chunk by chunk.
+
+    Parameters
+    ----------
+    csv_path : str
+        Text file with columns x, y, z, mx, my, mz.
+    chunksize : int
+        Rows per chunk.
+    cache, cache_dir
+        As for load_vectorfield.
+
+    Yields
+    ------
+    tuple of ndarray
+        x, y, z, mx, my, mz of the chunk.
+    """
+    if cache:
+        cols = load_vectorfield(csv_path, cache=True, cache_dir=cache_dir,
+                                chunksize=chunksize)
+        for start in range(0, len(cols[0]), chunksize):
+            yield tuple(c[start:start + chunksize] for c in cols)
+        return
+
+    done = 0
+    try:
+        for chunk in _parse_chunks(csv_path, chunksize, coerce=False):
+            done += len(chunk)
+            yield tuple(np.ascontiguousarray(chunk.T))
+    except (ValueError, TypeError):
+        # non-numeric tokens: continue with the coercing parser after the
+        # rows already delivered
+        for chunk in _parse_chunks(csv_path, chunksize, coerce=True):
+            skip = min(done, len(chunk))
+            done -= skip
+            if skip < len(chunk):
+                yield tuple(np.ascontiguousarray(chunk[skip:].T))
+
+
+def _load_sidecar(path):
+    """Memory-mapped (6, N) column array, or None."""
+    try:
+        cols = np.load(path, mmap_mode="r")
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+    if cols.ndim != 2 or cols.shape[0] != len(VECTORFIELD_COLUMNS):
+        return None
+    return cols
+
+
+def _sidecar_path(csv_path, st, cache_dir):
+    """<name>.<size>-<mtime_ns>.cols.npy next to the file or in `cache_dir`."""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.basename(csv_path)
+    if cache_dir is None:
+        cache_dir = os.path.dirname(csv_path)
+    else:
+        # different directories may hold files of the same name
+        stem += "." + hashlib.blake2b(csv_path.encode(), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, "{}.{}-{}.cols.npy".format(
+        stem, st.st_size, st.st_mtime_ns))
+
+
+def _write_sidecar(path, csv_path, chunksize):
+    """
+    Parse `csv_path` into the (6, N) sidecar at `path` (atomic write) and
+    drop outdated sidecars of the same file. Columns are streamed to
+    temporary files first, so memory stays bounded by one chunk.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    def write_columns(chunks):
+        files = [tempfile.TemporaryFile(dir=directory) for _ in VECTORFIELD_COLUMNS]
+        try:
+            n = 0
+            for chunk in chunks:
+                for f, col in zip(files, chunk.T):
+                    np.ascontiguousarray(col).tofile(f)
+                n += len(chunk)
+        except BaseException:
+            for f in files:
+                f.close()
+            raise
+        return files, n
+
+    files, n = _parse(csv_path, chunksize, write_columns)
+    fd, tmp = _create_temp(directory, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            np.lib.format.write_array_header_1_0(out, {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                "fortran_order": False,
+                "shape": (len(VECTORFIELD_COLUMNS), n),
+            })
+            for f in files:
+                f.seek(0)
+                shutil.copyfileobj(f, out, 16 * 1024**2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        for f in files:
+            f.close()
+
+    stem = os.path.basename(path).rsplit(".", 3)[0]      # strip <key>.cols.npy
+    own = re.compile(re.escape(stem) + r"\.\d+-\d+\.cols\.npy")
+    for old in glob.glob(os.path.join(glob.escape(directory), glob.escape(stem) + ".*.cols.npy")):
+        if old != path and own.fullmatch(os.path.basename(old)):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def _parse(csv_path, chunksize, consume):
+    """consume(chunks) over the parsed (n, 6) row chunks of the text file."""
+    try:
+        return consume(_parse_chunks(csv_path, chunksize, coerce=False))
+    except (ValueError, TypeError):
+        # non-numeric tokens: parse again, coercing them to NaN
+        return consume(_parse_chunks(csv_path, chunksize, coerce=True))
+
+
+def _parse_chunks(csv_path, chunksize, coerce):
+    """Yield float64 (n, 6) chunks without the rows that are not six numbers."""
+    import pandas as pd
+
+    read = dict(sep=r"\s+", header=None, names=list(VECTORFIELD_COLUMNS),
+                comment="#", chunksize=chunksize)
+    if coerce:
+        for c in pd.read_csv(csv_path, **read):
+            yield _finite_rows(c.apply(pd.to_numeric, errors="coerce").to_numpy(np.float64))
+    else:
+        # fast path: C tokenizer straight to float64, no object columns
+        for c in pd.read_csv(csv_path, dtype=np.float64, engine="c", **read):
+            yield _finite_rows(c.to_numpy())
+
+
+def _stack_columns(chunks):
+    """(6, N) array from an iterable of (n, 6) chunks."""
+    chunks = list(chunks)
+    cols = np.empty((len(VECTORFIELD_COLUMNS), sum(len(c) for c in chunks)),
+                    dtype=np.float64)
+    start = 0
+    for c in chunks:
+        cols[:, start:start + len(c)] = c.T
+        start += len(c)
+    return cols
+
+
+def _finite_rows(a):
+    """Rows of `a` without NaN (dropna)."""
+    bad = np.isnan(a).any(axis=1)
+    return a[~bad] if bad.any() else a
+
+
+# ===== OVF =====
+
+class OVFField:
+    """
+    Vector field on the rectangular mesh of an OVF file (see read_ovf).
+
+    Attributes
+    ----------
+    header : dict
+        Header entries of the segment (lower-case keys without blanks,
+        e.g. "xnodes", "xstepsize", "meshunit", "valuedim").
+    values : ndarray
+        Data in file order, shape (znodes, ynodes, xnodes, valuedim); a
+        read-only memory map for binary data.
+    x, y, z : ndarray
+        Cell-center coordinates along each mesh axis (1D).
+
+    Usage
+    -----
+    f = read_ovf("m000010.ovf")
+    quiver3_advanced_panel(fig, f.x, f.y, f.z, f.mx, f.my, f.mz, f.mz,
+                           Cmin=-1, Cmax=1, indexing="ij", ...)
+    plot_vectorfield_panels(fig, *f.arrays(), coord_system="cyl")
+    """
+
+    def __init__(self, header, values, x, y, z):
+        self.header = header
+        self.values = values
+        self.x, self.y, self.z = x, y, z
+
+    @property
+    def shape(self):
+        """(xnodes, ynodes, znodes)."""
+        return (len(self.x), len(self.y), len(self.z))
+
+    def component(self, k):
+        """Component `k` as an (nx, ny, nz) view ("ij" indexing, no copy)."""
+        return self.values[..., k].transpose(2, 1, 0)
+
+    @property
+    def mx(self):
+        return self.component(0)
+
+    @property
+    def my(self):
+        return self.component(1)
+
+    @property
+    def mz(self):
+        return self.component(2)
+
+    def coordinates(self):
+        """
+        X, Y, Z of every cell as (nx, ny, nz) broadcast views of the axes.
+
+        The views have zero strides along the other axes, so they take no
+        memory; element-wise transforms work on them directly and the 3D
+        quiver panels recognise them as a regular grid.
+        """
+        shape = self.shape
+        return (np.broadcast_to(self.x[:, None, None], shape),
+                np.broadcast_to(self.y[None, :, None], shape),
+                np.broadcast_to(self.z[None, None, :], shape))
+
+    def arrays(self):
+        """x, y, z, mx, my, mz for plot_vectorfield_panels (all (nx, ny, nz) views)."""
+        return self.coordinates() + (self.mx, self.my, self.mz)
+
+
+_OVF_CHECK = {4: 1234567.0, 8: 123456789012345.0}
+
+
+def read_ovf(path):
+    """
+    Read the first segment of an OOMMF OVF 2.0 (or 1.0) file.
+
+    Rectangular meshes with "Data Binary 4", "Data Binary 8" or "Data Text"
+    sections are supported. Binary data are memory-mapped, not read; the
+    byte order is taken from the check value in front of the data (OVF 2.0
+    files are little-endian, OVF 1.0 files big-endian). The coordinates
+    follow from xbase/xstepsize/xnodes (and y, z) of the header.
+
+    Parameters
+    ----------
+    path : str
+        .ovf/.omf file, as written e.g. by mumax3 or OOMMF.
+
+    Returns
+    -------
+    OVFField
+    """
+    header = {}
+    with open(path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("No data section in " + str(path))
+            text = line.decode("latin-1").strip()
+            if not text.startswith("#") or text.startswith("##"):
+                continue
+            key, _, value = text.lstrip("#").partition(":")
+            key = key.strip().lower().replace(" ", "")
+            value = value.strip()
+            if key == "begin" and value.lower().startswith("data"):
+                data_format = value.split()[1:]
+                offset = f.tell()
+                break
+            if key not in ("begin", "end"):
+                header[key] = value
+
+        if header.get("meshtype", "rectangular").lower() != "rectangular":
+            raise ValueError("Only rectangular OVF meshes are supported.")
+        n = [int(header[k + "nodes"]) for k in "xyz"]
+        valuedim = int(header.get("valuedim", 3))       # OVF 1.0: always 3
+        shape = (n[2], n[1], n[0], valuedim)
+
+        kind = data_format[0].lower()
+        if kind == "binary":
+            size = int(data_format[1])
+            check = f.read(size)
+            for order in "<>":
+                dtype = np.dtype(order + "f" + str(size))
+                if np.frombuffer(check, dtype=dtype)[0] == _OVF_CHECK[size]:
+                    break
+            else:
+                raise ValueError("Bad binary check value in " + str(path))
+            values = np.memmap(path, dtype=dtype, mode="r",
+                               offset=offset + size, shape=shape)
+        elif kind == "text":
+            block = f.read()
+            end = block.find(b"# End: Data")
+            values = np.loadtxt(io.BytesIO(block[:end if end >= 0 else None]),
+                                dtype=np.float64, comments="#").reshape(shape)
+        else:
+            raise ValueError("Unknown OVF data format: " + " ".join(data_format))
+
+    axes = [float(header.get(k + "base", 0.0))
+            + float(header.get(k + "stepsize", 1.0)) * np.arange(n[i])
+            for i, k in enumerate("xyz")]
+    return OVFField(header, values, *axes)
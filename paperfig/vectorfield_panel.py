@@ -1,7 +1,15 @@
-from .figure import create_paper_figure, add_label_cm
+import copy
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from .figure import create_paper_figure, add_label_cm, figure_options
 from .panel_3d import quiver3_advanced_panel
 from .panel_2d import add_colorbar_cm
-from .panel_1d import plotScatter2D_panel_core
+from .panel_1d import (plotScatter2D_panel_core, plotDensity2D_panel_core,
+                       _marker_bins)
+from .vectorfield_io import load_vectorfield, iter_vectorfield
+from .transforms import _resolve_system
 
 
 def PlotVectorfieldPanel(csv_path, figure_path,
@@ -9,7 +17,11 @@ def PlotVectorfieldPanel(csv_path, figure_path,
                          color_func=None,
                          param_func=None,
                          vector_func=None,
-                         magn_max=1.1):
+                         magn_max=1.1,
+                         plotter_pool=None,
+                         column_cache=True,
+                         chunksize=None,
+                         projection="scatter"):
     """
     Plot a 3D vector field with color-coded magnitude and 1D projection panel.
     Supports automatic coordinate transformation (cartesian, cylindrical,
@@ -22,102 +34,43 @@ def PlotVectorfieldPanel(csv_path, figure_path,
     figure_path : str
         Output figure filename (PNG).
     coord_system : str
-        Coordinate mode: "cart", "cyl", "sph", or "user".
+        Coordinate mode: "cart", "cyl", "sph", a system added with
+        register_coordinate_system, or "user".
     color_func, param_func, vector_func : callable
         Custom mapping functions if coord_system="user".
+    plotter_pool : PlotterPool, optional
+        Reuse off-screen plotters across calls (e.g. in batch workers).
+    column_cache : bool
+        Keep a binary sidecar of the parsed columns next to the CSV file
+        (see load_vectorfield), so re-plotting skips the text parsing.
+    chunksize : int, optional
+        Out-of-core mode for files larger than memory: read the file in
+        chunks of this many rows and apply the mapping functions per
+        chunk (they must be element-wise). Only the arrows kept for panel
+        (a) and the occupied pixels of the projection in panel (b) are
+        retained, so the projection points snap to half-pixel cells.
+    projection : str
+        Panel (b) as "scatter" (one marker per point) or "density" (one
+        count raster per component, see plotDensity2D_panel_core); for
+        millions of points "density" saves and opens much faster.
     """
 
-    import pandas as pd
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib as mpl
-
-    # ==========================================================
-    # === Define built-in coordinate systems ===
-    # ==========================================================
-    def color_function(mx, my, mz):
-        return mz / np.sqrt(mx**2 + my**2 + mz**2)  # default: color by z-component
-
-    # ---------------- Cartesian ----------------
-    def parameter_function_cart(x, y, z):
-        xi = x
-        Label = r"$x$ [nm]"
-        return xi, Label
-
-    def vector_transform_cart(x, y, z, mx, my, mz):
-        return mx, my, mz, r"$m_x$", r"$m_y$", r"$m_z$"
-
-    # ---------------- Cylindrical ----------------
-    def parameter_function_cyl(x, y, z):
-        rho = np.sqrt(x**2 + y**2)
-        Label = r"$\rho$ [nm]"
-        return rho, Label
-
-    def vector_transform_cyl(x, y, z, mx, my, mz):
-        rho = np.sqrt(x**2 + y**2)
-        phi = np.arctan2(y, x)
-        Mrho = mx * np.cos(phi) + my * np.sin(phi)
-        Mphi = my * np.cos(phi) - mx * np.sin(phi)
-        Mz = mz
-        return Mrho, Mphi, Mz, r"$m_{\rho}$", r"$m_{\phi}$", r"$m_z$"
-
-    # ---------------- Spherical ----------------
-    def parameter_function_sph(x, y, z):
-        r = np.sqrt(x**2 + y**2 + z**2)
-        Label = r"$r$ [nm]"
-        return r, Label
-
-    def vector_transform_sph(x, y, z, mx, my, mz):
-        # spherical unit vectors:
-        # r̂ = (sinθ cosφ, sinθ sinφ, cosθ)
-        # θ̂ = (cosθ cosφ, cosθ sinφ, -sinθ)
-        # φ̂ = (-sinφ, cosφ, 0)
-        r = np.sqrt(x**2 + y**2 + z**2)
-        theta = np.arccos(np.clip(z / np.maximum(r, 1e-12), -1, 1))
-        phi = np.arctan2(y, x)
-
-        # Transform:
-        Mr = mx * np.sin(theta) * np.cos(phi) + my * np.sin(theta) * np.sin(phi) + mz * np.cos(theta)
-        Mtheta = mx * np.cos(theta) * np.cos(phi) + my * np.cos(theta) * np.sin(phi) - mz * np.sin(theta)
-        Mphi = -mx * np.sin(phi) + my * np.cos(phi)
-
-        return Mr, Mtheta, Mphi, r"$m_r$", r"$m_{\theta}$", r"$m_{\phi}$"
-
     # ==========================================================
     # === Select coordinate system ===
     # ==========================================================
-    if coord_system == "cart":
-        color_func = color_function
-        param_func = parameter_function_cart
-        vector_func = vector_transform_cart
-    elif coord_system == "cyl":
-        color_func = color_function
-        param_func = parameter_function_cyl
-        vector_func = vector_transform_cyl
-    elif coord_system == "sph":
-        color_func = color_function
-        param_func = parameter_function_sph
-        vector_func = vector_transform_sph
-    elif coord_system == "user":
-        if (color_func is None) or (param_func is None) or (vector_func is None):
-            raise ValueError("For coord_system='user', provide all three mapping functions.")
-    else:
-        raise ValueError("coord_system must be 'cart', 'cyl', 'sph', or 'user'.")
+    system = _resolve_system(coord_system, color_func, param_func, vector_func)
+    if projection not in ("scatter", "density"):
+        raise ValueError("projection must be 'scatter' or 'density'.")
 
     # ==========================================================
     # === Daten einlesen ===
     # ==========================================================
-    cols = ['x', 'y', 'z', 'mx', 'my', 'mz']
-    data = pd.read_csv(csv_path, sep=r"\s+", header=None, names=cols)
-    data = data.apply(pd.to_numeric, errors="coerce").dropna()
-    x, y, z = data['x'].values, data['y'].values, data['z'].values
-    mx, my, mz = data['mx'].values, data['my'].values, data['mz'].values
+    if chunksize is None:
+        x, y, z, mx, my, mz = load_vectorfield(csv_path, cache=column_cache)
 
     # ==========================================================
     # === Color coding & setup ===
     # ==========================================================
-    C = color_func(mx, my, mz)
-
     fig_width_cm = 8.5
     fig_height_cm = 4.25
     y_shift1 = -0.25
@@ -131,21 +84,44 @@ def PlotVectorfieldPanel(csv_path, figure_path,
     axes_yPos2_cm = 1.2 + y_shift1
 
     dpi_figure = 600
+    subsample = 15
+
+    # Panel (a) draws every `subsample`-th row, in memory and out of core
+    if chunksize is None:
+        C = np.asarray(system.color_func(mx, my, mz))
+        arrows = tuple(a[::subsample] for a in (x, y, z, mx, my, mz, C))
+    else:
+        if projection == "density":
+            # cells of one 1-pt marker, as plotDensity2D_panel_core
+            bins = _marker_bins(axes_width2_cm)
+        else:
+            # two cells per pixel of panel (b)
+            bins = 2 * int(np.ceil(axes_width2_cm / 2.54 * dpi_figure))
+        arrows, raster, param_Label, labels = _stream_vectorfield(
+            iter_vectorfield(csv_path, chunksize, cache=column_cache),
+            system, subsample,
+            xbins=2 * bins if projection == "density" else bins,
+            ylim=(-magn_max, magn_max), ybins=bins)
+        if projection == "density":
+            # parameter bins of about one marker over the data range
+            lims = [lim for lim in map(raster.datalim, range(3)) if lim]
+            if lims:
+                span = max(l[1] for l in lims) - min(l[0] for l in lims)
+                raster.coarsen(span / bins)
+
     fig = create_paper_figure(width_cm=fig_width_cm, height_cm=fig_height_cm,
                               dpi=dpi_figure, fontsize=7)
 
-    add_label_cm(fig, r"(a)", axes_xPos1_cm-0.25, axes_yPos2_cm+axes_width2_cm,
-                 fig_width_cm, fig_height_cm)
-    add_label_cm(fig, r"(b)", axes_xPos2_cm-1.1, axes_yPos2_cm+axes_width2_cm,
-                 fig_width_cm, fig_height_cm)
+    add_label_cm(fig, r"(a)", axes_xPos1_cm-0.25, axes_yPos2_cm+axes_width2_cm)
+    add_label_cm(fig, r"(b)", axes_xPos2_cm-1.1, axes_yPos2_cm+axes_width2_cm)
 
     # ==========================================================
     # === Panel (a): 3D Vector Field ===
     # ==========================================================
     ax1, im1 = quiver3_advanced_panel(
-        fig, x, y, z, mx, my, mz, C,
+        fig, *arrows,
         Cmin=-1.0, Cmax=1.0, margin_cm=0.0,
-        scale=0.1, subsample=15, view="custom",
+        scale=0.1, view="custom",
         dpi=800, cmap="rainbow",
         crop_cm=(0.0, 0.0, 0.0, 0.0),
         cam_pos=(3, -3, 2),
@@ -153,48 +129,68 @@ def PlotVectorfieldPanel(csv_path, figure_path,
         up_direction=(0, 0, 1),
         axes_width_cm=axes_width1_cm,
         axes_pos_x_cm=axes_xPos1_cm,
-        axes_pos_y_cm=axes_yPos1_cm
+        axes_pos_y_cm=axes_yPos1_cm,
+        plotter_pool=plotter_pool
     )
 
-    add_label_cm(fig, r"$x$", axes_xPos1_cm+0.5, axes_yPos2_cm-0.3,
-                 fig_width_cm, fig_height_cm)
-    add_label_cm(fig, r"$z$", axes_xPos1_cm+0.025, axes_yPos2_cm+0.7,
-                 fig_width_cm, fig_height_cm)
+    add_label_cm(fig, r"$x$", axes_xPos1_cm+0.5, axes_yPos2_cm-0.3)
+    add_label_cm(fig, r"$z$", axes_xPos1_cm+0.025, axes_yPos2_cm+0.7)
 
     # === Colorbar ===
-    cmap = plt.get_cmap("rainbow")
-    norm = mpl.colors.Normalize(vmin=-1.0, vmax=1.0)
-    sm = mpl.cm.ScalarMappable(norm=norm, cmap=cmap)
-    sm.set_array([])
-    add_colorbar_cm(fig, sm,
+    cbar_opts = copy.copy(figure_options(fig))
+    cbar_opts.fontsize = 4
+    cbar_opts.ticks_fontsize = 4
+    add_colorbar_cm(fig,
                     pos_cm=(0.1, 3.0),
                     size_cm=(0.1, 0.75),
+                    vmin=-1.0, vmax=1.0,
+                    cmap="rainbow",
                     clabel=r"$m_z$",
-                    fontsize=4, ticks_fontsize=4,
-                    orientation="vertical")
+                    orientation="vertical",
+                    options=cbar_opts)
 
     # ==========================================================
     # === Panel (b): Scatter ===
     # ==========================================================
-    parameter_1D, param_Label = param_func(x, y, z)
-    M1, M2, M3, Label1, Label2, Label3 = vector_func(x, y, z, mx, my, mz)
-    datasets = [
-        {"x": parameter_1D, "y": M1, "label": Label1},
-        {"x": parameter_1D, "y": M2, "label": Label2},
-        {"x": parameter_1D, "y": M3, "label": Label3}
-    ]
-
-    ax2 = plotScatter2D_panel_core(
-        fig, datasets,
-        pos_cm=(axes_xPos2_cm, axes_yPos2_cm),
-        size_cm=(axes_width2_cm, axes_width2_cm),
-        xlabel=param_Label,
-        ylabel=None,
-        markersize=1,
-        alpha=1.0,
-        ylim=[-magn_max, magn_max],
-        colors=["#D55E00", "#0072B2", "#009E73"]
-    )
+    if chunksize is None:
+        parameter_1D, M1, M2, M3, param_Label, (Label1, Label2, Label3) = \
+            system.project(x, y, z, mx, my, mz)
+        datasets = [
+            {"x": parameter_1D, "y": M1, "label": Label1},
+            {"x": parameter_1D, "y": M2, "label": Label2},
+            {"x": parameter_1D, "y": M3, "label": Label3}
+        ]
+    elif projection == "density":
+        datasets = [{"counts": raster.counts[k], "extent": raster.extent(),
+                     "datalim": raster.datalim(k), "label": label}
+                    for k, label in enumerate(labels)]
+    else:
+        datasets = []
+        for k, label in enumerate(labels):
+            px, py = raster.points(k)
+            datasets.append({"x": px, "y": py, "label": label})
+
+    if projection == "density":
+        ax2 = plotDensity2D_panel_core(
+            fig, datasets,
+            pos_cm=(axes_xPos2_cm, axes_yPos2_cm),
+            size_cm=(axes_width2_cm, axes_width2_cm),
+            xlabel=param_Label,
+            ylabel=None,
+            alpha=1.0,
+            ylim=[-magn_max, magn_max]
+        )
+    else:
+        ax2 = plotScatter2D_panel_core(
+            fig, datasets,
+            pos_cm=(axes_xPos2_cm, axes_yPos2_cm),
+            size_cm=(axes_width2_cm, axes_width2_cm),
+            xlabel=param_Label,
+            ylabel=None,
+            markersize=1,
+            alpha=1.0,
+            ylim=[-magn_max, magn_max]
+        )
 
     ax2.grid(True, linestyle="-", color="0.8", linewidth=0.1)
     ax2.tick_params(direction="in", width=0.4, length=1.0,
@@ -228,93 +224,31 @@ def plot_vectorfield_panels(
         # --- Panel (b): 1D projection ---
         panelB_pos_cm=(7.0, 0.8),
         panelB_size_cm=(4.0, 3.5),
+        projection="scatter",             # "scatter" or "density"
+        projection_bins=None,
 
 ):
     """
     Attach two vectorfield panels (3D quiver + 1D projection) to an *existing* figure.
     Input data are raw arrays, not a CSV file.
     Panel placement fully controlled by cm-coordinates.
-    """
-
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib as mpl
-
-    # ==========================================================
-    # === Built-in coordinate systems
-    # ==========================================================
 
-    def default_color(mx, my, mz):
-        return mz / np.sqrt(mx**2 + my**2 + mz**2 + 1e-12)
-
-    # ---------------- Cartesian ----------------
-    def parameter_cart(x, y, z):
-        return x, r"$x$ [nm]"
-
-    def vector_cart(x, y, z, mx, my, mz):
-        return mx, my, mz, r"$m_x$", r"$m_y$", r"$m_z$"
-
-    # ---------------- Cylindrical ----------------
-    def parameter_cyl(x, y, z):
-        rho = np.sqrt(x**2 + y**2)
-        return rho, r"$\rho$ [nm]"
-
-    def vector_cyl(x, y, z, mx, my, mz):
-        rho = np.sqrt(x**2 + y**2)
-        phi = np.arctan2(y, x)
-        Mrho = mx * np.cos(phi) + my * np.sin(phi)
-        Mphi = my * np.cos(phi) - mx * np.sin(phi)
-        return Mrho, Mphi, mz, r"$m_{\rho}$", r"$m_{\phi}$", r"$m_z$"
-
-    # ---------------- Spherical ----------------
-    def parameter_sph(x, y, z):
-        r = np.sqrt(x**2 + y**2 + z**2)
-        return r, r"$r$ [nm]"
-
-    def vector_sph(x, y, z, mx, my, mz):
-        r = np.sqrt(x**2 + y**2 + z**2 + 1e-12)
-        theta = np.arccos(np.clip(z / r, -1, 1))
-        phi = np.arctan2(y, x)
-
-        Mr =  (mx * np.sin(theta) * np.cos(phi)
-              + my * np.sin(theta) * np.sin(phi)
-              + mz * np.cos(theta))
-
-        Mtheta = (mx * np.cos(theta) * np.cos(phi)
-                 + my * np.cos(theta) * np.sin(phi)
-                 - mz * np.sin(theta))
-
-        Mphi = -mx * np.sin(phi) + my * np.cos(phi)
-
-        return Mr, Mtheta, Mphi, r"$m_r$", r"$m_\theta$", r"$m_\phi$"
+    projection="density" draws panel (b) as one count raster per component
+    (plotDensity2D_panel_core, `projection_bins` bins) instead of one
+    marker per point, so its cost depends on the pixels, not the points.
+    """
 
     # ==========================================================
-    # === Select coordinate mode
+    # === Select coordinate system
     # ==========================================================
 
-    if coord_system == "cart":
-        color_func = default_color
-        param_func = parameter_cart
-        vector_func = vector_cart
-    elif coord_system == "cyl":
-        color_func = default_color
-        param_func = parameter_cyl
-        vector_func = vector_cyl
-    elif coord_system == "sph":
-        color_func = default_color
-        param_func = parameter_sph
-        vector_func = vector_sph
-    elif coord_system == "user":
-        if color_func is None or param_func is None or vector_func is None:
-            raise ValueError("For user mode, supply color_func, param_func, vector_func.")
-    else:
-        raise ValueError("coord_system must be 'cart', 'cyl', 'sph', or 'user'.")
+    system = _resolve_system(coord_system, color_func, param_func, vector_func)
 
     # ==========================================================
     # === Color coding ===
     # ==========================================================
 
-    C = color_func(mx, my, mz)
+    C = system.color_func(mx, my, mz)
 
     # ==========================================================
     # === Panel (a): 3D vector field ===
@@ -335,12 +269,6 @@ def plot_vectorfield_panels(
     # === Colorbar ===
     # ==========================================================
 
-    sm = mpl.cm.ScalarMappable(
-        norm=mpl.colors.Normalize(vmin=-1.0, vmax=1.0),
-        cmap=cmap
-    )
-    sm.set_array([])
-
     add_colorbar_cm(
         fig,
         pos_cm=colorbar_pos_cm,
@@ -355,8 +283,8 @@ def plot_vectorfield_panels(
     # === Panel (b): 1D projection ===
     # ==========================================================
 
-    param_vals, xlabel = param_func(x, y, z)
-    M1, M2, M3, L1, L2, L3 = vector_func(x, y, z, mx, my, mz)
+    param_vals, M1, M2, M3, xlabel, (L1, L2, L3) = system.project(
+        x, y, z, mx, my, mz)
 
     datasets = [
         {"x": param_vals, "y": M1, "label": L1},
@@ -364,18 +292,174 @@ def plot_vectorfield_panels(
         {"x": param_vals, "y": M3, "label": L3},
     ]
 
-    axB = plotScatter2D_panel_core(
-        fig, datasets,
-        pos_cm=panelB_pos_cm,
-        size_cm=panelB_size_cm,
-        xlabel=xlabel,
-        ylabel=None,
-        ylim=[-magn_max, magn_max],
-        markersize=1.0
-    )
+    if projection == "density":
+        axB = plotDensity2D_panel_core(
+            fig, datasets,
+            pos_cm=panelB_pos_cm,
+            size_cm=panelB_size_cm,
+            xlabel=xlabel,
+            ylabel=None,
+            ylim=[-magn_max, magn_max],
+            bins=projection_bins
+        )
+    elif projection == "scatter":
+        axB = plotScatter2D_panel_core(
+            fig, datasets,
+            pos_cm=panelB_pos_cm,
+            size_cm=panelB_size_cm,
+            xlabel=xlabel,
+            ylabel=None,
+            ylim=[-magn_max, magn_max],
+            markersize=1.0
+        )
+    else:
+        raise ValueError("projection must be 'scatter' or 'density'.")
 
     axB.grid(True, linestyle="-", color="0.8", linewidth=0.1)
     axB.tick_params(direction="in", width=0.4, length=1.0, top=True, right=True)
 
     return axA, axB
 
+
+# ===== Out-of-core mode =====
+
+class _ProjectionRaster:
+    """
+    Occupancy counts of (parameter, component) pairs on a fixed-size grid,
+    accumulated chunk by chunk. The component axis spans the fixed ylim;
+    the parameter axis starts at the range of the first chunk and widens
+    by power-of-two bin merges when later chunks fall outside it, so the
+    memory stays that of the grid. The exact data limits of the counted
+    pairs are kept as well (see datalim).
+    """
+
+    def __init__(self, n_components, xbins, ylim, ybins):
+        self.xbins = xbins + xbins % 2
+        self.ybins = ybins
+        self.ylim = (float(ylim[0]), float(ylim[1]))
+        self.counts = np.zeros((n_components, self.xbins, ybins), dtype=np.int64)
+        self.lo = None          # left edge of the parameter grid
+        self.width = None       # parameter bin width
+        # (x0, x1, y0, y1) of the counted pairs, per component
+        self._datalim = np.tile([np.inf, -np.inf, np.inf, -np.inf],
+                                (n_components, 1))
+
+    def add(self, p, components):
+        p = np.asarray(p, dtype=np.float64)
+        finite = np.isfinite(p)
+        if not finite.any():
+            return
+        self._cover(p[finite].min(), p[finite].max())
+
+        ix = np.floor((p - self.lo) / self.width)
+        y0, y1 = self.ylim
+        for k, v in enumerate(components):
+            iy = np.floor((np.asarray(v, dtype=np.float64) - y0)
+                          * (self.ybins / (y1 - y0)))
+            # outside ylim is outside the axes anyway
+            ok = finite & (iy >= 0) & (iy < self.ybins)
+            if ok.any():
+                lim = self._datalim[k]
+                lim[[0, 2]] = np.minimum(lim[[0, 2]], (p[ok].min(), v[ok].min()))
+                lim[[1, 3]] = np.maximum(lim[[1, 3]], (p[ok].max(), v[ok].max()))
+            flat = (np.clip(ix[ok], 0, self.xbins - 1).astype(np.intp) * self.ybins
+                    + iy[ok].astype(np.intp))
+            self.counts[k] += np.bincount(
+                flat, minlength=self.counts[k].size).reshape(self.counts[k].shape)
+
+    def _cover(self, pmin, pmax):
+        """Widen the parameter grid until it covers [pmin, pmax]."""
+        if self.lo is None:
+            span = (pmax - pmin) or (abs(pmin) or 1.0) * 1e-9
+            self.lo, self.width = pmin, span / (self.xbins - 1)
+            return
+        hi = self.lo + self.xbins * self.width
+        if pmin >= self.lo and pmax < hi:
+            return
+        # Whole old bins per new bin (the new edges are old edges); the old
+        # range goes to the far end of the growth side, so data arriving
+        # in order widen the grid only log2(span) times.
+        down, up = pmin < self.lo, pmax >= hi
+        pmin, pmax = min(pmin, self.lo), max(pmax, hi)
+        factor = 2
+        while factor * self.xbins * self.width < pmax - pmin + self.width:
+            factor *= 2
+        if not down:
+            j = 0
+        elif not up:
+            j = (factor - 1) * self.xbins
+        else:
+            j = int(np.ceil((self.lo - pmin) / self.width))
+        lo = self.lo - j * self.width
+        idx = (j + np.arange(self.xbins)) // factor
+        counts = np.zeros_like(self.counts)
+        np.add.at(counts, (slice(None), np.minimum(idx, self.xbins - 1)), self.counts)
+        self.counts, self.lo, self.width = counts, lo, self.width * factor
+
+    def extent(self):
+        """(x0, x1, y0, y1) of the grid."""
+        return (self.lo, self.lo + self.xbins * self.width) + self.ylim
+
+    def coarsen(self, width):
+        """
+        Merge pairs of parameter bins while the merged bins stay below 1.5
+        `width` (the widening can leave bins of any power-of-two size).
+        """
+        while self.xbins % 2 == 0 and self.xbins > 2 and 2 * self.width < 1.5 * width:
+            self.xbins //= 2
+            self.width *= 2
+            self.counts = self.counts.reshape(
+                len(self.counts), self.xbins, 2, self.ybins).sum(axis=2)
+
+    def datalim(self, k):
+        """(x0, x1, y0, y1) of the pairs counted for component `k`, or None."""
+        lim = self._datalim[k]
+        return tuple(float(v) for v in lim) if lim[0] <= lim[1] else None
+
+    def points(self, k):
+        """Centers of the occupied cells of component `k`."""
+        ix, iy = np.nonzero(self.counts[k])
+        y0, y1 = self.ylim
+        return (self.lo + (ix + 0.5) * self.width,
+                y0 + (iy + 0.5) * ((y1 - y0) / self.ybins))
+
+
+def _stream_vectorfield(chunks, system, subsample, xbins, ylim, ybins):
+    """
+    Reduce a chunked vector field (see iter_vectorfield) for
+    PlotVectorfieldPanel: the arrows of every `subsample`-th row and the
+    occupied cells of the 1D projection. The CoordinateSystem `system` is
+    applied per chunk, into float32 buffers reused between chunks.
+
+    Returns
+    -------
+    arrows : tuple of ndarray
+        x, y, z, mx, my, mz, C of the kept rows.
+    raster : _ProjectionRaster
+    param_label : str
+    labels : tuple of str
+    """
+    kept = []
+    raster = None
+    buffers = np.empty((4, 0), dtype=np.float32)
+    offset = 0
+    for x, y, z, mx, my, mz in chunks:
+        n = len(x)
+        start = -offset % subsample
+        offset += n
+        keep = slice(start, None, subsample)
+        arrows = [np.array(a[keep]) for a in (x, y, z, mx, my, mz)]
+        kept.append(arrows + [np.asarray(system.color_func(*arrows[3:]))])
+
+        if buffers.shape[1] < n:
+            buffers = np.empty((4, n), dtype=np.float32)
+        p, M1, M2, M3, param_label, labels = system.project(
+            x, y, z, mx, my, mz, out=buffers[:, :n])
+        if raster is None:
+            raster = _ProjectionRaster(3, xbins, ylim, ybins)
+        raster.add(p, (M1, M2, M3))
+
+    if raster is None:
+        raise ValueError("No vector-field data found.")
+    arrows = tuple(np.concatenate(cols) for cols in zip(*kept))
+    return arrows, raster, param_label, labels
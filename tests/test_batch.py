@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from paperfig.batch import _write_atomic
+
+
+def _write(data):
+    def write(path):
+        with open(path, "wb") as f:
+            f.write(data)
+    return write
+
+
+def test_write_atomic_replaces_output(tmp_path):
+    path = tmp_path / "out" / "fig.png"
+    _write_atomic(str(path), _write(b"new"))
+    assert path.read_bytes() == b"new"
+    assert os.listdir(path.parent) == ["fig.png"]      # temp directory removed
+
+
+def test_write_atomic_mode_follows_umask(tmp_path):
+    path = tmp_path / "fig.png"
+    _write_atomic(str(path), _write(b"data"))
+    reference = tmp_path / "reference"
+    reference.write_bytes(b"")
+    assert path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+
+
+@pytest.mark.parametrize("write, error", [
+    (_write(b""), RuntimeError),                        # empty output
+    (lambda path: None, RuntimeError),                  # no output at all
+    (lambda path: 1 / 0, ZeroDivisionError),            # failed job
+])
+def test_failed_job_keeps_old_output(tmp_path, write, error):
+    path = tmp_path / "fig.png"
+    path.write_bytes(b"old")
+    with pytest.raises(error):
+        _write_atomic(str(path), write)
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["fig.png"]
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import paperfig as pf
+
+
+def test_import_loads_no_heavy_modules():
+    result = pf.benchmark_import(repeat=1)
+    assert result["heavy_modules"] == []
+    assert result["time_s"] > 0
+
+
+def test_lazy_attributes_resolve():
+    pytest.importorskip("pyvista")
+    script = ("import sys, paperfig; paperfig.quiver3_advanced_panel; "
+              "print('pyvista' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                         text=True, check=True, cwd=os.path.dirname(pf.__path__[0]))
+    assert out.stdout.split()[-1] == "True"
+
+
+def test_budget_raises_for_heavy_modules():
+    pytest.importorskip("pyvista")
+    with pytest.raises(RuntimeError, match="loads"):
+        pf.benchmark_import("paperfig.panel_3d", repeat=1, budget_s=60.0)
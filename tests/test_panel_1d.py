@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import paperfig as pf
+from paperfig.panel_1d import _marker_bins
+
+PANEL = dict(pos_cm=(1, 1), size_cm=(3, 3), xlabel="x", ylabel=None)
+
+
+@pytest.fixture
+def datasets():
+    rng = np.random.default_rng(0)
+    # the datasets cover different x ranges
+    return [{"x": rng.uniform(lo, hi, 500), "y": rng.normal(size=500)}
+            for lo, hi in ((-4.0, 1.0), (0.0, 9.0), (2.0, 3.0))]
+
+
+def figure():
+    return pf.create_paper_figure(6, 6, use_latex=False, isolated=True)
+
+
+def test_density_limits_match_scatter(datasets):
+    scatter = pf.plotScatter2D_panel_core(figure(), datasets, **PANEL)
+    density = pf.plotDensity2D_panel_core(figure(), datasets, **PANEL)
+    np.testing.assert_allclose(density.get_xlim(), scatter.get_xlim())
+    np.testing.assert_allclose(density.get_ylim(), scatter.get_ylim())
+
+
+def test_density_limits_of_count_rasters(datasets):
+    # rasters on a wider grid than the data: the data limits decide
+    reference = pf.plotDensity2D_panel_core(figure(), datasets, **PANEL)
+    rasters = []
+    for d in datasets:
+        counts, xe, ye = np.histogram2d(d["x"], d["y"], bins=40,
+                                        range=((-10, 10), (-5, 5)))
+        datalim = (d["x"].min(), d["x"].max(), d["y"].min(), d["y"].max())
+        rasters.append({"counts": counts, "extent": (-10, 10, -5, 5),
+                        "datalim": datalim})
+    ax = pf.plotDensity2D_panel_core(figure(), rasters, **PANEL)
+    np.testing.assert_allclose(ax.get_xlim(), reference.get_xlim())
+    np.testing.assert_allclose(ax.get_ylim(), reference.get_ylim())
+
+    # without datalim: the occupied cells, rounded out to the cell edges
+    for r in rasters:
+        del r["datalim"]
+    ax = pf.plotDensity2D_panel_core(figure(), rasters, **PANEL)
+    x0, x1 = ax.get_xlim()
+    assert x0 <= reference.get_xlim()[0] and x1 >= reference.get_xlim()[1]
+    assert x1 - x0 < reference.get_xlim()[1] - reference.get_xlim()[0] + 2 * 0.5
+
+
+def test_explicit_limits(datasets):
+    ax = pf.plotDensity2D_panel_core(figure(), datasets, xlim=(-1, 1),
+                                     ylim=(-2, 2), **PANEL)
+    assert ax.get_xlim() == (-1, 1) and ax.get_ylim() == (-2, 2)
+
+
+def test_marker_bins():
+    # 1 pt markers: one cell per pt of the panel
+    assert _marker_bins(2.54) == 72
+    assert _marker_bins(2.54, markersize=4.0) == 36
@@ -0,0 +1,210 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import paperfig as pf
+
+pytest.importorskip("pyvista")
+
+from paperfig import panel_3d
+
+PANEL = dict(Cmin=-1.0, Cmax=1.0, scale=0.3, axes_width_cm=2, dpi=100,
+             axes_pos_x_cm=0, axes_pos_y_cm=0, view="custom", cam_pos=(3, -3, 2))
+
+
+@pytest.fixture(scope="module")
+def grid():
+    x = np.linspace(-1, 1, 4)
+    y = np.linspace(-1, 1, 3)
+    z = np.linspace(0, 1, 3)
+    X, Y, Z = np.meshgrid(x, y, z)
+    return (x, y, z), (X, Y, Z, -Y, X, np.full_like(X, 0.3), Z)
+
+
+@pytest.fixture(scope="module")
+def flat(grid):
+    return [a.ravel() for a in grid[1]]
+
+
+def render(*arrays, **kwargs):
+    fig = pf.create_paper_figure(use_latex=False, isolated=True)
+    return pf.quiver3_advanced_panel(fig, *arrays, **dict(PANEL, **kwargs))[1].astype(float)
+
+
+def test_glyph_engine_matches_template(flat):
+    reference = render(*flat, resolution=20)
+    img = render(*flat, engine="glyph", resolution=20)
+    assert img.shape == reference.shape
+    # mean difference in 8-bit levels (VTK's glyph normals differ slightly)
+    assert np.abs(img - reference).mean() < 0.1
+
+
+def test_loop_engine_matches_template(flat):
+    reference = render(*flat, resolution=None)
+    img = render(*flat, engine="loop", resolution=None)
+    assert img.shape == reference.shape
+    # mean difference in 8-bit levels (tessellation and shading differ slightly)
+    assert np.abs(img - reference).mean() < 1.0
+
+
+@pytest.mark.parametrize("centering", [True, False])
+def test_quiver3_advanced_engines_share_centering(monkeypatch, flat, centering):
+    import pyvista as pv
+    meshes = {}
+
+    class Recorder(pv.Plotter):
+        def __init__(self, **kwargs):
+            super().__init__(off_screen=True, **kwargs)
+
+        def add_mesh(self, mesh, **kwargs):
+            meshes.setdefault(engine, []).append(mesh)
+            return super().add_mesh(mesh, **kwargs)
+
+        def show(self, *args, **kwargs):
+            self.close()
+
+    monkeypatch.setattr(panel_3d.pv, "Plotter", Recorder)
+    for engine in ("template", "loop"):
+        panel_3d.quiver3_advanced(*flat, scale=0.3, engine=engine,
+                                  centering=centering)
+    loop = pv.merge(meshes["loop"])
+    np.testing.assert_allclose(loop.bounds, meshes["template"][0].bounds,
+                               atol=1e-3)
+
+
+@pytest.mark.parametrize("antialiasing, tolerance", [
+    ("none", 0.1),
+    (2, 0.1),
+    # VTK's SSAA samples are not pixel-aligned, so they shift with the tile
+    # offset; a misplaced tile (one pixel) would differ by about 8 levels
+    ("ssaa", 4.0),
+])
+def test_tiled_render_matches_direct(flat, antialiasing, tolerance):
+    reference = render(*flat, dpi=200, antialiasing=antialiasing)
+    img = render(*flat, dpi=200, antialiasing=antialiasing, tile_px=80)
+    assert img.shape == reference.shape
+    assert np.abs(img - reference).mean() < tolerance
+
+
+def test_tiled_render_into_memmap(tmp_path, flat):
+    reference = render(*flat, dpi=200, antialiasing="none")
+    out = tmp_path / "panel.npy"
+    img = render(*flat, dpi=200, antialiasing="none", tile_px=80, tile_out=str(out))
+    np.testing.assert_array_equal(np.load(out), img)
+    assert np.abs(img - reference).mean() < 0.1
+
+
+def test_frustum_cull_is_pixel_identical(monkeypatch):
+    x = np.linspace(-1, 1, 8)
+    X, Y, Z = np.meshgrid(x, x, x)
+    arrays = [a.ravel() for a in (X, Y, Z, -Y, X, np.full_like(X, 0.3), Z)]
+    crop = dict(crop_cm=(0.6, 0.6, 0.6, 0.6), scale=0.15)
+    reference = render(*arrays, **crop)
+
+    drawn = []
+    add_quiver_arrows = panel_3d._add_quiver_arrows
+
+    def count(plotter, coords, *args, **kwargs):
+        drawn.append(len(coords))
+        return add_quiver_arrows(plotter, coords, *args, **kwargs)
+
+    monkeypatch.setattr(panel_3d, "_add_quiver_arrows", count)
+    np.testing.assert_array_equal(render(*arrays, cull="frustum", **crop), reference)
+    assert sum(drawn) < len(arrays[0])
+
+
+def test_animation_frames_match_panel(flat):
+    from paperfig.animation import QuiverAnimation
+
+    x, y, z = flat[:3]
+    frames = [(np.cos(a) * -y + np.sin(a) * z, x, np.sin(a + z), np.cos(a + x))
+              for a in (0.0, 0.6, 1.2)]
+    panel = {k: v for k, v in PANEL.items() if not k.startswith("axes_pos")}
+    with QuiverAnimation(x, y, z, **dict(panel, view="iso")) as anim:
+        images = list(anim.frames(frames))
+    for img, frame in zip(images, frames):
+        np.testing.assert_array_equal(img, render(x, y, z, *frame, view="iso"))
+
+
+@pytest.mark.parametrize("antialiasing", [2, "bogus"])
+def test_quiver3_advanced_validates_before_plotter(monkeypatch, flat, antialiasing):
+    def no_plotter(*args, **kwargs):
+        raise AssertionError("plotter created before validation")
+
+    monkeypatch.setattr(panel_3d.pv, "Plotter", no_plotter)
+    with pytest.raises(ValueError):
+        panel_3d.quiver3_advanced(*flat, antialiasing=antialiasing)
+
+
+def test_grid_input_matches_flattened(grid, flat):
+    (x, y, z), (X, Y, Z, *fields) = grid
+    reference = render(*flat)
+    np.testing.assert_array_equal(render(X, Y, Z, *fields), reference)
+    np.testing.assert_array_equal(render(x, y, z, *fields), reference)
+
+
+@pytest.mark.parametrize("subsample", [8, 15, 27])
+def test_grid_subsample_keeps_the_arrow_budget(subsample):
+    axes = [np.linspace(-1, 1, 30)] * 3
+    fields = [np.ones((30, 30, 30))] * 4
+    coords = panel_3d._prepare_grid_quiver(axes, fields, subsample)[0]
+    # one stride of about subsample**(1/3) per axis
+    assert 0.5 < len(coords) / (30**3 / subsample) < 2.0
+
+
+# ===== Memory =====
+
+N_MEMORY = 200_000
+
+
+class _Plotter:
+    """Stand-in plotter that keeps the mesh instead of rendering it."""
+
+    def add_mesh(self, mesh, **kwargs):
+        self.mesh = mesh
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(0)
+    return [rng.random(N_MEMORY) for _ in range(7)]
+
+
+def _traced(func, *args):
+    """Result of func(*args) and NumPy bytes per arrow (retained, peak)."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, (current - base) / N_MEMORY, (peak - base) / N_MEMORY
+
+
+def test_prepare_quiver_float32_buffers(inputs):
+    (coords, H, C), retained, peak = _traced(panel_3d._prepare_quiver, *inputs)
+    assert coords.dtype == H.dtype == np.float32
+    assert coords.flags.c_contiguous and H.flags.c_contiguous
+    # coords and H (12 bytes per arrow each) plus one float32 column of
+    # temporaries; a float64 (N, 3) copy would add 24 bytes per arrow
+    assert retained <= 24 + 1
+    assert peak <= 32 + 1
+
+
+@pytest.mark.parametrize("mode, bound", [
+    ("points", 8),      # only the scalars are copied, the points are shared
+    ("lines", 64),      # float32 ends, int64 cells and doubled scalars
+])
+def test_arrow_primitives_memory(inputs, mode, bound):
+    coords, H, C = panel_3d._prepare_quiver(*inputs)
+    plotter = _Plotter()
+    _, _, peak = _traced(
+        panel_3d._add_arrow_primitives, plotter, mode, coords, H, C,
+        0.1, True, "viridis", [0.0, 1.0], 100.0
+    )
+    assert peak <= bound + 1
+    if mode == "points":
+        assert np.shares_memory(plotter.mesh.points, coords)
+
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import paperfig as pf
+
+pv = pytest.importorskip("pyvista")
+
+from paperfig.plotter_pool import PlotterPool
+
+
+def test_released_plotter_is_reused_and_reset():
+    with PlotterPool() as pool:
+        plotter = pool.acquire((64, 48))
+        plotter.add_mesh(pv.Sphere())
+        plotter.camera.position = (5.0, 1.0, 2.0)
+        pool.release(plotter)
+
+        again = pool.acquire((64, 48))
+        assert again is plotter
+        assert not again.renderer.actors
+        assert not again.renderer.camera_set
+        assert again.renderer.GetActiveCamera().GetPosition() != (5.0, 1.0, 2.0)
+        assert len(pool) == 1
+
+
+def test_keys_and_max_idle():
+    with PlotterPool(max_idle=1) as pool:
+        a = pool.acquire((64, 48))
+        b = pool.acquire((64, 48), antialiasing="none")
+        c = pool.acquire((64, 48))
+        assert len({id(a), id(b), id(c)}) == 3
+        for plotter in (a, b, c):
+            pool.release(plotter)
+        # one idle plotter per key, the third one is closed
+        assert len(pool) == 2
+        assert c.render_window is None
+        assert pool.acquire((64, 48)) is a
+        assert pool.acquire((64, 48), antialiasing="none") is b
+    assert len(pool) == 0
+    assert a.render_window is None and b.render_window is None
+
+
+def test_pooled_panels_match_unpooled():
+    x, y, z = (np.linspace(-1, 1, 3) for _ in range(3))
+    X, Y, Z = np.meshgrid(x, y, z)
+    arrays = [a.ravel() for a in (X, Y, Z, -Y, X, np.full_like(X, 0.3), Z)]
+    panel = dict(Cmin=-1.0, Cmax=1.0, scale=0.3, axes_width_cm=2, dpi=100,
+                 axes_pos_x_cm=0, axes_pos_y_cm=0)
+
+    def render(**kwargs):
+        fig = pf.create_paper_figure(use_latex=False, isolated=True)
+        return pf.quiver3_advanced_panel(fig, *arrays, **panel, **kwargs)[1]
+
+    reference = [render(view=view) for view in ("iso", "xy")]
+    with PlotterPool() as pool:
+        # the second "iso" panel runs on the plotter released by the "xy" one
+        for view, ref in zip(("iso", "xy", "iso"), reference + reference[:1]):
+            np.testing.assert_array_equal(render(view=view, plotter_pool=pool), ref)
+        assert len(pool) == 1
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import paperfig as pf
+from paperfig.panel_1d import _histogram2d_counts
+from paperfig.vectorfield_panel import _ProjectionRaster, _stream_vectorfield
+
+XBINS, YBINS, YLIM = 8, 8, (-1.0, 1.0)
+
+
+def _chunk(rng, lo, hi, n=400):
+    """Parameter values on half-integers of [lo, hi] plus both ends, and
+    components on the centers of the YBINS cells (no value on a bin edge)."""
+    p = np.concatenate([[lo, hi], rng.integers(lo, hi, n) + 0.5])
+    cell = (YLIM[1] - YLIM[0]) / YBINS
+    v = YLIM[0] + (rng.integers(0, YBINS, (3, len(p))) + 0.5) * cell
+    return p, v
+
+
+def _reference(raster, p, v):
+    x0, x1, y0, y1 = raster.extent()
+    xedges = np.linspace(x0, x1, raster.xbins + 1)
+    yedges = np.linspace(y0, y1, raster.ybins + 1)
+    return [np.histogram2d(p, c, bins=(xedges, yedges))[0] for c in v]
+
+
+def test_single_chunk_matches_histogram2d():
+    rng = np.random.default_rng(0)
+    p, v = _chunk(rng, 0, 7)
+    raster = _ProjectionRaster(3, XBINS, YLIM, YBINS)
+    raster.add(p, v)
+    assert raster.extent() == (0.0, 8.0) + YLIM
+    for got, ref in zip(raster.counts, _reference(raster, p, v)):
+        np.testing.assert_array_equal(got, ref)
+
+
+@pytest.mark.parametrize("ranges", [
+    [(0, 7), (7, 20)],                  # growing upwards
+    [(0, 7), (-30, 0)],                 # growing downwards
+    [(0, 7), (-10, 40), (3, 5)],        # both sides at once
+])
+def test_widening_matches_histogram2d(ranges):
+    rng = np.random.default_rng(1)
+    raster = _ProjectionRaster(3, XBINS, YLIM, YBINS)
+    ps, vs = [], []
+    for lo, hi in ranges:
+        p, v = _chunk(rng, lo, hi)
+        raster.add(p, v)
+        ps.append(p)
+        vs.append(v)
+    p, v = np.concatenate(ps), np.concatenate(vs, axis=1)
+
+    x0, x1 = raster.extent()[:2]
+    assert x0 <= p.min() and p.max() < x1
+    assert raster.counts.shape == (3, XBINS, YBINS)
+    for got, ref in zip(raster.counts, _reference(raster, p, v)):
+        np.testing.assert_array_equal(got, ref)
+
+
+def test_coarsen_merges_bin_pairs():
+    rng = np.random.default_rng(4)
+    p, v = _chunk(rng, 0, 15)
+    raster = _ProjectionRaster(3, 16, YLIM, YBINS)
+    raster.add(p, v)
+    total = raster.counts.sum()
+    raster.coarsen(2.5)     # bins of 1 -> 2; 4 would exceed 1.5 * 2.5
+    assert (raster.xbins, raster.width) == (8, 2.0)
+    assert raster.counts.sum() == total
+    for got, ref in zip(raster.counts, _reference(raster, p, v)):
+        np.testing.assert_array_equal(got, ref)
+    assert raster.datalim(0)[:2] == (0.0, 15.0)
+
+
+def test_points_are_occupied_cell_centers():
+    raster = _ProjectionRaster(1, XBINS, YLIM, YBINS)
+    raster.add(np.array([0.0, 7.0]), [np.array([-0.9, 0.9])])
+    px, py = raster.points(0)
+    np.testing.assert_allclose(px, [0.5, 7.5])
+    np.testing.assert_allclose(py, [-0.875, 0.875])
+
+
+def test_stream_vectorfield():
+    rng = np.random.default_rng(2)
+    data = rng.normal(size=(6, 1000))
+    chunks = [tuple(data[:, i:i + 97]) for i in range(0, 1000, 97)]
+    arrows, raster, param_label, labels = _stream_vectorfield(
+        chunks, pf.coordinate_system("cart"), 15, 64, (-3.0, 3.0), 64)
+
+    # the rows a stride of 15 over the whole file keeps
+    for got, ref in zip(arrows[:6], data[:, ::15]):
+        np.testing.assert_array_equal(got, ref)
+    assert (param_label, labels) == (r"$x$ [nm]", (r"$m_x$", r"$m_y$", r"$m_z$"))
+    inside = [np.count_nonzero(np.abs(m.astype(np.float32)) < 3.0) for m in data[3:]]
+    assert [int(c.sum()) for c in raster.counts] == inside
+
+
+def test_histogram2d_counts():
+    rng = np.random.default_rng(3)
+    x, y = rng.uniform(-1, 2, (2, 5000))
+    # right edges belong to the last bin
+    x[:3] = 1.0
+    y[:3] = 1.0
+    got = _histogram2d_counts(x, y, (17, 9), (-0.5, 1.0), (0.0, 1.0))
+    ref = np.histogram2d(x, y, bins=(17, 9), range=((-0.5, 1.0), (0.0, 1.0)))[0]
+    np.testing.assert_array_equal(got, ref)
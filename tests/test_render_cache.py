@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+
+import paperfig as pf
+from paperfig.render_cache import RenderCache
+
+
+@pytest.fixture
+def arrays():
+    rng = np.random.default_rng(0)
+    return [rng.random(20) for _ in range(7)]
+
+
+def test_key_stability_and_sensitivity(tmp_path, arrays):
+    cache = RenderCache(str(tmp_path))
+    params = dict(view="iso", dpi=300, cmap="viridis")
+    key = cache.key(arrays, params)
+    assert cache.key([a.copy() for a in arrays], dict(reversed(params.items()))) == key
+    assert cache.key(arrays, dict(params, dpi=301)) != key
+    assert cache.key(arrays, dict(params, cmap="magma")) != key
+
+    changed = [a.copy() for a in arrays]
+    changed[3][7] += 1e-12
+    assert cache.key(changed, params) != key
+    # same bytes, different dtype or shape
+    assert cache.key([a.astype(np.float32) for a in arrays], params) != key
+    assert cache.key([a.reshape(4, 5) for a in arrays], params) != key
+
+
+def test_put_get_and_invalidate(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    img = np.arange(24, dtype=np.uint8).reshape(2, 4, 3)
+    assert cache.get("a") is None
+    cache.put("a", img)
+    cache.put("b", img + 1)
+    assert "a" in cache
+    np.testing.assert_array_equal(cache.get("a"), img)
+
+    cache.invalidate("a")
+    assert "a" not in cache and "b" in cache
+    cache.invalidate("missing")
+    cache.invalidate()
+    assert cache.size() == 0 and os.listdir(tmp_path) == []
+
+
+def test_lru_eviction(tmp_path):
+    img = np.zeros((32, 32, 3), dtype=np.uint8)
+    entry = RenderCache(str(tmp_path / "probe"))
+    entry.put("probe", img)
+    size = entry.size()
+
+    cache = RenderCache(str(tmp_path / "cache"), max_bytes=3 * size)
+    for i, key in enumerate("abc"):
+        cache.put(key, img)
+        os.utime(cache.path(key), (i, i))
+    cache.get("a")                      # a hit makes "a" the most recent entry
+    cache.put("d", img)
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.size() <= cache.max_bytes
+
+
+def test_entry_mode_follows_umask(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    cache.put("a", np.zeros(3))
+    reference = tmp_path / "reference"
+    reference.write_bytes(b"")
+    assert os.stat(cache.path("a")).st_mode & 0o777 == reference.stat().st_mode & 0o777
+
+
+def test_hit_skips_render(monkeypatch, tmp_path):
+    pytest.importorskip("pyvista")
+    from paperfig import panel_3d
+
+    x = np.linspace(-1, 1, 8)
+    arrays = (x, x[::-1], x**2, -x, np.ones_like(x), x, x)
+    panel = dict(Cmin=-1.0, Cmax=1.0, scale=0.3, axes_width_cm=2, dpi=100,
+                 axes_pos_x_cm=0, axes_pos_y_cm=0,
+                 render_cache=RenderCache(str(tmp_path)))
+
+    def render():
+        fig = pf.create_paper_figure(use_latex=False, isolated=True)
+        return pf.quiver3_advanced_panel(fig, *arrays, **panel)[1]
+
+    first = render()
+
+    def no_render(*args, **kwargs):
+        raise AssertionError("cache hit rendered with VTK")
+
+    monkeypatch.setattr(panel_3d, "_render_quiver", no_render)
+    np.testing.assert_array_equal(render(), first)
+    with pytest.raises(AssertionError, match="rendered with VTK"):
+        render_kw = dict(panel, dpi=101)
+        fig = pf.create_paper_figure(use_latex=False, isolated=True)
+        pf.quiver3_advanced_panel(fig, *arrays, **render_kw)
+
+
+def test_mesh_cache_roundtrip_and_reuse(monkeypatch, tmp_path):
+    pv = pytest.importorskip("pyvista")
+    from paperfig import panel_3d
+    from paperfig.render_cache import MeshCache
+
+    cache = MeshCache(str(tmp_path))
+    mesh = pv.Sphere()
+    mesh["C"] = np.arange(mesh.n_points, dtype=float)
+    cache.put("sphere", mesh)
+    stored = cache.get("sphere")
+    np.testing.assert_array_equal(stored.points, mesh.points)
+    np.testing.assert_array_equal(stored["C"], mesh["C"])
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]
+    cache.invalidate()
+    assert cache.get("sphere") is None
+
+    x = np.linspace(-1, 1, 8)
+    arrays = (x, x[::-1], x**2, -x, np.ones_like(x), x, x)
+    panel = dict(Cmin=-1.0, Cmax=1.0, scale=0.3, axes_width_cm=2, dpi=100,
+                 axes_pos_x_cm=0, axes_pos_y_cm=0, resolution=12,
+                 mesh_cache=cache)
+
+    def render(**kwargs):
+        fig = pf.create_paper_figure(use_latex=False, isolated=True)
+        return pf.quiver3_advanced_panel(fig, *arrays, **dict(panel, **kwargs))[1]
+
+    first = render()
+    assert len(os.listdir(tmp_path)) == 1
+
+    def no_build(*args, **kwargs):
+        raise AssertionError("arrows rebuilt despite a cached mesh")
+
+    # camera-only changes reload the mesh; geometry changes rebuild it
+    monkeypatch.setattr(panel_3d, "_build_arrows", no_build)
+    np.testing.assert_array_equal(render(), first)
+    render(view="xy", cam_pos=(1, 2, 3))
+    with pytest.raises(AssertionError, match="rebuilt"):
+        render(scale=0.2)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from paperfig.sampling import spatial_subsample
+
+
+@pytest.fixture
+def grid():
+    g = np.linspace(0.0, 1.0, 11)
+    X, Y, Z = np.meshgrid(g, g, g)
+    return np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
+
+
+def test_no_thinning(grid):
+    np.testing.assert_array_equal(spatial_subsample(grid), np.arange(len(grid)))
+    np.testing.assert_array_equal(spatial_subsample(grid, max_arrows=len(grid)),
+                                  np.arange(len(grid)))
+
+
+def test_spacing_keeps_one_point_per_voxel(grid):
+    idx = spatial_subsample(grid, spacing=0.2)
+    assert np.all(np.diff(idx) > 0)
+    # voxels centered on every second grid point: 6 per axis
+    assert len(idx) == 6 ** 3
+    np.testing.assert_allclose(np.unique(grid[idx]), np.linspace(0.0, 1.0, 6))
+
+
+@pytest.mark.parametrize("max_arrows", [10, 100, 500])
+def test_max_arrows_bound(max_arrows):
+    points = np.random.default_rng(0).uniform(size=(5000, 3))
+    idx = spatial_subsample(points, max_arrows=max_arrows)
+    assert 0.5 * max_arrows <= len(idx) <= max_arrows
+    assert len(np.unique(idx)) == len(idx)
+
+
+def test_priority_wins_its_voxel():
+    points = np.array([[0.0, 0.0, 0.0], [0.1, 0.1, 0.1],
+                       [1.0, 1.0, 1.0], [0.9, 0.9, 0.9]])
+    idx = spatial_subsample(points, spacing=0.5, priority=[0.0, 1.0, 0.0, 1.0])
+    np.testing.assert_array_equal(idx, [1, 3])
+
+
+def test_degenerate_cloud():
+    points = np.ones((7, 3))
+    np.testing.assert_array_equal(spatial_subsample(points, spacing=0.1), [0])
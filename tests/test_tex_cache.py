@@ -0,0 +1,96 @@
+import struct
+
+import pytest
+
+import paperfig as pf
+import paperfig.tex_cache as tex_cache
+from paperfig.tex_cache import _split_dvi
+
+NUM_DEN_MAG = struct.pack(">III", 25400000, 473628672, 1000)
+
+
+def _fnt_def(k, name=b"cmr10"):
+    return (bytes([243, k]) + struct.pack(">III", 0x12345678, 655360, 655360)
+            + bytes([0, len(name)]) + name)
+
+
+def _dvi(npages):
+    """
+    DVI file of `npages` pages: page i sets character "A" + i in font
+    i % 2 (each font defined on the first page using it) and a rule.
+    """
+    out = bytearray([247, 2]) + NUM_DEN_MAG + bytes([3]) + b"abc"
+    previous, defined = -1, set()
+    for i in range(npages):
+        bop = len(out)
+        out += bytes([139]) + struct.pack(">10i", i + 1, *[0] * 9)
+        out += struct.pack(">i", previous)
+        previous = bop
+        out += bytes([141, 157, 10, 141])                   # push, down1, push
+        k = i % 2
+        if k not in defined:
+            out += _fnt_def(k)
+            defined.add(k)
+        out += bytes([171 + k, 65 + i])                     # fnt_num_k, set_char
+        out += bytes([239, 3]) + b"xyz"                     # xxx1
+        out += bytes([132]) + struct.pack(">ii", 100 * (i + 1), 200)
+        out += bytes([142, 142, 140])                       # pop, pop, eop
+    post = len(out)
+    out += bytes([248]) + struct.pack(">i", previous) + NUM_DEN_MAG
+    out += struct.pack(">ii", 1000, 2000) + struct.pack(">HH", 5, npages)
+    for k in sorted(defined):
+        out += _fnt_def(k)
+    out += bytes([249]) + struct.pack(">i", post) + bytes([2])
+    out += bytes([223]) * (4 + (-len(out)) % 4)
+    return bytes(out)
+
+
+def test_split_dvi_pages():
+    pages = _split_dvi(_dvi(4))
+    assert len(pages) == 4
+    pre = _dvi(1)[:18]
+    for i, page in enumerate(pages):
+        assert page.startswith(pre)
+        assert page[18] == 139                              # bop
+        # count0 of the page, its character and its rule are kept
+        assert struct.unpack(">i", page[19:23])[0] == i + 1
+        assert bytes([171 + i % 2, 65 + i]) in page
+        assert struct.pack(">ii", 100 * (i + 1), 200) in page
+        # the font definition is repeated on pages that reuse an earlier font
+        assert _fnt_def(i % 2) in page
+        # postamble: one page, pointer back to the single bop
+        post = struct.unpack(">i", page.rstrip(b"\xdf")[-5:-1])[0]
+        assert page[post] == 248
+        assert struct.unpack(">i", page[post + 1:post + 5])[0] == 18
+        assert struct.unpack(">H", page[post + 27:post + 29])[0] == 1
+        assert len(page) % 4 == 0
+
+
+def test_split_dvi_is_idempotent():
+    for page in _split_dvi(_dvi(3)):
+        assert _split_dvi(page) == [page]
+
+
+@pytest.mark.parametrize("name, kwargs, dpi", [
+    ("fig.png", {}, 300),
+    ("fig.png", {"dpi": 150}, 150),
+    ("fig.pdf", {}, None),
+    ("fig.out", {"format": "jpg"}, 300),
+])
+def test_savefig_precompiles_usetex_figures(monkeypatch, tmp_path, name, kwargs, dpi):
+    calls = []
+    monkeypatch.setattr(tex_cache, "precompile_tex",
+                        lambda fig, dpi=None: calls.append((fig, dpi)))
+    # no text artists, so saving needs no latex installation
+    fig = pf.create_paper_figure(dpi=300, use_latex=True, isolated=True)
+    fig.savefig(tmp_path / name, **kwargs)
+    assert calls == [(fig, dpi)]
+
+
+def test_savefig_skips_precompile_without_usetex(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(tex_cache, "precompile_tex",
+                        lambda fig, dpi=None: calls.append(fig))
+    fig = pf.create_paper_figure(use_latex=False, isolated=True)
+    fig.savefig(tmp_path / "fig.png")
+    assert calls == []
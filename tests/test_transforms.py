@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+import paperfig as pf
+from paperfig.benchmark import _reference_projection
+from paperfig.transforms import color_mz
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(3)
+    n = 2000
+    x, y, z = rng.uniform(-5, 5, (3, n))
+    # points on the z axis and at the origin
+    x[:10] = 0
+    y[:10] = 0
+    z[:5] = 0
+    mx, my, mz = rng.normal(size=(3, n))
+    return x, y, z, mx, my, mz
+
+
+@pytest.mark.parametrize("name", ["cart", "cyl", "sph"])
+def test_project_matches_reference(points, name):
+    ref = _reference_projection(name, *points)
+    got = pf.coordinate_system(name).project(*points)
+    for a, b in zip(got[:4], ref):
+        np.testing.assert_allclose(a, b, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["cart", "cyl", "sph"])
+def test_project_into_float32_buffers(points, name):
+    out = np.empty((4, len(points[0])), dtype=np.float32)
+    got = pf.coordinate_system(name).project(*points, out=out)
+    assert all(np.shares_memory(a, out) for a in got[:4])
+    ref = _reference_projection(name, *points)
+    for a, b in zip(out, ref):
+        np.testing.assert_allclose(a, b, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("name", ["cart", "cyl", "sph"])
+def test_param_and_vector_funcs_match_project(points, name):
+    system = pf.coordinate_system(name)
+    p, M1, M2, M3, param_label, labels = system.project(*points)
+    q, label = system.param_func(*points[:3])
+    *M, L1, L2, L3 = system.vector_func(*points)
+    np.testing.assert_allclose(q, p)
+    for a, b in zip(M, (M1, M2, M3)):
+        np.testing.assert_allclose(a, b)
+    assert label == param_label
+    assert (L1, L2, L3) == labels
+
+
+@pytest.mark.parametrize("name", ["cart", "cyl", "sph"])
+def test_grid_input_matches_flattened(points, name):
+    system = pf.coordinate_system(name)
+    grid = [a[:1000].reshape(10, 10, 10) for a in points]
+    got = system.project(*grid)
+    flat = system.project(*(a.ravel() for a in grid))
+    for a, b in zip(got[:4], flat[:4]):
+        assert a.shape == (10, 10, 10)
+        np.testing.assert_array_equal(a.ravel(), b)
+
+
+def test_color_mz():
+    mx, my, mz = np.array([[0.0, 3.0, 0.0], [0.0, 0.0, 0.0], [0.0, 4.0, -2.0]])
+    np.testing.assert_allclose(color_mz(mx, my, mz), [0.0, 0.8, -1.0])
+
+
+def test_register_coordinate_system(points):
+    x, y, z, mx, my, mz = points
+    system = pf.register_coordinate_system(
+        "test_zz", lambda x, y, z: (z, "z"),
+        lambda x, y, z, a, b, c: (c, b, a, "1", "2", "3"))
+    try:
+        assert pf.coordinate_system("test_zz") is system
+        assert "test_zz" in pf.coordinate_systems()
+        out = np.empty((4, len(x)))
+        p, M1, M2, M3, param_label, labels = system.project(*points, out=out)
+        np.testing.assert_array_equal(out, [z, mz, my, mx])
+        assert (param_label, labels) == ("z", ("1", "2", "3"))
+    finally:
+        pf.transforms._SYSTEMS.pop("test_zz", None)
+
+
+def test_unknown_and_reserved_names():
+    with pytest.raises(ValueError):
+        pf.coordinate_system("nope")
+    with pytest.raises(ValueError):
+        pf.register_coordinate_system("user", None, None)
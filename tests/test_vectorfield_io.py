@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+import paperfig as pf
+from paperfig.vectorfield_io import VECTORFIELD_COLUMNS
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(1000, 6))
+
+
+@pytest.fixture
+def text_file(tmp_path, data):
+    path = tmp_path / "field.txt"
+    with open(path, "w") as f:
+        f.write(" ".join(VECTORFIELD_COLUMNS) + "\n")
+        np.savetxt(f, data[:400], fmt="%.17g")
+        f.write("# a comment line with more than six tokens in it\n")
+        np.savetxt(f, data[400:], fmt="%.17g")
+    return path
+
+
+def test_load_vectorfield_matches_pandas(text_file, tmp_path):
+    pd = pytest.importorskip("pandas")
+    df = pd.read_csv(text_file, sep=r"\s+", header=None, comment="#",
+                     names=list(VECTORFIELD_COLUMNS))
+    df = df.apply(pd.to_numeric, errors="coerce").dropna()
+    cols = pf.load_vectorfield(str(text_file), cache_dir=str(tmp_path / "cache"))
+    # the parsers may round the last digit differently
+    for got, name in zip(cols, VECTORFIELD_COLUMNS):
+        np.testing.assert_allclose(got, df[name].to_numpy(), rtol=1e-15, atol=0)
+
+
+def test_load_vectorfield_sidecar(text_file, tmp_path, data):
+    cache_dir = tmp_path / "cache"
+    first = pf.load_vectorfield(str(text_file), cache_dir=str(cache_dir))
+    sidecars = os.listdir(cache_dir)
+    assert len(sidecars) == 1
+    # same mode as a normally created file
+    reference = tmp_path / "reference"
+    reference.write_bytes(b"")
+    mode = os.stat(cache_dir / sidecars[0]).st_mode & 0o777
+    assert mode == reference.stat().st_mode & 0o777
+
+    again = pf.load_vectorfield(str(text_file), cache_dir=str(cache_dir))
+    for a, b in zip(first, again):
+        np.testing.assert_array_equal(a, b)
+
+    # an edited file is parsed again and the old sidecar removed
+    with open(text_file, "a") as f:
+        f.write("1 2 3 4 5 6\n")
+    edited = pf.load_vectorfield(str(text_file), cache_dir=str(cache_dir))
+    assert len(edited[0]) == len(data) + 1
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_load_vectorfield_skips_bad_rows(tmp_path):
+    path = tmp_path / "messy.txt"
+    path.write_text("x y z mx my mz\n"
+                    "# comment\n"
+                    "1 2 3 4 5 6 # trailing comment\n"
+                    "1 2 3 4 5 abc\n"
+                    "1 2 3\n"
+                    "7 8 9 10 11 12\n")
+    cols = pf.load_vectorfield(str(path), cache=False)
+    np.testing.assert_array_equal(np.array(cols),
+                                  [[1, 7], [2, 8], [3, 9], [4, 10], [5, 11], [6, 12]])
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_iter_vectorfield_chunks(text_file, tmp_path, cache):
+    cols = pf.load_vectorfield(str(text_file), cache=False)
+    chunks = list(pf.iter_vectorfield(str(text_file), chunksize=130, cache=cache,
+                                      cache_dir=str(tmp_path / "cache")))
+    assert all(len(c[0]) <= 130 for c in chunks)
+    full = np.column_stack([np.concatenate(c) for c in zip(*chunks)])
+    np.testing.assert_array_equal(full, np.array(cols).T)
+
+
+# ===== OVF =====
+
+NX, NY, NZ = 5, 4, 3
+
+
+def _write_ovf(path, values, mode, order="<"):
+    header = ["# OOMMF OVF 2.0", "# Segment count: 1", "# Begin: Segment",
+              "# Begin: Header", "# Title: m", "# meshtype: rectangular",
+              "# meshunit: m",
+              "# xbase: 2.5e-09", "# ybase: 2.5e-09", "# zbase: 5e-09",
+              "# xnodes: %d" % NX, "# ynodes: %d" % NY, "# znodes: %d" % NZ,
+              "# xstepsize: 5e-09", "# ystepsize: 5e-09", "# zstepsize: 1e-08",
+              "# valuedim: 3", "# End: Header", "# Begin: Data " + mode]
+    with open(path, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode())
+        if mode.startswith("Binary"):
+            size = int(mode.split()[1])
+            dtype = np.dtype(order + "f%d" % size)
+            check = 1234567.0 if size == 4 else 123456789012345.0
+            f.write(np.array([check], dtype).tobytes())
+            f.write(values.astype(dtype).tobytes())
+            f.write(b"\n")
+        else:
+            np.savetxt(f, values.reshape(-1, 3), fmt="%.17g")
+        f.write(("# End: Data " + mode + "\n# End: Segment\n").encode())
+
+
+@pytest.mark.parametrize("mode, order, atol", [
+    ("Binary 4", "<", 1e-6),
+    ("Binary 4", ">", 1e-6),
+    ("Binary 8", "<", 0.0),
+    ("Text", "<", 0.0),
+])
+def test_read_ovf(tmp_path, mode, order, atol):
+    values = np.random.default_rng(1).normal(size=(NZ, NY, NX, 3))
+    path = tmp_path / "m.ovf"
+    _write_ovf(path, values, mode, order)
+
+    f = pf.read_ovf(str(path))
+    assert f.shape == (NX, NY, NZ)
+    assert f.header["meshunit"] == "m"
+    for k, m in enumerate((f.mx, f.my, f.mz)):
+        np.testing.assert_allclose(m, values[..., k].transpose(2, 1, 0),
+                                   rtol=0, atol=atol)
+    np.testing.assert_allclose(f.x, 2.5e-9 + 5e-9 * np.arange(NX))
+    np.testing.assert_allclose(f.z, 5e-9 + 1e-8 * np.arange(NZ))
+
+    X, Y, Z = f.coordinates()
+    assert X.shape == Y.shape == Z.shape == f.shape
+    np.testing.assert_array_equal(Y[2, :, 1], f.y)
+
+
+def test_read_ovf_bad_check_value(tmp_path):
+    path = tmp_path / "m.ovf"
+    _write_ovf(path, np.zeros((NZ, NY, NX, 3)), "Binary 4")
+    raw = bytearray(path.read_bytes())
+    start = raw.index(b"Data Binary 4\n") + len(b"Data Binary 4\n")
+    raw[start:start + 4] = b"\0\0\0\0"
+    path.write_bytes(bytes(raw))
+    with pytest.raises(ValueError):
+        pf.read_ovf(str(path))
@@ -0,0 +1,69 @@
+import functools
+
+import numpy as np
+import pytest
+
+import paperfig.vectorfield_panel as vfp
+
+
+@pytest.fixture
+def field_file(tmp_path):
+    g = np.linspace(-1.0, 1.0, 6)
+    X, Y, Z = np.meshgrid(g, g, g)
+    x, y, z = X.ravel(), Y.ravel(), Z.ravel()
+    m = np.stack([-y, x, 0.5 * z], axis=1)
+    m /= np.linalg.norm(m, axis=1, keepdims=True) + 1e-12
+    path = tmp_path / "field.txt"
+    np.savetxt(path, np.column_stack([x, y, z, m]), header="x y z mx my mz")
+    return path
+
+
+@pytest.fixture
+def no_latex(monkeypatch):
+    # the test environment has no latex installation
+    monkeypatch.setattr(vfp, "create_paper_figure",
+                        functools.partial(vfp.create_paper_figure, use_latex=False))
+
+
+@pytest.mark.parametrize("chunksize", [None, 50])
+@pytest.mark.parametrize("projection", ["scatter", "density"])
+@pytest.mark.parametrize("coord_system", ["cart", "cyl"])
+def test_plot_vectorfield_panel(field_file, tmp_path, no_latex, chunksize,
+                                projection, coord_system):
+    out = tmp_path / "panel.png"
+    vfp.PlotVectorfieldPanel(str(field_file), str(out),
+                             coord_system=coord_system,
+                             column_cache=False, chunksize=chunksize,
+                             projection=projection)
+    assert out.stat().st_size > 0
+
+
+def test_chunked_panel_keeps_the_same_arrows(field_file, tmp_path, no_latex,
+                                             monkeypatch):
+    drawn = []
+    quiver3_advanced_panel = vfp.quiver3_advanced_panel
+
+    def record(fig, *arrays, **kwargs):
+        drawn.append((arrays, kwargs.get("subsample", 1)))
+        return quiver3_advanced_panel(fig, *arrays, **kwargs)
+
+    monkeypatch.setattr(vfp, "quiver3_advanced_panel", record)
+    for chunksize in (None, 50):
+        vfp.PlotVectorfieldPanel(str(field_file), str(tmp_path / "panel.png"),
+                                 column_cache=False, chunksize=chunksize)
+    (in_memory, s1), (chunked, s2) = drawn
+    assert s1 == s2 == 1
+    assert len(in_memory[0]) == -(-6**3 // 15)
+    for a, b in zip(in_memory, chunked):
+        np.testing.assert_allclose(a, b, rtol=1e-6)
+
+
+@pytest.mark.parametrize("projection", ["scatter", "density"])
+def test_plot_vectorfield_panels(field_file, tmp_path, projection):
+    x, y, z, mx, my, mz = np.loadtxt(field_file).T
+    fig = vfp.create_paper_figure(width_cm=12, height_cm=5, dpi=100,
+                                  use_latex=False, isolated=True)
+    vfp.plot_vectorfield_panels(fig, x, y, z, mx, my, mz, coord_system="sph",
+                                projection=projection)
+    fig.savefig(tmp_path / "panels.png")
+    assert len(fig.axes) >= 3